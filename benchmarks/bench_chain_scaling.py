@@ -0,0 +1,56 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hotel_domain.chain import HotelChain
+
+ROOM_TYPES = ("Single", "Double", "Suite", "Deluxe")
+
+
+def build_chain(n_shards, n_hotels, n_rooms, n_bookings):
+    chain = HotelChain(n_shards)
+    for h in range(n_hotels):
+        name = f"Hotel {h:04d}"
+        rooms = [(100 + i, ROOM_TYPES[i % 4], 3000 + (h * 37 + i * 11) % 20000) for i in range(n_rooms)]
+        chain.add_hotel(name, rooms)
+        items = []
+        for b in range(n_bookings):
+            start = 739000 + (b // n_rooms) * 3
+            items.append((f"Guest{b % 500}", "Chain", 100 + (b * 7) % n_rooms, start, start + 2))
+        chain.make_reservations_bulk(name, items)
+    return chain
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Масштабирование HotelChain по числу процессов")
+    parser.add_argument("--hotels", type=int, default=200)
+    parser.add_argument("--rooms", type=int, default=300)
+    parser.add_argument("--bookings", type=int, default=3000, help="броней на отель")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--shards", type=int, nargs="*", default=None)
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    shard_counts = args.shards or sorted({1, 2, 4, 8, cpus} & set(range(1, cpus + 1))) or [1]
+    print(f"Отелей: {args.hotels}, номеров в отеле: {args.rooms}, ядер: {cpus}")
+    baseline = None
+    for n_shards in shard_counts:
+        chain = build_chain(n_shards, args.hotels, args.rooms, args.bookings)
+        try:
+            began = time.perf_counter()
+            for q in range(args.queries):
+                start = 739000 + (q * 5) % 600
+                chain.cheapest_rooms(start, start + 3, limit=20)
+            elapsed = time.perf_counter() - began
+        finally:
+            chain.close()
+        qps = args.queries / elapsed
+        baseline = baseline or qps
+        print(f"шардов {n_shards:>3}: {qps:8.1f} запросов/с, ускорение x{qps / baseline:.2f}")
+
+
+if __name__ == "__main__":
+    main()
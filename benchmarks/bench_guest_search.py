@@ -0,0 +1,54 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hotel_domain import Hotel, set_log_level
+
+FIRST_NAMES = ["Анна", "Иван", "Пётр", "Мария", "Ольга", "Сергей", "Alice", "Bob", "Carol", "Dmitry"]
+LAST_NAMES = ["Иванов", "Петров", "Сидоров", "Смирнов", "Кузнецов", "Johnson", "Smith", "Brown", "Taylor", "Wilson"]
+
+
+def guest_rows(n, seed=1):
+    rnd = random.Random(seed)
+    for i in range(n):
+        yield f"{rnd.choice(FIRST_NAMES)}{i % 991}", f"{rnd.choice(LAST_NAMES)}{i}", None
+
+
+def latencies(hotel, prefixes, limit=20):
+    times = []
+    for prefix in prefixes:
+        start = time.perf_counter()
+        hotel.search_guests(prefix, limit)
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return times[len(times) // 2], times[int(len(times) * 0.99)]
+
+
+def main(n=1_000_000, queries=2000):
+    set_log_level("ERROR")
+    rnd = random.Random(2)
+    prefixes = [rnd.choice(["анна1", "smith12", "иванов9", "  BOB 3", "кузн", "taylor99"]) for _ in range(queries)]
+
+    hotel = Hotel("Bench")
+    start = time.perf_counter()
+    hotel.add_guests_bulk(guest_rows(n))
+    print(f"Гостей: {n}, загрузка в память: {time.perf_counter() - start:.1f} с")
+    p50, p99 = latencies(hotel, prefixes)
+    print(f"search_guests в памяти:  p50 {p50 * 1e3:.3f} мс, p99 {p99 * 1e3:.3f} мс")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        hotel = Hotel.open_sqlite(os.path.join(tmp, "hotel.db"), "Bench")
+        start = time.perf_counter()
+        hotel.add_guests_bulk(guest_rows(n))
+        print(f"Загрузка в SQLite: {time.perf_counter() - start:.1f} с")
+        p50, p99 = latencies(hotel, prefixes)
+        print(f"search_guests в SQLite:  p50 {p50 * 1e3:.3f} мс, p99 {p99 * 1e3:.3f} мс")
+        hotel.repository.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QApplication, QMessageBox
+
+from hotel_domain import Hotel, Room, set_log_level
+from hotel_gui import HotelApp
+
+TICK_MS = 5
+
+
+class StallMonitor:
+    # Таймер с периодом TICK_MS: всё, что сверх периода между срабатываниями, - простой цикла событий
+    def __init__(self):
+        self.last = None
+        self.stalls = []
+        self.timer = QTimer()
+        self.timer.setInterval(TICK_MS)
+        self.timer.timeout.connect(self.tick)
+
+    def tick(self):
+        now = time.perf_counter()
+        if self.last is not None:
+            self.stalls.append(max(0.0, (now - self.last) * 1000 - TICK_MS))
+        self.last = now
+
+    def report(self, label):
+        stalls = sorted(self.stalls) or [0.0]
+        p99 = stalls[min(len(stalls) - 1, int(len(stalls) * 0.99))]
+        print(f"{label:<26} макс. простой {stalls[-1]:8.1f} мс, p99 {p99:7.1f} мс, тиков {len(self.stalls)}")
+
+
+def build_hotel(n_rooms, n_reservations):
+    hotel = Hotel("Bench Hotel")
+    for i in range(n_rooms):
+        hotel.add_room(Room(1000 + i, "Single", 5000 + i))
+    items = []
+    for i in range(n_reservations):
+        start = 739000 + (i // n_rooms) * 3
+        items.append((f"Guest{i % 50000}", "Bench", 1000 + i % n_rooms, start, start + 2))
+    hotel.make_reservations_bulk(items)
+    return hotel
+
+
+def run(app, label, action, rounds):
+    monitor = StallMonitor()
+    monitor.timer.start()
+    for _ in range(rounds):
+        action()
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            app.processEvents()
+    # Дожидаемся окончания фоновой работы, продолжая обрабатывать события
+    deadline = time.perf_counter() + 30
+    while time.perf_counter() < deadline and (window.pool.activeThreadCount() or window._workers):
+        app.processEvents()
+    monitor.timer.stop()
+    monitor.report(label)
+
+
+if __name__ == "__main__":
+    n_rooms = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    n_reservations = int(sys.argv[2]) if len(sys.argv) > 2 else 200_000
+    set_log_level("ERROR")
+    QMessageBox.information = QMessageBox.warning = QMessageBox.critical = staticmethod(lambda *a, **k: None)
+
+    app = QApplication(sys.argv)
+    hotel = build_hotel(n_rooms, n_reservations)
+    window = HotelApp(hotel)
+    print(f"Номеров: {n_rooms}, бронирований: {n_reservations}")
+
+    def sync_refresh():
+        window._on_rooms_loaded(window._refresh_seq, window._load_available_rooms(window.entry_in.text(), window.entry_out.text()))
+
+    run(app, "refresh (в потоке GUI)", sync_refresh, 20)
+    run(app, "refresh (QThreadPool)", window._start_refresh, 20)
+    run(app, "список броней", window.show_reservations, 5)
@@ -0,0 +1,56 @@
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(module):
+    # Холодный запуск интерпретатора с -X importtime: строки вида
+    # "import time:   self [us] | cumulative | imported package"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Время импорта модулей (-X importtime)")
+    parser.add_argument("modules", nargs="*", default=["hotel_domain", "main", "hotel_service"])
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="завершиться с кодом 1, если импорт дольше бюджета")
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--runs", type=int, default=5, help="берётся минимум из нескольких запусков")
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.modules:
+        best = None
+        for _ in range(args.runs):
+            rows = import_times(module)
+            total = next(cumulative for name, _, cumulative in reversed(rows) if name == module)
+            if best is None or total < best[0]:
+                best = (total, rows)
+        total, rows = best
+        names = {name.strip() for name, _, _ in rows}
+        gui = sorted(name for name in names if name.startswith("PyQt5"))
+        print(f"{module}: {total / 1000:.1f} мс, модулей загружено: {len(rows)}"
+              + (f", PyQt5 загружен ({', '.join(gui[:3])})" if gui else ""))
+        for name, self_us, _ in sorted(rows, key=lambda row: row[1], reverse=True)[:args.top]:
+            print(f"    {self_us / 1000:7.2f} мс  {name}")
+        if args.budget_ms is not None and total / 1000 > args.budget_ms:
+            print(f"    превышен бюджет {args.budget_ms} мс")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hotel_domain.log_analytics import analyze
+
+MESSAGES = [
+    "INFO - Создан гость: Guest{i} Test",
+    "INFO - Бронирование создано: Бронь {i}",
+    "INFO - Завершение попытки бронирования. Результат: Успех",
+    "ERROR - Номер недоступен: Номер {i} недоступен с 2025-01-01 по 2025-01-05",
+    "INFO - Завершение попытки бронирования. Результат: Провал",
+    "ERROR - Ошибка в датах бронирования: Неверная дата: 'x'",
+]
+
+
+def write_log(path, n, start_minute=0):
+    with open(path, "a", encoding="utf-8") as f:
+        for i in range(n):
+            minute = start_minute + i // 2000
+            stamp = f"2025-10-{1 + minute // 1440:02d} {minute // 60 % 24:02d}:{minute % 60:02d}:{i % 60:02d}"
+            f.write(f"{stamp} - {MESSAGES[i % len(MESSAGES)].format(i=i)}\n")
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main(n=1_000_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "hotel.log")
+        write_log(path, n)
+        size = os.path.getsize(path)
+        print(f"Строк: {n}, размер: {size / 2**20:.1f} МБ, CPU: {os.cpu_count()}")
+
+        elapsed, stats = timed(analyze, path, None, 1)
+        print(f"Один процесс:       {elapsed:.2f} с ({size / 2**20 / elapsed:.0f} МБ/с)")
+        elapsed, parallel = timed(analyze, path, None)
+        assert parallel.to_dict() == stats.to_dict()
+        print(f"Параллельно:        {elapsed:.2f} с ({size / 2**20 / elapsed:.0f} МБ/с)")
+
+        elapsed, _ = timed(analyze, path)
+        print(f"С контрольной точкой, первый запуск: {elapsed:.2f} с")
+        write_log(path, n // 100, start_minute=n // 2000 + 1)
+        elapsed, incremental = timed(analyze, path)
+        print(f"Повторный запуск после +{n // 100} строк: {elapsed:.3f} с")
+        assert incremental.lines == n + n // 100
+        print(f"Неудачных бронирований по часам: {len(incremental.failed_bookings_per_hour())} часов, "
+              f"всего {sum(incremental.failed_bookings.values())}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,62 @@
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hotel_domain.logger import AsyncLogWriter
+
+
+def legacy_log(path, level, msg):
+    # Прежняя реализация log() из main.py: открыть, дописать строку, закрыть
+    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    line = f"{ts} - {level} - {msg}"
+    file_open = None
+    try:
+        file_open = open(path, "a", encoding="utf-8")
+        file_open.write(line + "\n")
+    finally:
+        if file_open:
+            file_open.close()
+
+
+def bench_legacy(path, n):
+    start = time.perf_counter()
+    for i in range(n):
+        legacy_log(path, "INFO", f"Создан гость: Guest{i} Test")
+    return time.perf_counter() - start
+
+
+def bench_async(path, n, level="INFO", **rotation):
+    writer = AsyncLogWriter(path, level=level, echo=False, **rotation)
+    start = time.perf_counter()
+    for i in range(n):
+        writer.write("INFO", f"Создан гость: Guest{i} Test")
+    enqueued = time.perf_counter() - start
+    writer.close()
+    return enqueued, time.perf_counter() - start
+
+
+def main(n=100_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = bench_legacy(os.path.join(tmp, "legacy.log"), n)
+        enqueued, total = bench_async(os.path.join(tmp, "async.log"), n)
+        disabled, _ = bench_async(os.path.join(tmp, "disabled.log"), n, level="WARNING")
+        # Ротация каждый мегабайт со сжатием в gzip: вызывающий поток не должен это замечать
+        rotating, rotating_total = bench_async(os.path.join(tmp, "rotating.log"), n,
+                                               max_bytes=1024 * 1024, backup_count=5)
+        archives = sum(name.endswith(".gz") for name in os.listdir(tmp))
+
+    print(f"Строк: {n}")
+    print(f"legacy log():          {n / legacy:>12,.0f} строк/с")
+    print(f"AsyncLogWriter (вызов): {n / enqueued:>12,.0f} строк/с")
+    print(f"AsyncLogWriter (до диска): {n / total:>9,.0f} строк/с")
+    print(f"info() при уровне WARNING: {n / disabled:>9,.0f} вызовов/с")
+    print(f"С ротацией по 1 МБ (вызов): {n / rotating:>8,.0f} строк/с")
+    print(f"С ротацией по 1 МБ (до диска и gzip): {n / rotating_total:>,.0f} строк/с, архивов: {archives}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,83 @@
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hotel_domain import Guest, Room, Reservation, ReservationStore, set_log_level
+
+
+class LegacyGuest:
+    # Прежнее устройство объектов: обычные классы с __dict__ и даты строками
+    def __init__(self, name, lastName, age=None):
+        self.reservations = []
+        self.name = name
+        self.lastName = lastName
+        self.age = age
+
+
+class LegacyRoom:
+    def __init__(self, room_number, room_type, price):
+        self.room_number = int(room_number)
+        self.room_type = room_type
+        self.price = float(price)
+        self.is_available = True
+
+
+class LegacyReservation:
+    def __init__(self, guest, room, check_in_date="N/A", check_out_date="N/A"):
+        self.guest = guest
+        self.room = room
+        self.dates = (check_in_date, check_out_date)
+        guest.reservations.append(self)
+
+
+def stays(n, rooms, guests):
+    base = 739000
+    for i in range(n):
+        start = base + (i * 7) % 3650
+        yield guests[i % len(guests)], rooms[i % len(rooms)], start, start + 1 + i % 6
+
+
+def measure(label, build):
+    gc.collect()
+    tracemalloc.start()
+    keep = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<32} {current / 2**20:>9.1f} МБ (пик {peak / 2**20:.1f} МБ)")
+    return keep
+
+
+def main_bench(n=1_000_000, n_rooms=5_000, n_guests=100_000):
+    set_log_level("ERROR")
+    from datetime import date
+
+    def legacy():
+        rooms = [LegacyRoom(100 + i, "Single", 5000) for i in range(n_rooms)]
+        guests = [LegacyGuest(f"Guest{i}", "Test") for i in range(n_guests)]
+        return [LegacyReservation(g, r, date.fromordinal(a).isoformat(), date.fromordinal(b).isoformat())
+                for g, r, a, b in stays(n, rooms, guests)]
+
+    def slotted():
+        rooms = [Room(100 + i, "Single", 5000) for i in range(n_rooms)]
+        guests = [Guest(f"Guest{i}", "Test") for i in range(n_guests)]
+        return [Reservation(g, r, a, b) for g, r, a, b in stays(n, rooms, guests)]
+
+    def columnar():
+        rooms = [Room(100 + i, "Single", 5000) for i in range(n_rooms)]
+        guests = [Guest(f"Guest{i}", "Test") for i in range(n_guests)]
+        store = ReservationStore()
+        for g, r, a, b in stays(n, rooms, guests):
+            store.add(g, r, a, b)
+        return store
+
+    print(f"Бронирований: {n}, номеров: {n_rooms}, гостей: {n_guests}")
+    measure("до: dict-объекты, даты строками", legacy)
+    measure("после: __slots__, даты int", slotted)
+    measure("после: ReservationStore", columnar)
+
+
+if __name__ == "__main__":
+    main_bench(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
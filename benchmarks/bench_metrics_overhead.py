@@ -0,0 +1,62 @@
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hotel_domain import Hotel, Room, REGISTRY, get_log_writer, log, set_log_file, set_log_level
+
+
+def build_hotel(n_rooms=2000):
+    hotel = Hotel("Bench")
+    for i in range(n_rooms):
+        hotel.add_room(Room(100 + i, "Single", 5000 + i))
+    return hotel
+
+
+def per_call(fn, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def scenario(n):
+    hotel = build_hotel()
+    day = date(2025, 1, 1)
+    check_out = day + timedelta(days=3)
+    available = hotel.available_rooms
+    raw_available = Hotel.available_rooms.__wrapped__
+    writer = get_log_writer()
+    raw_log = writer.write
+    return {
+        "available_rooms": (per_call(lambda: raw_available(hotel, day, check_out), n),
+                            per_call(lambda: available(day, check_out), n)),
+        "log()": (per_call(lambda: raw_log("DEBUG", "x"), n * 10),
+                  per_call(lambda: log("DEBUG", "x"), n * 10)),
+    }
+
+
+def main(n=20_000):
+    set_log_level("ERROR")
+    with tempfile.TemporaryDirectory() as tmp:
+        set_log_file(os.path.join(tmp, "hotel.log"))
+        REGISTRY.disable()
+        disabled = scenario(n)
+        REGISTRY.enable()
+        enabled = scenario(n)
+        REGISTRY.profile("hotel_available_rooms_seconds", every=100)
+        profiled = scenario(n)
+        REGISTRY.stop_profiling()
+
+    print(f"{'операция':<18}{'без обёртки':>14}{'выключены':>12}{'включены':>12}{'+cProfile 1/100':>18}  (мкс/вызов)")
+    for name, (raw, off) in disabled.items():
+        print(f"{name:<18}{raw:>14.3f}{off:>12.3f}{enabled[name][1]:>12.3f}{profiled[name][1]:>18.3f}")
+    histogram = REGISTRY.histogram("hotel_available_rooms_seconds")
+    print(f"available_rooms: {histogram.count} замеров, p50 <= {histogram.quantile(0.5) * 1e3:.3f} мс")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,60 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hotel_domain import Hotel, RatePlan, Room, set_log_level
+
+FIRST_DAY = 739_600
+SEASONAL = [0.8, 0.8, 0.9, 1.0, 1.1, 1.4, 1.6, 1.6, 1.2, 1.0, 0.9, 1.3]
+
+
+def traffic(rooms, n, seed=7):
+    # Ценовой поиск: 80% запросов приходятся на 50 популярных периодов
+    rnd = random.Random(seed)
+    hot = [(FIRST_DAY + rnd.randrange(180), rnd.randint(1, 14)) for _ in range(50)]
+    for _ in range(n):
+        if rnd.random() < 0.8:
+            start, nights = rnd.choice(hot)
+        else:
+            start, nights = FIRST_DAY + rnd.randrange(365), rnd.randint(1, 14)
+        yield rnd.choice(rooms), start, start + nights
+
+
+def percentile(samples, q):
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def measure(quote, requests):
+    samples = []
+    for room, start, end in requests:
+        started = time.perf_counter()
+        quote(room, start, end)
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    return sum(samples), percentile(samples, 0.5), percentile(samples, 0.99)
+
+
+def main(n=200_000):
+    set_log_level("ERROR")
+    hotel = Hotel("Bench")
+    rooms = hotel.add_rooms_bulk(Room(i, ("Single", "Double", "Suite", "Deluxe")[i % 4], 1000 + (i % 20) * 250)
+                                 for i in range(2000))
+    plan = RatePlan("season", {"Suite": 1.3, "Deluxe": 1.6}, SEASONAL, {7: 0.1, 28: 0.25})
+    hotel.rates.set_plan(plan)
+    requests = list(traffic(rooms, n))
+
+    uncached = measure(lambda room, start, end: plan.price(room.price, room.room_type, start, end), requests)
+    cached = measure(lambda room, start, end: hotel.rates.quote(room, start, end, "season"), requests)
+    info = hotel.rates.cache_info()
+
+    print(f"Запросов: {n}, номеров: {len(rooms)}")
+    for label, (total, p50, p99) in (("Без кэша", uncached), ("RateEngine", cached)):
+        print(f"{label:<12} {n / total:>12,.0f} расчётов/с  p50 {p50 * 1e6:6.2f} мкс  p99 {p99 * 1e6:6.2f} мкс")
+    print(f"Кэш: попаданий {info['hits']}, промахов {info['misses']}, записей {info['size']}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
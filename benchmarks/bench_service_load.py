@@ -0,0 +1,111 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hotel_domain import Hotel, Room, set_log_level
+from hotel_service import HotelService
+
+
+class Client:
+    # Минимальный HTTP/1.1 клиент с keep-alive поверх asyncio streams
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, payload=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        body = json.dumps(payload).encode() if payload is not None else b""
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            key, _, value = line.decode().partition(":")
+            if key.lower() == "content-length":
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+
+async def client_loop(host, port, client_id, n_requests, n_rooms, first_day, latencies, statuses):
+    client = Client(host, port)
+    rnd = random.Random(client_id)
+    try:
+        for i in range(n_requests):
+            start = first_day + timedelta(days=rnd.randrange(60))
+            end = start + timedelta(days=rnd.randint(1, 4))
+            if rnd.random() < 0.2:
+                path = f"/rooms/available?check_in={start}&check_out={end}"
+                began = time.perf_counter()
+                status, _ = await client.request("GET", path)
+            else:
+                payload = {"name": f"Client{client_id}", "last_name": f"Load{i % 10}",
+                           "room_number": 100 + rnd.randrange(n_rooms),
+                           "check_in": start.isoformat(), "check_out": end.isoformat()}
+                began = time.perf_counter()
+                status, _ = await client.request("POST", "/reservations", payload)
+            latencies.append((time.perf_counter() - began) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        await client.close()
+
+
+def check_no_double_booking(hotel):
+    for room_number, timeline in hotel.timelines.items():
+        for i in range(1, len(timeline.starts)):
+            if timeline.starts[i] < timeline.ends[i - 1]:
+                return f"пересечение броней в номере {room_number}"
+    return "двойных броней нет"
+
+
+async def run(args):
+    set_log_level("ERROR")
+    hotel = Hotel("Load Test Hotel")
+    for i in range(args.rooms):
+        hotel.add_room(Room(100 + i, "Single", 5000))
+    service = HotelService(hotel)
+    await service.start("127.0.0.1", 0)
+
+    latencies, statuses = [], {}
+    began = time.perf_counter()
+    await asyncio.gather(*(
+        client_loop("127.0.0.1", service.port, c, args.requests, args.rooms, date(2030, 1, 1), latencies, statuses)
+        for c in range(args.clients)
+    ))
+    elapsed = time.perf_counter() - began
+    await service.close()
+
+    print(f"Клиентов: {args.clients}, запросов: {len(latencies)}, номеров: {args.rooms}")
+    print(f"Статусы: {dict(sorted(statuses.items()))}")
+    print(f"Запросов/с: {len(latencies) / elapsed:,.0f}, броней/с: {statuses.get(201, 0) / elapsed:,.0f}")
+    print(f"Задержка p50 {percentile(latencies, 0.5):.2f} мс, p99 {percentile(latencies, 0.99):.2f} мс")
+    print(check_no_double_booking(hotel))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Нагрузочный тест HTTP-сервиса бронирования")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=50, help="запросов на клиента")
+    parser.add_argument("--rooms", type=int, default=50)
+    asyncio.run(run(parser.parse_args()))
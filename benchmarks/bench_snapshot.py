@@ -0,0 +1,57 @@
+import gc
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hotel_domain import Hotel, Room, set_log_level
+
+ROOMS = 10_000
+FIRST_DAY = 739_000
+
+
+def build(hotel, n):
+    # n гостей и n броней по 2 ночи, равномерно по номерам
+    hotel.add_rooms_bulk(Room(i, ("Single", "Double", "Suite", "Deluxe")[i % 4], 1000 + i % 500)
+                         for i in range(ROOMS))
+    hotel.add_guests_bulk((f"Name{i}", f"Last{i}", 20 + i % 50) for i in range(n))
+    hotel.make_reservations_bulk(
+        (f"Name{i}", f"Last{i}", i % ROOMS, FIRST_DAY + (i // ROOMS) * 3, FIRST_DAY + (i // ROOMS) * 3 + 2)
+        for i in range(n)
+    )
+
+
+def main(n=1_000_000):
+    set_log_level("ERROR")
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        hotel = Hotel.open_snapshot(tmp, "Bench")
+        build(hotel, n)
+        rebuilt = time.perf_counter() - start
+
+        start = time.perf_counter()
+        writer = hotel.save_snapshot()
+        paused = time.perf_counter() - start
+        writer.join()
+        written = time.perf_counter() - start
+        hotel.snapshots.close()
+        size = os.path.getsize(hotel.snapshots.snapshot_path)
+        del hotel, writer
+        gc.collect()
+
+        start = time.perf_counter()
+        restored = Hotel.open_snapshot(tmp, "Bench")
+        loaded = time.perf_counter() - start
+        restored.snapshots.close()
+
+    print(f"Номеров: {ROOMS}, гостей и броней: {n}")
+    print(f"Построение пакетными методами: {rebuilt:8.2f} с")
+    print(f"Снимок: пауза вызывающего потока {paused:.2f} с, запись {written:.2f} с, {size / 1e6:.1f} МБ")
+    print(f"Загрузка снимка:               {loaded:8.2f} с "
+          f"({len(restored.guests)} гостей, {len(restored.reservations)} броней)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,323 @@
+# Воспроизводимые бенчмарки доменной модели: run --scales 1e3,1e4 -o results.json, compare base.json results.json.
+# Каждый сценарий и масштаб - в отдельном процессе (spawn), чтобы ru_maxrss не зависел от прошлых прогонов
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from hotel_domain import Hotel, Guest, Room, RoomManager, logsink, set_log_level
+from hotel_domain.logger import AsyncLogWriter
+
+ROOM_TYPES = sorted(Room.ROOM_TYPES)
+FIRST_NAMES = ["Анна", "Иван", "Пётр", "Мария", "Ольга", "Сергей", "Alice", "Bob", "Carol", "Dmitry"]
+LAST_NAMES = ["Иванов", "Петров", "Сидоров", "Смирнов", "Кузнецов", "Johnson", "Smith", "Brown", "Taylor", "Wilson"]
+BASE_DAY = 739252  # 2025-01-01
+# Не больше стольких замеров задержки на сценарий, остальные вызовы только считаются
+MAX_SAMPLES = 200_000
+
+
+# --- Генераторы синтетических данных ---
+
+def gen_rooms(n, seed=1):
+    rnd = random.Random(seed)
+    for i in range(n):
+        yield Room(100 + i, ROOM_TYPES[i % len(ROOM_TYPES)], 3000 + rnd.randrange(0, 20000, 50))
+
+
+def gen_guest_names(n, seed=2):
+    rnd = random.Random(seed)
+    for i in range(n):
+        yield f"{rnd.choice(FIRST_NAMES)}{i}", rnd.choice(LAST_NAMES)
+
+
+def gen_stays(n, n_rooms, seed=3):
+    # Непересекающиеся брони: i-я бронь в номере i % n_rooms, номера заполняются подряд по времени
+    rnd = random.Random(seed)
+    for i in range(n):
+        start = BASE_DAY + (i // n_rooms) * 4
+        yield 100 + i % n_rooms, start, start + 1 + rnd.randrange(3)
+
+
+# --- Сценарии: setup(n) -> (число операций, op(i)) ---
+
+def case_room_init(n):
+    rnd = random.Random(1)
+    prices = [3000 + rnd.randrange(0, 20000, 50) for _ in range(min(n, 1000))]
+    return n, lambda i: Room(100 + i, ROOM_TYPES[i & 3], prices[i % len(prices)])
+
+
+def case_guest_init(n):
+    return n, lambda i: Guest(f"Гость{i}", "Тестовый")
+
+
+def case_hotel_add_room(n):
+    hotel = Hotel("Bench")
+    rooms = list(gen_rooms(n))
+    return n, lambda i: hotel.add_room(rooms[i])
+
+
+def case_hotel_add_guest(n):
+    hotel = Hotel("Bench")
+    guests = [Guest(name, last_name) for name, last_name in gen_guest_names(n)]
+    return n, lambda i: hotel.add_guest(guests[i])
+
+
+def case_make_reservation(n):
+    hotel = Hotel("Bench")
+    n_rooms = max(100, n // 50)
+    rooms = [hotel.add_room(room) for room in gen_rooms(n_rooms)]
+    guests = [hotel.add_guest(Guest(name, last_name)) for name, last_name in gen_guest_names(min(n, 10_000))]
+    stays = list(gen_stays(n, n_rooms))
+
+    def op(i):
+        room_number, start, end = stays[i]
+        hotel.make_reservation(guests[i % len(guests)], rooms[room_number - 100], start, end)
+    return n, op
+
+
+def case_available_rooms(n):
+    hotel = Hotel("Bench")
+    hotel.add_rooms_bulk(gen_rooms(n))
+    hotel.make_reservations_bulk(
+        (f"Гость{i}", "Тестовый", room_number, start, end)
+        for i, (room_number, start, end) in enumerate(gen_stays(n, n, seed=4))
+    )
+    rnd = random.Random(5)
+    queries = [(BASE_DAY + rnd.randrange(30), 1 + rnd.randrange(7)) for _ in range(1000)]
+
+    def op(i):
+        start, nights = queries[i]
+        hotel.available_rooms(start, start + nights)
+    return len(queries), op
+
+
+def case_find_room_with_max_price(n):
+    manager = RoomManager()
+    rooms = list(gen_rooms(n))
+    width = max(1, math.isqrt(n))
+    manager.set_rooms_2d([rooms[i:i + width] for i in range(0, n, width)])
+    rnd = random.Random(6)
+
+    def op(i):
+        # Каждый десятый запрос предваряется изменением цены, чтобы индекс не был статичным
+        if i % 10 == 0:
+            manager.update_price(rooms[rnd.randrange(n)], 3000 + rnd.randrange(0, 20000, 50))
+        manager.find_room_with_max_price()
+    return 10_000, op
+
+
+def case_sort_guests_and_employees(n):
+    from main import Sort_guests_and_employees
+
+    hotel = Hotel("Bench")
+    hotel.add_guests_bulk((name, last_name, 20 + i % 60) for i, (name, last_name) in enumerate(gen_guest_names(n)))
+    return 5, lambda i: Sort_guests_and_employees(hotel)
+
+
+CASES = {
+    "room_init": case_room_init,
+    "guest_init": case_guest_init,
+    "hotel_add_room": case_hotel_add_room,
+    "hotel_add_guest": case_hotel_add_guest,
+    "make_reservation": case_make_reservation,
+    "available_rooms": case_available_rooms,
+    "find_room_with_max_price": case_find_room_with_max_price,
+    "sort_guests_and_employees": case_sort_guests_and_employees,
+}
+
+
+def _percentile(sorted_samples, q):
+    if not sorted_samples:
+        return None
+    return sorted_samples[min(len(sorted_samples) - 1, int(q * len(sorted_samples)))]
+
+
+def run_case(name, n, log_level="INFO", trace_memory=False):
+    # Выполняется в дочернем процессе; лог пишется в отдельный файл без вывода на экран
+    with tempfile.TemporaryDirectory() as tmp:
+        logsink._log_writer = AsyncLogWriter(os.path.join(tmp, "bench.log"), level=log_level, echo=False)
+        set_log_level(log_level)
+        random.seed(0)
+
+        setup_start = time.perf_counter()
+        ops, op = CASES[name](n)
+        setup_seconds = time.perf_counter() - setup_start
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if trace_memory:
+            tracemalloc.start()
+
+        step = max(1, ops // MAX_SAMPLES)
+        samples = array("d")
+        clock = time.perf_counter
+        start = clock()
+        for i in range(ops):
+            if i % step:
+                op(i)
+            else:
+                t = clock()
+                op(i)
+                samples.append(clock() - t)
+        seconds = clock() - start
+
+        traced_peak = None
+        if trace_memory:
+            traced_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        logsink._log_writer.close()
+        rss_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    samples = sorted(samples)
+    return {
+        "case": name,
+        "n": n,
+        "ops": ops,
+        "setup_seconds": setup_seconds,
+        "seconds": seconds,
+        "ops_per_sec": ops / seconds if seconds > 0 else None,
+        "p50_us": _percentile(samples, 0.50) * 1e6,
+        "p90_us": _percentile(samples, 0.90) * 1e6,
+        "p99_us": _percentile(samples, 0.99) * 1e6,
+        "max_us": samples[-1] * 1e6,
+        # ru_maxrss в Linux - в килобайтах
+        "peak_rss_mb": rss_peak / 1024,
+        "rss_growth_mb": (rss_peak - rss_before) / 1024,
+        "traced_peak_mb": None if traced_peak is None else traced_peak / 2**20,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    scales = [int(float(scale)) for scale in args.scales.split(",")]
+    names = args.cases.split(",") if args.cases else list(CASES)
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        print(f"Неизвестные сценарии: {', '.join(unknown)}; доступны: {', '.join(CASES)}", file=sys.stderr)
+        return 2
+
+    results = []
+    context = multiprocessing.get_context("spawn")
+    print(f"{'сценарий':<28}{'n':>10}{'оп/с':>14}{'p50 мкс':>10}{'p99 мкс':>10}{'пик RSS МБ':>12}")
+    for name in names:
+        for n in scales:
+            for _ in range(args.repeat):
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    result = pool.submit(run_case, name, n, args.log_level, args.tracemalloc).result()
+                results.append(result)
+                print(f"{name:<28}{n:>10}{result['ops_per_sec']:>14,.0f}{result['p50_us']:>10.1f}"
+                      f"{result['p99_us']:>10.1f}{result['peak_rss_mb']:>12.1f}", flush=True)
+
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "log_level": args.log_level,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=1)
+        print(f"Результаты сохранены в {args.output}")
+    return 0
+
+
+def _best(results):
+    # При повторах берётся лучший прогон (по пропускной способности) для каждой пары (сценарий, n)
+    best = {}
+    for result in results:
+        key = (result["case"], result["n"])
+        if key not in best or (result["ops_per_sec"] or 0) > (best[key]["ops_per_sec"] or 0):
+            best[key] = result
+    return best
+
+
+def compare(args):
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+    old, new = _best(baseline["results"]), _best(current["results"])
+
+    print(f"база: {baseline['meta'].get('commit')} ({baseline['meta'].get('created')}), "
+          f"текущий: {current['meta'].get('commit')} ({current['meta'].get('created')})")
+    print(f"{'сценарий':<28}{'n':>10}{'оп/с':>10}{'p50':>9}{'p99':>9}{'RSS':>9}")
+    regressions = 0
+    for key in sorted(old.keys() & new.keys()):
+        a, b = old[key], new[key]
+        deltas = [
+            _delta(a["ops_per_sec"], b["ops_per_sec"], higher_is_better=True),
+            _delta(a["p50_us"], b["p50_us"]),
+            _delta(a["p99_us"], b["p99_us"]),
+            _delta(a["peak_rss_mb"], b["peak_rss_mb"]),
+        ]
+        worse = any(d is not None and d < -args.threshold for d in deltas[:2])
+        regressions += worse
+        cells = "".join(f"{'—' if d is None else f'{d:+.1f}%':>9}" for d in deltas)
+        print(f"{key[0]:<28}{key[1]:>10} {cells}{'  РЕГРЕССИЯ' if worse else ''}")
+    missing = old.keys() - new.keys()
+    if missing:
+        print(f"Нет в текущем прогоне: {', '.join(f'{name}@{n}' for name, n in sorted(missing))}")
+    print(f"Регрессий хуже {args.threshold:.0f}%: {regressions}")
+    return 1 if regressions else 0
+
+
+def _delta(old, new, higher_is_better=False):
+    # Изменение в процентах, положительное - улучшение
+    if not old or new is None:
+        return None
+    change = (new - old) / old * 100
+    return change if higher_is_better else -change
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарки доменной модели отеля")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="выполнить сценарии")
+    run_parser.add_argument("--scales", default="1e3,1e4,1e5", help="масштабы через запятую, до 1e7")
+    run_parser.add_argument("--cases", help=f"сценарии через запятую: {', '.join(CASES)}")
+    run_parser.add_argument("--repeat", type=int, default=1)
+    run_parser.add_argument("--log-level", default="INFO", choices=("DEBUG", "INFO", "WARNING", "ERROR"),
+                            help="уровень лога во время замеров (по умолчанию INFO, как в работе)")
+    run_parser.add_argument("--tracemalloc", action="store_true",
+                            help="дополнительно замерить пик памяти Python через tracemalloc (медленнее)")
+    run_parser.add_argument("-o", "--output", help="сохранить результаты в JSON")
+
+    compare_parser = commands.add_parser("compare", help="сравнить два JSON с результатами")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=10.0,
+                                help="порог регрессии пропускной способности и p50, в процентах")
+
+    args = parser.parse_args(argv)
+    return run(args) if args.command == "run" else compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
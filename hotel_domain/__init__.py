@@ -0,0 +1,19 @@
+from .errors import (
+    BaseHotelError, HotelBookingError, RoomNotAvailableError, InvalidGuestDataError,
+    InvalidDateError, DataProcessingError, EmptyRoomListError,
+)
+from .metrics import REGISTRY, MetricsRegistry, timed
+from .logsink import (
+    LOG_FILE, log, info, warning, error, set_log_level, get_log_writer, get_log_file, set_log_file, close_log,
+)
+from .models import (
+    Person, Guest, StoredGuest, Employee, Room, Reservation, ReservationView, ReservationStore,
+    validate_guest_data, normalize_name, parse_date, parse_stay,
+)
+from .indexes import RoomTimeline, OccupancyIndex, PriceIndex, GuestIndex, TrigramIndex
+from .rates import DEFAULT_PLAN, RatePlan, RateEngine
+from .hotel import (
+    Hotel, RoomManager,
+    BOOKING_OK, BOOKING_INVALID_GUEST, BOOKING_INVALID_DATES, BOOKING_UNKNOWN_ROOM,
+    BOOKING_ROOM_NOT_AVAILABLE, BOOKING_BAD_ITEM, BOOKING_NOT_COMMITTED,
+)
@@ -0,0 +1,220 @@
+from array import array
+import heapq
+import multiprocessing
+import os
+import threading
+import zlib
+
+from .errors import BaseHotelError, DataProcessingError
+from .hotel import Hotel
+from .logsink import close_log, get_log_file, set_log_file, set_log_level
+from .models import Guest, Room, parse_stay
+from .rates import DEFAULT_PLAN
+
+
+class ShardWorker:
+    # Живёт в отдельном процессе и владеет своей частью отелей сети
+    def __init__(self, db_dir=None):
+        self.db_dir = db_dir
+        self.hotels = {}
+
+    def _hotel(self, hotel_name):
+        hotel = self.hotels.get(hotel_name)
+        if hotel is None:
+            raise BaseHotelError(f"Отель {hotel_name} не найден в сети")
+        return hotel
+
+    def add_hotel(self, hotel_name, rooms=()):
+        if hotel_name not in self.hotels:
+            if self.db_dir:
+                path = os.path.join(self.db_dir, f"hotel-{zlib.crc32(hotel_name.encode()):08x}.db")
+                self.hotels[hotel_name] = Hotel.open_sqlite(path, hotel_name)
+            else:
+                self.hotels[hotel_name] = Hotel(hotel_name)
+        self.add_rooms(hotel_name, rooms)
+        return len(self.hotels[hotel_name].rooms_by_number)
+
+    def add_rooms(self, hotel_name, rooms):
+        hotel = self._hotel(hotel_name)
+        for room_number, room_type, price in rooms:
+            hotel.add_room(Room(room_number, room_type, price))
+        return len(hotel.rooms_by_number)
+
+    def make_reservation(self, hotel_name, name, last_name, room_number, check_in, check_out):
+        hotel = self._hotel(hotel_name)
+        room = hotel.rooms_by_number.get(room_number)
+        guest = hotel.find_guest(name, last_name) or hotel.add_guest(Guest(name, last_name))
+        reservation = hotel.make_reservation(guest, room, check_in, check_out)
+        return reservation is not None
+
+    def make_reservations_bulk(self, hotel_name, items):
+        return self._hotel(hotel_name).make_reservations_bulk(items).tobytes()
+
+    def available_rooms(self, check_in, check_out, room_type=None):
+        return {
+            name: [(r.room_number, r.room_type, r.price) for r in hotel.available_rooms(check_in, check_out, room_type)]
+            for name, hotel in self.hotels.items()
+        }
+
+    def cheapest_rooms(self, check_in, check_out, limit, room_type=None, plan=DEFAULT_PLAN):
+        start, end = parse_stay(check_in, check_out)
+        candidates = (
+            (total, name, r.room_number, r.room_type)
+            for name, hotel in self.hotels.items()
+            for r, total in hotel.quote_available(start, end, room_type, plan)
+        )
+        return heapq.nsmallest(limit, candidates)
+
+    def revenue(self, period="month", start=None, end=None):
+        result = {}
+        for name, hotel in self.hotels.items():
+            labels, values = hotel.revenue_report(period, start, end)
+            result[name] = list(zip(labels.astype(str).tolist(), values.tolist()))
+        return result
+
+    def stats(self):
+        return {name: {"rooms": len(h.rooms_by_number), "reservations": h.reservation_count()}
+                for name, h in self.hotels.items()}
+
+
+def shard_log_file(log_file, shard):
+    # hotel.log -> hotel.shard0.log: у каждого шарда свой файл и своя ротация
+    root, ext = os.path.splitext(log_file)
+    return f"{root}.shard{shard}{ext}"
+
+
+def _shard_main(conn, db_dir, log_level, log_file):
+    set_log_file(log_file)
+    set_log_level(log_level)
+    try:
+        _serve_shard(conn, ShardWorker(db_dir))
+    finally:
+        # Процесс шарда завершается через os._exit, atexit не сработает
+        close_log()
+
+
+def _serve_shard(conn, worker):
+    while True:
+        try:
+            method, args = conn.recv()
+        except EOFError:
+            break
+        if method is None:
+            break
+        try:
+            conn.send(("ok", getattr(worker, method)(*args)))
+        except BaseHotelError as e:
+            conn.send(("error", e))
+        except Exception as e:
+            conn.send(("error", DataProcessingError(f"{type(e).__name__}: {e}")))
+    for hotel in worker.hotels.values():
+        if hotel.repository is not None:
+            hotel.repository.close()
+
+
+class HotelChain:
+    # Сеть отелей по процессам-шардам: отель закреплён за шардом по crc32 имени,
+    # запись идёт в свой шард, поиск рассылается всем и объединяется здесь
+    def __init__(self, n_shards=None, db_dir=None, log_level="WARNING"):
+        self.n_shards = n_shards or os.cpu_count() or 1
+        self._lock = threading.Lock()
+        self._shards = []
+        for i in range(self.n_shards):
+            parent_conn, child_conn = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_shard_main, args=(child_conn, db_dir, log_level, shard_log_file(get_log_file(), i)),
+                name=f"hotel-shard-{i}", daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            self._shards.append((process, parent_conn))
+        self.hotel_names = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            for process, conn in self._shards:
+                try:
+                    conn.send((None, ()))
+                except (BrokenPipeError, OSError):
+                    pass
+            for process, conn in self._shards:
+                process.join(timeout=10)
+                conn.close()
+            self._shards = []
+
+    def shard_of(self, hotel_name) -> int:
+        return zlib.crc32(hotel_name.encode("utf-8")) % self.n_shards
+
+    def _receive(self, conn):
+        status, result = conn.recv()
+        if status == "error":
+            raise result
+        return result
+
+    def _call(self, shard, method, *args):
+        with self._lock:
+            conn = self._shards[shard][1]
+            conn.send((method, args))
+            return self._receive(conn)
+
+    def _broadcast(self, method, *args):
+        # Сначала отправляем запрос всем шардам, потом собираем ответы, чтобы они работали параллельно
+        with self._lock:
+            for _, conn in self._shards:
+                conn.send((method, args))
+            results, failure = [], None
+            for _, conn in self._shards:
+                try:
+                    results.append(self._receive(conn))
+                except BaseHotelError as e:
+                    failure = failure or e
+        if failure is not None:
+            raise failure
+        return results
+
+    def add_hotel(self, hotel_name, rooms=()):
+        count = self._call(self.shard_of(hotel_name), "add_hotel", hotel_name, list(rooms))
+        if hotel_name not in self.hotel_names:
+            self.hotel_names.append(hotel_name)
+        return count
+
+    def add_rooms(self, hotel_name, rooms):
+        return self._call(self.shard_of(hotel_name), "add_rooms", hotel_name, list(rooms))
+
+    def make_reservation(self, hotel_name, name, last_name, room_number, check_in, check_out) -> bool:
+        return self._call(self.shard_of(hotel_name), "make_reservation",
+                          hotel_name, name, last_name, room_number, check_in, check_out)
+
+    def make_reservations_bulk(self, hotel_name, items):
+        codes = array("b")
+        codes.frombytes(self._call(self.shard_of(hotel_name), "make_reservations_bulk", hotel_name, list(items)))
+        return codes
+
+    def available_rooms(self, check_in, check_out, room_type=None):
+        merged = {}
+        for part in self._broadcast("available_rooms", check_in, check_out, room_type):
+            merged.update(part)
+        return merged
+
+    def cheapest_rooms(self, check_in, check_out, limit=10, room_type=None, plan=DEFAULT_PLAN):
+        # Каждый шард возвращает свои limit лучших вариантов, здесь остаётся слить их
+        parts = self._broadcast("cheapest_rooms", check_in, check_out, limit, room_type, plan)
+        return heapq.nsmallest(limit, (row for part in parts for row in part))
+
+    def revenue(self, period="month", start=None, end=None):
+        merged = {}
+        for part in self._broadcast("revenue", period, start, end):
+            merged.update(part)
+        return merged
+
+    def stats(self):
+        merged = {}
+        for part in self._broadcast("stats"):
+            merged.update(part)
+        return merged
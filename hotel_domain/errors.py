@@ -0,0 +1,7 @@
+class BaseHotelError(Exception): pass
+class HotelBookingError(BaseHotelError): pass
+class RoomNotAvailableError(HotelBookingError): pass
+class InvalidGuestDataError(HotelBookingError): pass
+class InvalidDateError(HotelBookingError): pass
+class DataProcessingError(BaseHotelError): pass
+class EmptyRoomListError(DataProcessingError): pass
@@ -0,0 +1,624 @@
+from array import array
+from collections import defaultdict
+from contextlib import nullcontext
+from datetime import date
+from itertools import islice
+
+from .errors import (
+    BaseHotelError, InvalidGuestDataError, InvalidDateError, RoomNotAvailableError,
+    DataProcessingError, EmptyRoomListError,
+)
+from .indexes import RoomTimeline, OccupancyIndex, PriceIndex, GuestIndex, TrigramIndex
+from .logsink import info, error
+from .metrics import REGISTRY, timed
+from .rates import DEFAULT_PLAN, RateEngine
+from .models import (
+    Guest, StoredGuest, Room, Reservation, validate_guest_data, normalize_name, parse_date, parse_stay,
+    _ordinal_to_str, _pricing_engine,
+)
+
+
+BOOKING_OK = 0
+BOOKING_INVALID_GUEST = 1
+BOOKING_INVALID_DATES = 2
+BOOKING_UNKNOWN_ROOM = 3
+BOOKING_ROOM_NOT_AVAILABLE = 4
+BOOKING_BAD_ITEM = 5
+# Позиция без ошибок, но пакет отклонён из-за других позиций и ничего не записано
+BOOKING_NOT_COMMITTED = 6
+
+_reservations_ok = REGISTRY.counter("hotel_reservations_total", "Попытки make_reservation по результату", result="ok")
+_reservations_failed = REGISTRY.counter("hotel_reservations_total", result="failed")
+
+class RoomManager:
+    def __init__(self):
+        self.rooms_1d = []
+        self.rooms_2d = []
+        self._members = {}
+        self._all = PriceIndex()
+        self._grid = PriceIndex()
+        self._by_floor = []
+        self._by_type = defaultdict(PriceIndex)
+        # Индексы "этаж + тип" строятся при первом запросе и дальше поддерживаются update_price
+        self._by_floor_type = {}
+        self._price_matrix = None
+
+    def _track(self, room, delta):
+        member = self._members.get(room.room_number)
+        count = (member[1] if member else 0) + delta
+        if count > 0:
+            self._members[room.room_number] = (room, count)
+            if not member:
+                self._all.add(room)
+                self._by_type[room.room_type].add(room)
+        elif member:
+            del self._members[room.room_number]
+            self._all.remove(room)
+            self._by_type[room.room_type].remove(room)
+
+    def add_room_1d(self, room: Room):
+        self.rooms_1d.append(room)
+        self._track(room, 1)
+        info(f"Добавлена комната в 1D массив: {room.room_number}")
+
+    def set_rooms_2d(self, room_matrix: list[list[Room]]):
+        for row in self.rooms_2d:
+            for room in row:
+                if room is not None:
+                    self._track(room, -1)
+        self.rooms_2d = room_matrix
+        self._grid = PriceIndex()
+        self._by_floor = []
+        self._by_floor_type = {}
+        for row in room_matrix:
+            floor = PriceIndex()
+            for room in row:
+                if room is not None:
+                    floor.add(room)
+                    self._grid.add(room)
+                    self._track(room, 1)
+            self._by_floor.append(floor)
+        self._price_matrix = None
+        info(f"Установлен 2D массив, размер: {len(room_matrix)}x{len(room_matrix[0]) if room_matrix and room_matrix[0] else 0}")
+
+    def update_price(self, room: Room, new_price):
+        # Цену номера из индексов нужно менять через менеджер, иначе порядок нарушится
+        old_price = room.price
+        indexes = [self._all, self._grid, self._by_type[room.room_type], *self._by_floor,
+                   *self._by_floor_type.values()]
+        touched = [index for index in indexes if (old_price, room.room_number) in index]
+        for index in touched:
+            index.remove(room, old_price)
+        room.price = float(new_price)
+        for index in touched:
+            index.add(room)
+        self._price_matrix = None
+    
+    @timed("hotel_find_room_with_max_price_seconds", "Время RoomManager.find_room_with_max_price")
+    def find_room_with_max_price(self) -> Room | None:
+        if not self.rooms_2d or not any(row for row in self.rooms_2d):
+            raise EmptyRoomListError("Двумерный список номеров пуст.")
+
+        max_room = self._grid.max()
+        if max_room is None:
+            raise DataProcessingError("Не удалось найти действительный объект Room.")
+            
+        return max_room
+
+    def _index_for(self, room_type=None, floor=None):
+        if floor is not None:
+            if not 0 <= floor < len(self._by_floor):
+                raise DataProcessingError(f"Нет этажа с индексом {floor}")
+            index = self._by_floor[floor]
+            if room_type is None:
+                return index
+            filtered = self._by_floor_type.get((floor, room_type))
+            if filtered is None:
+                filtered = self._by_floor_type[(floor, room_type)] = PriceIndex()
+                for room in index.rooms:
+                    if room.room_type == room_type:
+                        filtered.add(room)
+            return filtered
+        if room_type is not None:
+            return self._by_type.get(room_type) or PriceIndex()
+        return self._all
+
+    def max_price_room(self, room_type=None, floor=None) -> Room | None:
+        return self._index_for(room_type, floor).max()
+
+    def min_price_room(self, room_type=None, floor=None) -> Room | None:
+        return self._index_for(room_type, floor).min()
+
+    def top_k(self, k, room_type=None, available_only=True, floor=None) -> list[Room]:
+        return self._index_for(room_type, floor).top_k(k, available_only)
+
+    def cheapest_k(self, k, room_type=None, available_only=True, floor=None) -> list[Room]:
+        return self._index_for(room_type, floor).top_k(k, available_only, highest=False)
+
+    def rooms_in_price_range(self, low, high, room_type=None, floor=None) -> list[Room]:
+        return self._index_for(room_type, floor).price_range(low, high)
+
+    def price_matrix(self):
+        # Матрица цен 2D-раскладки (NaN на пустых местах), строится заново только после изменений
+        if self._price_matrix is None:
+            try:
+                import numpy as np
+            except ImportError:
+                raise DataProcessingError("Для price_matrix() требуется пакет numpy")
+            width = max((len(row) for row in self.rooms_2d), default=0)
+            matrix = np.full((len(self.rooms_2d), width), np.nan)
+            for i, row in enumerate(self.rooms_2d):
+                for j, room in enumerate(row):
+                    if room is not None:
+                        matrix[i, j] = room.price
+            self._price_matrix = matrix
+        return self._price_matrix
+class Hotel:
+    # Брони из базы подгружаются в индекс занятости блоками по столько дней
+    OCCUPANCY_CHUNK_DAYS = 32
+    RESERVATION_SORT_KEYS = {
+        "id": lambda row: row[0],
+        "guest": lambda row: (row[2], row[1], row[0]),
+        "room": lambda row: (row[3], row[4]),
+        "check_in": lambda row: (row[4], row[0]),
+        "check_out": lambda row: (row[5], row[0]),
+    }
+
+    def __init__(self, name, repository=None):
+        self.name = name
+        self.repository = repository
+        self.rooms_by_number = {}
+        self.rooms_by_type = defaultdict(list)
+        # Гости по нормализованному ключу (регистр и лишние пробелы не различаются);
+        # guests_dict - тот же словарь ключ -> Guest
+        self.guests = GuestIndex()
+        self.guests_dict = self.guests.by_key
+        self._fuzzy_index = None
+        self.reservations = []
+        self.timelines = {}
+        self.occupancy = OccupancyIndex()
+        self._loaded_chunks = set()
+        self._reservation_query_cache = None
+        # Журнал операций и хранилище снимков, если отель открыт через open_snapshot
+        self.journal = None
+        self.snapshots = None
+        # Тарифные планы и кэш стоимости проживания
+        self.rates = RateEngine()
+        info(f"Создан отель: {self.name}")
+        if repository is not None:
+            self._load_rooms()
+
+    @classmethod
+    def open_sqlite(cls, path, name):
+        from .storage import SQLiteHotelRepository
+        return cls(name, SQLiteHotelRepository(path, name))
+
+    @classmethod
+    def open_snapshot(cls, directory, name, sync=False):
+        # Отель в памяти из снимка и журнала в directory; изменения пишутся в журнал
+        from .snapshot import SnapshotStore
+        return SnapshotStore(directory, sync).open(name)
+
+    def save_snapshot(self, background=True):
+        if self.snapshots is None:
+            raise DataProcessingError("Отель открыт не через open_snapshot")
+        return self.snapshots.snapshot(self, background)
+
+    def _load_rooms(self):
+        count = 0
+        for room_number, room_type, price, is_available in self.repository.load_rooms():
+            room = Room(room_number, room_type, price)
+            room.is_available = bool(is_available)
+            self._register_room(room)
+            count += 1
+        info(f"Загружено номеров из базы: {count}")
+
+    def _register_room(self, room):
+        old = self.rooms_by_number.get(room.room_number)
+        if old is not None:
+            self.rooms_by_type[old.room_type] = [r for r in self.rooms_by_type[old.room_type] if r is not old]
+        self.rooms_by_number[room.room_number] = room
+        self.rooms_by_type[room.room_type].append(room)
+        self.occupancy.add_room(room)
+        if self.repository is None:
+            self.timelines.setdefault(room.room_number, RoomTimeline())
+
+    def _timeline(self, room_number):
+        timeline = self.timelines.get(room_number)
+        if timeline is None and room_number in self.rooms_by_number:
+            timeline = RoomTimeline()
+            if self.repository is not None:
+                for start, end in self.repository.room_stays(room_number):
+                    timeline.starts.append(start)
+                    timeline.ends.append(end)
+            self.timelines[room_number] = timeline
+        return timeline
+
+    def _ensure_days_loaded(self, start, end):
+        if self.repository is None:
+            return
+        chunk = self.OCCUPANCY_CHUNK_DAYS
+        missing = [c for c in range(start // chunk, (end - 1) // chunk + 1) if c not in self._loaded_chunks]
+        if not missing:
+            return
+        for room_number, stay_start, stay_end in self.repository.stays_between(missing[0] * chunk, (missing[-1] + 1) * chunk):
+            self.occupancy.book(room_number, stay_start, stay_end)
+        self._loaded_chunks.update(missing)
+
+    def _journaled(self):
+        # Изменение состояния и его запись в журнал не должны разделяться снимком
+        # (SnapshotStore.snapshot держит ту же блокировку, пока копирует состояние)
+        return self.journal.lock if self.journal is not None else nullcontext()
+
+    def add_room(self, room):
+        with self._journaled():
+            self._register_room(room)
+            if self.repository is not None:
+                self.repository.save_rooms([room])
+            if self.journal is not None:
+                self.journal.rooms([room])
+        info(f"Добавлена {room}")
+        return room
+
+    def add_rooms_bulk(self, rooms):
+        rooms = list(rooms)
+        with self._journaled():
+            for room in rooms:
+                self._register_room(room)
+            if self.repository is not None and rooms:
+                self.repository.save_rooms(rooms)
+            if self.journal is not None and rooms:
+                self.journal.rooms(rooms)
+        info(f"Добавлено номеров пакетом: {len(rooms)}")
+        return rooms
+
+    def update_room(self, room, price=None, is_available=None, manager=None):
+        # Цена и доступность номера меняются только здесь: изменение пишется в базу и журнал.
+        # manager - RoomManager, в индексах которого номер нужно переупорядочить по новой цене
+        if self.rooms_by_number.get(room.room_number) is not room:
+            raise BaseHotelError(f"Номер {room.room_number} не принадлежит отелю {self.name}")
+        with self._journaled():
+            if price is not None:
+                if manager is not None:
+                    manager.update_price(room, price)
+                else:
+                    room.price = float(price)
+            if is_available is not None:
+                room.is_available = bool(is_available)
+            if self.repository is not None:
+                self.repository.save_rooms([room])
+            if self.journal is not None:
+                self.journal.room_updates([room])
+        info(f"Изменена {room}")
+        return room
+
+    def add_guests_bulk(self, guests):
+        # guests: (name, lastName, age). С базой данных строки пишутся сразу в неё,
+        # без создания объектов Guest; возвращает число обработанных строк
+        guests = list(guests)
+        if self.repository is not None:
+            self.repository.save_guests(guests)
+        else:
+            with self._journaled():
+                new_guests = {}
+                for name, last_name, age in guests:
+                    key = GuestIndex.key(name, last_name)
+                    if key not in self.guests and key not in new_guests:
+                        new_guests[key] = Guest(name, last_name, age)
+                self.guests.add_many(new_guests.items())
+                if self.journal is not None and new_guests:
+                    self.journal.guests(new_guests.values())
+        self._index_fuzzy((name, last_name) for name, last_name, _ in guests)
+        info(f"Добавлено гостей пакетом: {len(guests)}")
+        return len(guests)
+
+    def find_guest(self, name, lastName):
+        guest = self.guests.get(name, lastName)
+        if guest is None and self.repository is not None:
+            row = self.repository.find_guest(name, lastName)
+            if row is not None:
+                guest = self.guests.add(self._stored_guest(*row))
+        return guest
+
+    def _stored_guest(self, name, last_name, age):
+        return StoredGuest(name, last_name, age, self._load_guest_reservations)
+
+    def _load_guest_reservations(self, guest, known):
+        # Брони гостя из базы; known - уже созданные в этом процессе объекты тех же броней
+        known = {(r.room.room_number, r.check_in, r.check_out): r for r in known}
+        result = []
+        for room_number, check_in, check_out in self.repository.guest_stays(guest.name, guest.lastName):
+            reservation = known.pop((room_number, check_in, check_out), None)
+            if reservation is None:
+                room = self.rooms_by_number.get(room_number)
+                if room is None:
+                    continue
+                reservation = Reservation.restore(guest, room, check_in, check_out)
+            result.append(reservation)
+        return result
+
+    def add_guest(self, guest):
+        existing = self.find_guest(guest.name, guest.lastName)
+        if existing is not None:
+            info(f"Гость уже существует: {existing}")
+            return existing
+        with self._journaled():
+            self.guests.add(guest)
+            if self.repository is not None:
+                self.repository.save_guests([(guest.name, guest.lastName, guest.age)])
+            if self.journal is not None:
+                self.journal.guests([guest])
+        self._index_fuzzy([(guest.name, guest.lastName)])
+        info(f"Добавлен {guest}")
+        return guest
+
+    def search_guests(self, prefix, limit=20, fuzzy=False):
+        # Гости, у которых имя или фамилия начинаются с prefix (без учёта регистра и пробелов);
+        # fuzzy=True - поиск с опечатками по триграммам, индекс строится при первом вызове
+        if fuzzy:
+            return self._search_guests_fuzzy(prefix, limit)
+        if self.repository is None:
+            return self.guests.search(prefix, limit)
+        return [self.guests.get(name, last_name) or self.guests.add(self._stored_guest(name, last_name, age))
+                for name, last_name, age in self.repository.search_guests(prefix, limit)]
+
+    def _index_fuzzy(self, names):
+        if self._fuzzy_index is not None:
+            for name, last_name in names:
+                self._fuzzy_index.add(GuestIndex.key(name, last_name))
+
+    def _search_guests_fuzzy(self, text, limit):
+        if self._fuzzy_index is None:
+            index = TrigramIndex()
+            if self.repository is not None:
+                for name, last_name, _ in self.repository.iter_guests():
+                    index.add(GuestIndex.key(name, last_name))
+            for key in self.guests.by_key:
+                index.add(key)
+            self._fuzzy_index = index
+        return [guest for guest in (self.find_guest(*key) for key in self._fuzzy_index.search(text, limit))
+                if guest is not None]
+
+    @timed("hotel_make_reservation_seconds", "Время Hotel.make_reservation")
+    def make_reservation(self, guest, room, check_in_date, check_out_date):
+        reservation = None
+        try:
+            if guest is None or not isinstance(guest, Guest):
+                raise InvalidGuestDataError("Гость отсутствует или неверного типа")
+            if room is None or not isinstance(room, Room):
+                raise BaseHotelError("Комната отсутствует или неверного типа")
+            start, end = parse_stay(check_in_date, check_out_date)
+            timeline = self._timeline(room.room_number)
+            if timeline is None or self.rooms_by_number.get(room.room_number) is not room:
+                raise BaseHotelError(f"Номер {room.room_number} не принадлежит отелю {self.name}")
+            if not room.is_available or not timeline.is_free(start, end):
+                raise RoomNotAvailableError(f"Номер {room.room_number} недоступен с {check_in_date} по {check_out_date}")
+            
+            if self.repository is not None:
+                self.repository.save_bookings([(guest.name, guest.lastName, guest.age)],
+                                              [(guest.name, guest.lastName, room.room_number, start, end)])
+            reservation = Reservation(guest, room, start, end)
+            with self._journaled():
+                timeline.add(start, end)
+                self.occupancy.book(room.room_number, start, end)
+                self.reservations.append(reservation)
+                if self.journal is not None:
+                    self.journal.reservations([reservation], [self.guests.get(guest.name, guest.lastName) is guest])
+            info(f"Бронирование создано: {reservation}")
+            return reservation
+            
+        except InvalidGuestDataError as e:
+            error(f"Ошибка данных гостя: {e}")
+        except InvalidDateError as e:
+            error(f"Ошибка в датах бронирования: {e}")
+        except RoomNotAvailableError as e:
+            error(f"Номер недоступен: {e}")
+        except BaseHotelError as e:
+            error(f"Общая ошибка отеля: {e}")
+        except Exception as e:
+            error(f"Неожиданная ошибка: {type(e).__name__}: {e}")
+        finally:
+            (_reservations_ok if reservation else _reservations_failed).inc()
+            info(f"Завершение попытки бронирования. Результат: {'Успех' if reservation else 'Провал'}")
+        
+        return None
+
+    def make_reservations_bulk(self, items, keep_objects=True):
+        # items: (name, lastName, room_number, check_in, check_out).
+        # Либо создаются все брони, либо ни одной; результат - код на каждую позицию.
+        # keep_objects=False при наличии базы пишет брони только в неё, не создавая объектов
+        # Guest/Reservation (для больших импортов): пересечения проверяются запросом к базе,
+        # ленивые RoomTimeline затронутых номеров сбрасываются, а маски занятости обновляются
+        # только для уже загруженных дней - память не растёт с числом записанных броней
+        stored_only = not keep_objects and self.repository is not None
+        items = list(items)
+        codes = array("b", bytes(len(items)))
+        planned = []
+        pending = {}
+        failed = 0
+
+        for idx, item in enumerate(items):
+            try:
+                name, last_name, room_number, check_in, check_out = item
+            except (TypeError, ValueError):
+                codes[idx] = BOOKING_BAD_ITEM
+                failed += 1
+                continue
+            try:
+                validate_guest_data(name, last_name)
+            except InvalidGuestDataError:
+                codes[idx] = BOOKING_INVALID_GUEST
+                failed += 1
+                continue
+            try:
+                start, end = parse_stay(check_in, check_out)
+            except InvalidDateError:
+                codes[idx] = BOOKING_INVALID_DATES
+                failed += 1
+                continue
+            room = self.rooms_by_number.get(room_number)
+            if room is None:
+                codes[idx] = BOOKING_UNKNOWN_ROOM
+                failed += 1
+                continue
+            batch_timeline = pending.get(room_number)
+            if batch_timeline is None:
+                batch_timeline = pending[room_number] = RoomTimeline()
+            if (not room.is_available or not batch_timeline.is_free(start, end)
+                    or not (self._stored_stay_free(room_number, start, end) if stored_only
+                            else self._timeline(room_number).is_free(start, end))):
+                codes[idx] = BOOKING_ROOM_NOT_AVAILABLE
+                failed += 1
+                continue
+            batch_timeline.add(start, end)
+            planned.append((name, last_name, room, start, end))
+
+        if failed:
+            for idx, code in enumerate(codes):
+                if code == BOOKING_OK:
+                    codes[idx] = BOOKING_NOT_COMMITTED
+            error(f"Пакетное бронирование отклонено: {failed} из {len(items)} позиций с ошибками")
+            return codes
+
+        if stored_only:
+            guest_rows = {GuestIndex.key(name, last_name): (name, last_name, None) for name, last_name, *_ in planned}
+            self.repository.save_bookings(guest_rows.values(), [
+                (name, last_name, room.room_number, start, end)
+                for name, last_name, room, start, end in planned
+            ])
+            chunk = self.OCCUPANCY_CHUNK_DAYS
+            for _, _, room, start, end in planned:
+                self.timelines.pop(room.room_number, None)
+                if any(c in self._loaded_chunks for c in range(start // chunk, (end - 1) // chunk + 1)):
+                    self.occupancy.book(room.room_number, start, end)
+            self._index_fuzzy((name, last_name) for name, last_name, *_ in planned)
+            info(f"Пакетное бронирование: записано {len(planned)} бронирований")
+            return codes
+
+        guests = []
+        new_guests = []
+        for name, last_name, *_ in planned:
+            guest = self.find_guest(name, last_name)
+            if guest is None:
+                guest = self.guests.add(Guest(name, last_name))
+                new_guests.append(guest)
+                self._index_fuzzy([(name, last_name)])
+            guests.append(guest)
+        if self.repository is not None:
+            self.repository.save_bookings([(g.name, g.lastName, g.age) for g in new_guests], [
+                (name, last_name, room.room_number, start, end)
+                for name, last_name, room, start, end in planned
+            ])
+
+        new_reservations = []
+        with self._journaled():
+            for guest, (_, _, room, start, end) in zip(guests, planned):
+                new_reservations.append(Reservation(guest, room, start, end))
+                self.timelines[room.room_number].add(start, end)
+                self.occupancy.book(room.room_number, start, end)
+            self.reservations.extend(new_reservations)
+            if self.journal is not None:
+                self.journal.reservations(new_reservations, [True] * len(new_reservations))
+        info(f"Пакетное бронирование: создано {len(new_reservations)} бронирований")
+        return codes
+
+    def _stored_stay_free(self, room_number, start, end) -> bool:
+        # Уже загруженный RoomTimeline отвечает без запроса; иначе пересечение ищется в базе
+        timeline = self.timelines.get(room_number)
+        if timeline is not None:
+            return timeline.is_free(start, end)
+        return self.repository.room_is_free(room_number, start, end)
+
+    def is_room_free(self, room_number, check_in, check_out) -> bool:
+        start, end = parse_stay(check_in, check_out)
+        room = self.rooms_by_number[room_number]
+        return room.is_available and self._timeline(room_number).is_free(start, end)
+    
+    @timed("hotel_available_rooms_seconds", "Время Hotel.available_rooms")
+    def available_rooms(self, check_in=None, check_out=None, room_type=None):
+        if check_in is None:
+            check_in = date.today()
+        if check_out is None:
+            check_out = date.fromordinal(parse_date(check_in) + 1)
+        start, end = parse_stay(check_in, check_out)
+        self._ensure_days_loaded(start, end)
+        return self.occupancy.free_rooms(start, end, room_type)
+
+    def quote_available(self, check_in, check_out, room_type=None, plan=DEFAULT_PLAN):
+        # Свободные номера со стоимостью проживания по плану: [(Room, стоимость)]
+        return self.rates.quotes(self.available_rooms(check_in, check_out, room_type), check_in, check_out, plan)
+
+    def revenue_report(self, period="month", start=None, end=None, seasonal=None,
+                       type_multipliers=None, include_tax=True):
+        pricing = _pricing_engine()
+        rooms = self.rooms_by_number
+        if self.repository is not None:
+            stays = self.repository.iter_stays()
+        else:
+            stays = ((r.room.room_number, r.check_in, r.check_out) for r in self.reservations if r.check_in)
+        prices, types, check_ins, check_outs = [], [], [], []
+        for room_number, check_in, check_out in stays:
+            room = rooms[room_number]
+            prices.append(room.price)
+            types.append(room.room_type)
+            check_ins.append(check_in)
+            check_outs.append(check_out)
+        return pricing.revenue_by_period(
+            prices, check_ins, check_outs, period, types, type_multipliers, seasonal,
+            Room.TAX_RATE if include_tax else 0.0,
+            None if start is None else parse_date(start), None if end is None else parse_date(end),
+        )
+
+    def reservation_count(self):
+        if self.repository is not None:
+            return self.repository.count_reservations()
+        return len(self.reservations)
+
+    def iter_reservation_rows(self):
+        # (name, lastName, room_number, check_in, check_out) без построения объектов Reservation
+        if self.repository is not None:
+            for name, last_name, room_number, start, end in self.repository.iter_reservations():
+                yield name, last_name, room_number, date.fromordinal(start).isoformat(), date.fromordinal(end).isoformat()
+            return
+        for r in self.reservations:
+            yield r.guest.name, r.guest.lastName, r.room.room_number, r.dates[0], r.dates[1]
+
+    def query_reservations(self, offset=0, limit=200, guest=None, room_number=None, start=None, end=None,
+                           order_by="id", descending=False):
+        # Страница броней (id, name, lastName, room_number, check_in, check_out) с фильтром и сортировкой
+        if order_by not in self.RESERVATION_SORT_KEYS:
+            raise DataProcessingError(f"Неизвестное поле сортировки: {order_by}")
+        start = None if start in (None, "") else parse_date(start)
+        end = None if end in (None, "") else parse_date(end)
+        if self.repository is not None:
+            rows = self.repository.query_reservations(offset, limit, guest, room_number, start, end, order_by, descending)
+        else:
+            rows = self._query_reservations_in_memory(offset, limit, guest, room_number, start, end, order_by, descending)
+        return [(rid, name, last_name, number, _ordinal_to_str(ci), _ordinal_to_str(co))
+                for rid, name, last_name, number, ci, co in rows]
+
+    def _query_reservations_in_memory(self, offset, limit, guest, room_number, start, end, order_by, descending):
+        # Так же, как в SQLiteHotelRepository: подстрока нормализованного "имя фамилия"
+        needle = normalize_name(guest) if guest else None
+
+        def matching():
+            for rid, r in enumerate(self.reservations, start=1):
+                if room_number is not None and r.room.room_number != room_number:
+                    continue
+                if start is not None and r.check_out <= start:
+                    continue
+                if end is not None and r.check_in >= end:
+                    continue
+                if needle and needle not in normalize_name(f"{r.guest.name} {r.guest.lastName}"):
+                    continue
+                yield rid, r.guest.name, r.guest.lastName, r.room.room_number, r.check_in, r.check_out
+
+        if order_by == "id" and not descending:
+            return list(islice(matching(), offset, offset + limit))
+        # Отсортированный результат запоминается, пока не изменятся брони или параметры запроса
+        key = (guest, room_number, start, end, order_by, descending, len(self.reservations))
+        cached = self._reservation_query_cache
+        if cached is None or cached[0] != key:
+            rows = sorted(matching(), key=self.RESERVATION_SORT_KEYS[order_by], reverse=descending)
+            cached = self._reservation_query_cache = (key, rows)
+        return cached[1][offset:offset + limit]
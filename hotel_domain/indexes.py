@@ -0,0 +1,249 @@
+from bisect import bisect_left, insort
+from collections import defaultdict
+from heapq import merge
+from itertools import compress
+from math import ceil
+
+from .models import normalize_name
+
+
+class RoomTimeline:
+    # Непересекающиеся интервалы [start, end) в днях, отсортированные по началу,
+    # поэтому концы тоже отсортированы и проверка сводится к одному bisect
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+
+    def is_free(self, start: int, end: int) -> bool:
+        idx = bisect_left(self.starts, end)
+        return idx == 0 or self.ends[idx - 1] <= start
+
+    def add(self, start: int, end: int):
+        idx = bisect_left(self.starts, start)
+        self.starts.insert(idx, start)
+        self.ends.insert(idx, end)
+
+    def remove(self, start: int, end: int):
+        idx = bisect_left(self.starts, start)
+        if idx < len(self.starts) and self.starts[idx] == start and self.ends[idx] == end:
+            del self.starts[idx]
+            del self.ends[idx]
+
+    def __len__(self):
+        return len(self.starts)
+class OccupancyIndex:
+    # Для каждого дня хранится битовая маска занятых номеров (бит = слот номера),
+    # так что поиск свободных номеров на период - это OR масок за ночи периода
+    _BITS = bytes.maketrans(b"01", b"\x00\x01")
+
+    def __init__(self):
+        self.slots = {}
+        self.rooms = []
+        self.all_mask = 0
+        self.type_masks = defaultdict(int)
+        self.days = {}
+
+    def add_room(self, room):
+        slot = self.slots.get(room.room_number)
+        if slot is not None:
+            # Повторное добавление номера заменяет объект и переносит бит в маску нового типа
+            old = self.rooms[slot]
+            bit = 1 << slot
+            self.type_masks[old.room_type] &= ~bit
+            self.type_masks[room.room_type] |= bit
+            self.rooms[slot] = room
+            return
+        bit = 1 << len(self.rooms)
+        self.slots[room.room_number] = len(self.rooms)
+        self.rooms.append(room)
+        self.all_mask |= bit
+        self.type_masks[room.room_type] |= bit
+
+    def book(self, room_number, start: int, end: int):
+        bit = 1 << self.slots[room_number]
+        days = self.days
+        for day in range(start, end):
+            days[day] = days.get(day, 0) | bit
+
+    def release(self, room_number, start: int, end: int):
+        bit = 1 << self.slots[room_number]
+        days = self.days
+        for day in range(start, end):
+            days[day] = days.get(day, 0) & ~bit
+
+    def free_rooms(self, start: int, end: int, room_type=None):
+        mask = self.type_masks.get(room_type, 0) if room_type else self.all_mask
+        days = self.days
+        occupied = 0
+        for day in range(start, end):
+            occupied |= days.get(day, 0)
+        mask &= ~occupied
+        if not mask:
+            return []
+        bits = format(mask, "b")[::-1].encode().translate(self._BITS)
+        return [r for r in compress(self.rooms, bits) if r.is_available]
+class PriceIndex:
+    # Номера, отсортированные по (цена, номер комнаты): max/min за O(1),
+    # top-k за O(k), выборка по диапазону цен за O(log n + k)
+    def __init__(self):
+        self.keys = []
+        self.rooms = []
+
+    def add(self, room):
+        key = (room.price, room.room_number)
+        idx = bisect_left(self.keys, key)
+        if idx < len(self.keys) and self.keys[idx] == key:
+            return
+        self.keys.insert(idx, key)
+        self.rooms.insert(idx, room)
+
+    def remove(self, room, price=None):
+        key = (room.price if price is None else price, room.room_number)
+        idx = bisect_left(self.keys, key)
+        if idx < len(self.keys) and self.keys[idx] == key:
+            del self.keys[idx]
+            del self.rooms[idx]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        idx = bisect_left(self.keys, key)
+        return idx < len(self.keys) and self.keys[idx] == key
+
+    def max(self):
+        return self.rooms[-1] if self.rooms else None
+
+    def min(self):
+        return self.rooms[0] if self.rooms else None
+
+    def top_k(self, k, available_only=False, highest=True):
+        result = []
+        for room in (reversed(self.rooms) if highest else self.rooms):
+            if len(result) >= k:
+                break
+            if not available_only or room.is_available:
+                result.append(room)
+        return result
+
+    def price_range(self, low, high):
+        lo = bisect_left(self.keys, (low,))
+        hi = bisect_left(self.keys, (high, float("inf")))
+        return self.rooms[lo:hi]
+class GuestIndex:
+    # Гости по нормализованному ключу (normalize_name имени и фамилии) и префиксный
+    # поиск по отсортированным строкам "имя фамилия" и "фамилия имя". Новые строки
+    # попадают в небольшой отсортированный хвост, который время от времени
+    # сливается с основным массивом одной сортировкой (timsort сливает два отрезка за O(n))
+    MERGE_MIN = 4096
+
+    def __init__(self):
+        self.by_key = {}
+        self._sorted = []
+        self._recent = []
+
+    @staticmethod
+    def key(name, last_name):
+        return normalize_name(name), normalize_name(last_name)
+
+    def __len__(self):
+        return len(self.by_key)
+
+    def __contains__(self, key):
+        return key in self.by_key
+
+    def get(self, name, last_name):
+        return self.by_key.get(self.key(name, last_name))
+
+    def add(self, guest):
+        # Возвращает уже известного гостя с тем же ключом, если он есть
+        key = self.key(guest.name, guest.lastName)
+        existing = self.by_key.get(key)
+        if existing is not None:
+            return existing
+        self.by_key[key] = guest
+        insort(self._recent, (f"{key[0]} {key[1]}", key))
+        insort(self._recent, (f"{key[1]} {key[0]}", key))
+        if len(self._recent) > max(self.MERGE_MIN, len(self._sorted) // 32):
+            self._merge()
+        return guest
+
+    def add_many(self, items):
+        # items: (ключ, Guest); одна сортировка на весь пакет
+        for key, guest in items:
+            if key not in self.by_key:
+                self.by_key[key] = guest
+                self._recent.append((f"{key[0]} {key[1]}", key))
+                self._recent.append((f"{key[1]} {key[0]}", key))
+        self._merge()
+
+    def _merge(self):
+        self._sorted += self._recent
+        self._sorted.sort()
+        self._recent = []
+
+    @staticmethod
+    def _prefixed(entries, prefix):
+        idx = bisect_left(entries, (prefix,))
+        while idx < len(entries) and entries[idx][0].startswith(prefix):
+            yield entries[idx]
+            idx += 1
+
+    def search(self, prefix, limit=20):
+        # Гости, у которых "имя фамилия" или "фамилия имя" начинается с prefix, по алфавиту
+        prefix = normalize_name(prefix)
+        result, seen = [], set()
+        for _, key in merge(self._prefixed(self._sorted, prefix), self._prefixed(self._recent, prefix)):
+            if key not in seen:
+                seen.add(key)
+                result.append(self.by_key[key])
+                if len(result) >= limit:
+                    break
+        return result
+class TrigramIndex:
+    # Нечёткий поиск с опечатками по триграммам слов имени и фамилии
+    def __init__(self):
+        self.postings = defaultdict(list)
+        self.sizes = {}
+
+    @staticmethod
+    def trigrams(text):
+        # Каждое слово дополняется пробелами, как в pg_trgm: "  иван " -> "  и", " ив", ...
+        grams = set()
+        for word in normalize_name(text).split():
+            word = f"  {word} "
+            grams.update(word[i:i + 3] for i in range(len(word) - 2))
+        return grams
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def add(self, key):
+        # key - нормализованный ключ (имя, фамилия)
+        if key in self.sizes:
+            return
+        grams = self.trigrams(f"{key[0]} {key[1]}")
+        self.sizes[key] = len(grams)
+        for gram in grams:
+            self.postings[gram].append(key)
+
+    def search(self, text, limit=20, min_similarity=0.5):
+        # Отбор по доле триграмм запроса, найденных у гостя (запрос может быть
+        # только фамилией), порядок - по сходству всей строки. Гость с нужной долей
+        # обязан содержать хотя бы одну из len - need + 1 самых редких триграмм
+        # запроса, поэтому длинные списки частых триграмм не просматриваются
+        grams = self.trigrams(text)
+        if not grams:
+            return []
+        need = max(1, ceil(min_similarity * len(grams)))
+        rare = sorted(grams, key=lambda gram: len(self.postings.get(gram, ())))
+        candidates = set()
+        for gram in rare[:len(grams) - need + 1]:
+            candidates.update(self.postings.get(gram, ()))
+        scored = []
+        for key in candidates:
+            common = len(grams & self.trigrams(f"{key[0]} {key[1]}"))
+            if common >= need:
+                scored.append((common / len(grams), common / (len(grams) + self.sizes[key] - common), key))
+        scored.sort(key=lambda item: (-item[0], -item[1], item[2]))
+        return [key for _, _, key in scored[:limit]]
@@ -0,0 +1,254 @@
+# Аналитика hotel.log через mmap: куски по границам строк разбираются параллельно, а контрольная
+# точка (смещение и агрегаты) позволяет при повторном запуске читать только дописанное
+import argparse
+import json
+import mmap
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from .errors import DataProcessingError
+from .logsink import LOG_FILE
+
+
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+# Меньше этого объёма новых данных файл разбирается в текущем процессе
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+BLOCK_SIZE = 4 * 1024 * 1024
+HEAD_BYTES = 64
+SEPARATOR = b" - "
+FAILED_BOOKING = "Результат: Провал".encode("utf-8")
+
+
+class LogStats:
+    # Агрегаты по строкам лога: уровни, поминутные счётчики и ошибки по видам
+    def __init__(self):
+        self.lines = 0
+        self.bad_lines = 0
+        self.levels = Counter()
+        # (минута "ГГГГ-ММ-ДД ЧЧ:ММ", уровень) -> число строк
+        self.minutes = Counter()
+        self.failed_bookings = Counter()
+        # Вид ошибки - текст сообщения ERROR до первого двоеточия
+        self.error_kinds = Counter()
+
+    def merge(self, other):
+        self.lines += other.lines
+        self.bad_lines += other.bad_lines
+        self.levels.update(other.levels)
+        self.minutes.update(other.minutes)
+        self.failed_bookings.update(other.failed_bookings)
+        self.error_kinds.update(other.error_kinds)
+        return self
+
+    def per_minute(self, level=None) -> dict:
+        result = Counter()
+        for (minute, line_level), count in self.minutes.items():
+            if level is None or line_level == level:
+                result[minute] += count
+        return dict(sorted(result.items()))
+
+    def per_hour(self, level=None) -> dict:
+        return _by_hour(self.per_minute(level))
+
+    def failed_bookings_per_hour(self) -> dict:
+        return _by_hour(self.failed_bookings)
+
+    def to_dict(self) -> dict:
+        minutes = {}
+        for (minute, level), count in self.minutes.items():
+            minutes.setdefault(minute, {})[level] = count
+        return {
+            "lines": self.lines,
+            "bad_lines": self.bad_lines,
+            "levels": dict(self.levels),
+            "minutes": minutes,
+            "failed_bookings": dict(self.failed_bookings),
+            "error_kinds": dict(self.error_kinds),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.lines = data.get("lines", 0)
+        stats.bad_lines = data.get("bad_lines", 0)
+        stats.levels.update(data.get("levels", {}))
+        for minute, levels in data.get("minutes", {}).items():
+            for level, count in levels.items():
+                stats.minutes[(minute, level)] = count
+        stats.failed_bookings.update(data.get("failed_bookings", {}))
+        stats.error_kinds.update(data.get("error_kinds", {}))
+        return stats
+
+
+def _by_hour(per_minute) -> dict:
+    result = Counter()
+    for minute, count in per_minute.items():
+        result[minute[:13]] += count
+    return dict(sorted(result.items()))
+
+
+def _scan_block(block, stats):
+    lines = bad = 0
+    levels = Counter()
+    minutes = Counter()
+    failed = Counter()
+    error_kinds = Counter()
+    for line in block.split(b"\n"):
+        if not line:
+            continue
+        lines += 1
+        # "ГГГГ-ММ-ДД ЧЧ:ММ:СС - LEVEL - сообщение"
+        if line[19:22] != SEPARATOR:
+            bad += 1
+            continue
+        level, sep, msg = line[22:].partition(SEPARATOR)
+        if not sep:
+            bad += 1
+            continue
+        minute = line[:16]
+        levels[level] += 1
+        minutes[minute, level] += 1
+        if level == b"ERROR":
+            error_kinds[msg.partition(b":")[0]] += 1
+        elif FAILED_BOOKING in msg:
+            failed[minute] += 1
+
+    stats.lines += lines
+    stats.bad_lines += bad
+    for level, count in levels.items():
+        stats.levels[level.decode("ascii", "replace")] += count
+    for (minute, level), count in minutes.items():
+        stats.minutes[minute.decode("ascii", "replace"), level.decode("ascii", "replace")] += count
+    for minute, count in failed.items():
+        stats.failed_bookings[minute.decode("ascii", "replace")] += count
+    for kind, count in error_kinds.items():
+        stats.error_kinds[kind.decode("utf-8", "replace")] += count
+
+
+def scan_range(path, start, end) -> LogStats:
+    # Разбирает байты [start, end) файла; границы должны приходиться на начало строк
+    stats = LogStats()
+    if end <= start:
+        return stats
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos = start
+        while pos < end:
+            stop = min(pos + BLOCK_SIZE, end)
+            if stop < end:
+                newline = mm.rfind(b"\n", pos, stop)
+                stop = newline + 1 if newline >= 0 else stop
+            _scan_block(mm[pos:stop], stats)
+            pos = stop
+    return stats
+
+
+def split_on_lines(mm, start, end, parts):
+    # Делит [start, end) на parts кусков так, чтобы каждый кончался переводом строки
+    bounds = [start]
+    step = max(1, (end - start) // parts)
+    for i in range(1, parts):
+        newline = mm.find(b"\n", max(bounds[-1], start + i * step), end)
+        if newline < 0 or newline + 1 >= end:
+            break
+        bounds.append(newline + 1)
+    bounds.append(end)
+    return list(zip(bounds, bounds[1:]))
+
+
+def _read_checkpoint(checkpoint):
+    if checkpoint is None or not os.path.exists(checkpoint):
+        return None
+    try:
+        with open(checkpoint, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_checkpoint(checkpoint, offset, head, stats):
+    tmp = checkpoint + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"offset": offset, "head": head, "stats": stats.to_dict()}, f, ensure_ascii=False)
+    os.replace(tmp, checkpoint)
+
+
+def analyze(path=LOG_FILE, checkpoint=CHECKPOINT_SUFFIX, workers=None, reset=False) -> LogStats:
+    # checkpoint по умолчанию - path + ".checkpoint.json", None отключает её;
+    # усечённый или заменённый лог (другое начало файла) разбирается с нуля
+    if checkpoint == CHECKPOINT_SUFFIX:
+        checkpoint = path + CHECKPOINT_SUFFIX
+    try:
+        size = os.path.getsize(path)
+    except OSError as e:
+        raise DataProcessingError(f"Не удалось открыть лог-файл {path}: {e}")
+
+    saved = None if reset else _read_checkpoint(checkpoint)
+    if size == 0:
+        return LogStats()
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        head = mm[:HEAD_BYTES].hex()
+        if saved and saved.get("offset", 0) <= size and head.startswith(saved.get("head") or "-"):
+            stats = LogStats.from_dict(saved["stats"])
+            start = saved["offset"]
+        else:
+            stats, start = LogStats(), 0
+        # Незаконченная последняя строка остаётся до следующего запуска
+        end = mm.rfind(b"\n", start, size) + 1
+        if end <= start:
+            return stats
+        workers = workers or os.cpu_count() or 1
+        if workers > 1 and end - start >= PARALLEL_MIN_BYTES:
+            ranges = split_on_lines(mm, start, end, workers)
+        else:
+            ranges = [(start, end)]
+
+    if len(ranges) == 1:
+        stats.merge(scan_range(path, start, end))
+    else:
+        with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+            for part in pool.map(scan_range, [path] * len(ranges), *zip(*ranges)):
+                stats.merge(part)
+
+    if checkpoint is not None:
+        _write_checkpoint(checkpoint, end, head, stats)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Аналитика лог-файла отеля")
+    parser.add_argument("path", nargs="?", default=LOG_FILE)
+    parser.add_argument("--workers", type=int, help="число процессов (по умолчанию - по числу CPU)")
+    parser.add_argument("--reset", action="store_true", help="игнорировать контрольную точку и разобрать файл заново")
+    parser.add_argument("--no-checkpoint", action="store_true", help="не читать и не сохранять контрольную точку")
+    parser.add_argument("--json", action="store_true", help="вывести агрегаты в JSON")
+    parser.add_argument("--top", type=int, default=10, help="сколько видов ошибок показать")
+    args = parser.parse_args(argv)
+
+    try:
+        stats = analyze(args.path, None if args.no_checkpoint else CHECKPOINT_SUFFIX, args.workers, args.reset)
+    except DataProcessingError as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        json.dump(stats.to_dict(), sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        return 0
+
+    print(f"Строк: {stats.lines} (нераспознанных: {stats.bad_lines})")
+    for level, count in sorted(stats.levels.items()):
+        print(f"  {level:<8} {count}")
+    print("Ошибки по видам:")
+    for kind, count in stats.error_kinds.most_common(args.top):
+        print(f"  {count:>8}  {kind}")
+    print("Неудачные бронирования по часам:")
+    for hour, count in stats.failed_bookings_per_hour().items():
+        print(f"  {hour}:00  {count}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+
+
+class AsyncLogWriter:
+    # Пишет строки пачками из фонового потока (batch_size строк, flush_interval секунд или close());
+    # ротирует файл по max_bytes/rotate_interval, сжатие и хранение архивов - в SegmentArchiver
+    _STOP = object()
+
+    def __init__(self, path, level="INFO", echo=True, batch_size=512, flush_interval=0.5,
+                 max_bytes=None, rotate_interval=None, compression="gzip", backup_count=14,
+                 max_age_days=None):
+        self.path = path
+        self.echo = echo
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.min_level = LEVELS[level]
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self._archiver = None
+        if max_bytes or rotate_interval:
+            # logrotate (gzip, json, shutil...) импортируется, только если ротация включена
+            from .logrotate import SegmentArchiver
+            self._archiver = SegmentArchiver(path, compression, backup_count, max_age_days)
+        self._queue = queue.SimpleQueue()
+        self._closed = False
+        self._last_second = None
+        self._last_stamp = ""
+        self._file = None
+        self._segment_started = None
+        self._segment_first = None
+        self._segment_last = None
+        self._segment_lines = 0
+        # Поток-демон: при выходе процесса хвост очереди сбрасывает close(); для писателя
+        # logsink его вызывает atexit, созданный напрямую писатель закрывает владелец
+        self._thread = threading.Thread(target=self._run, name="hotel-log-writer", daemon=True)
+        self._thread.start()
+
+    def set_level(self, level: str):
+        self.min_level = LEVELS[level]
+
+    def is_enabled(self, level: str) -> bool:
+        return LEVELS.get(level, 0) >= self.min_level
+
+    def write(self, level: str, msg: str):
+        if self._closed or LEVELS.get(level, 0) < self.min_level:
+            return
+        # Форматирование времени откладываем до фонового потока
+        self._queue.put((time.time(), level, msg))
+
+    def flush(self, timeout=None) -> bool:
+        # True, если всё записанное до вызова сброшено; если поток писателя завершился
+        # (например, из-за ошибки), ждать некого - возвращается False, а не зависание
+        if self._closed:
+            return False
+        done = threading.Event()
+        self._queue.put(done)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not done.wait(0.05):
+            if not self._thread.is_alive() or (deadline is not None and time.monotonic() >= deadline):
+                return done.is_set()
+        return True
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(self._STOP)
+        self._thread.join()
+        if self._archiver is not None:
+            self._archiver.close()
+
+    def abandon(self):
+        # Писатель, унаследованный дочерним процессом при fork: его потоков там нет,
+        # поэтому он только перестаёт принимать строки, ничего не дожидаясь
+        self._closed = True
+
+    def _stamp(self, ts: float) -> str:
+        second = int(ts)
+        if second != self._last_second:
+            self._last_second = second
+            self._last_stamp = datetime.fromtimestamp(second).strftime("%Y-%m-%d %H:%M:%S")
+        return self._last_stamp
+
+    def _open(self):
+        self._file = None
+        self._segment_first = self._segment_last = None
+        self._segment_lines = 0
+        try:
+            self._file = open(self.path, "a", encoding="utf-8")
+        except IOError as e:
+            print(f"{self._stamp(time.time())} - ERROR - Не удалось открыть лог-файл: {e}", file=sys.stderr)
+            return
+        self._segment_started = time.time()
+        if self._file.tell() and self._archiver is not None:
+            # Сегмент, оставшийся от прошлого запуска, считается начатым с его первой строки
+            try:
+                with open(self.path, "rb") as f:
+                    first = f.readline()[:19].decode("ascii")
+                self._segment_started = datetime.strptime(first, "%Y-%m-%d %H:%M:%S").timestamp()
+            except (OSError, ValueError):
+                self._segment_started = os.path.getmtime(self.path)
+
+    def _rotate(self):
+        from .logrotate import segment_name
+        self._file.close()
+        target = segment_name(self.path, self._segment_started)
+        try:
+            os.replace(self.path, target)
+        except OSError as e:
+            print(f"{self._stamp(time.time())} - ERROR - Не удалось ротировать лог-файл: {e}", file=sys.stderr)
+        else:
+            if self._segment_first is None:
+                # Сегмент от прошлого запуска: диапазон и число строк архиватор посчитает сам
+                self._archiver.submit(target)
+            else:
+                self._archiver.submit(target, self._segment_first, self._segment_last, self._segment_lines)
+        self._open()
+
+    def _should_rotate(self):
+        if self._archiver is None or self._file is None:
+            return False
+        if self.rotate_interval and time.time() - self._segment_started >= self.rotate_interval:
+            return self._file.tell() > 0
+        return bool(self.max_bytes) and self._file.tell() >= self.max_bytes
+
+    def _run(self):
+        self._open()
+
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        stopping = False
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+
+            waiter = None
+            if item is self._STOP:
+                stopping = True
+            elif isinstance(item, threading.Event):
+                waiter = item
+            elif item is not None:
+                ts, level, msg = item
+                batch.append(f"{self._stamp(ts)} - {level} - {msg}\n")
+                if len(batch) < self.batch_size and time.monotonic() < deadline:
+                    continue
+
+            if batch:
+                if self._should_rotate():
+                    self._rotate()
+                self._write_batch(batch)
+                batch = []
+                if self._should_rotate():
+                    self._rotate()
+            if waiter is not None:
+                waiter.set()
+            deadline = time.monotonic() + self.flush_interval
+
+        if self._file:
+            self._file.close()
+
+    def _write_batch(self, batch):
+        text = "".join(batch)
+        if self.echo:
+            sys.stdout.write(text)
+        if self._file is None:
+            return
+        if self._segment_first is None and not self._file.tell():
+            self._segment_first = batch[0][:19]
+        self._segment_last = batch[-1][:19]
+        self._segment_lines += len(batch)
+        try:
+            self._file.write(text)
+            self._file.flush()
+        except IOError as e:
+            print(f"{self._stamp(time.time())} - ERROR - Не удалось записать в лог-файл: {e}", file=sys.stderr)
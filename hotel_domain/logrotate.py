@@ -0,0 +1,190 @@
+# Архивирование сегментов лога после ротации (сжатие, индекс hotel.log.index.json, хранение) в своём потоке
+import glob
+import gzip
+import json
+import os
+import queue
+import re
+import shutil
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+from .errors import DataProcessingError
+
+
+INDEX_SUFFIX = ".index.json"
+SEGMENT_PATTERN = re.compile(r"\.\d{8}-\d{6}(-\d+)?$")
+COMPRESSIONS = {"gzip": ".gz", "zstd": ".zst", None: ""}
+STAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        raise DataProcessingError("Для сжатия логов в zstd требуется пакет zstandard")
+    return zstandard
+
+
+def index_path(log_path):
+    return log_path + INDEX_SUFFIX
+
+
+def load_segment_index(log_path) -> list[dict]:
+    # [{"file", "first", "last", "lines", "bytes"}], от старых сегментов к новым
+    try:
+        with open(index_path(log_path), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+    except (OSError, ValueError) as e:
+        raise DataProcessingError(f"Не удалось прочитать индекс сегментов лога: {e}")
+
+
+def _stamp(value):
+    if value is None or isinstance(value, str):
+        return value
+    return value.strftime(STAMP_FORMAT)
+
+
+def find_segments(log_path, start=None, end=None) -> list[str]:
+    # Пути архивов, чей диапазон времени пересекается с [start, end]; текущий файл не входит
+    start, end = _stamp(start), _stamp(end)
+    directory = os.path.dirname(log_path)
+    return [
+        os.path.join(directory, segment["file"])
+        for segment in load_segment_index(log_path)
+        if (start is None or segment["last"] >= start) and (end is None or segment["first"] <= end)
+    ]
+
+
+def open_segment(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    if path.endswith(".zst"):
+        return _zstd().open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def iter_log_lines(log_path, start=None, end=None):
+    # Строки за период из нужных архивов и текущего файла, остальные архивы не открываются
+    start, end = _stamp(start), _stamp(end)
+    paths = find_segments(log_path, start, end)
+    if os.path.exists(log_path):
+        paths.append(log_path)
+    for path in paths:
+        with open_segment(path) as f:
+            for line in f:
+                stamp = line[:19]
+                if (start is None or stamp >= start) and (end is None or stamp <= end):
+                    yield line
+
+
+def segment_name(log_path, started):
+    base = f"{log_path}.{time.strftime('%Y%m%d-%H%M%S', time.localtime(started))}"
+    name, n = base, 0
+    while any(os.path.exists(name + ext) for ext in COMPRESSIONS.values()):
+        n += 1
+        name = f"{base}-{n}"
+    return name
+
+
+class SegmentArchiver:
+    # backup_count - сколько последних архивов оставлять, max_age_days - удалять архивы старше этого числа дней
+    _STOP = object()
+
+    def __init__(self, log_path, compression="gzip", backup_count=14, max_age_days=None):
+        if compression not in COMPRESSIONS:
+            raise DataProcessingError(f"Неизвестный формат сжатия логов: {compression}")
+        if compression == "zstd":
+            _zstd()
+        self.log_path = log_path
+        self.compression = compression
+        self.backup_count = backup_count
+        self.max_age_days = max_age_days
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="hotel-log-archiver", daemon=True)
+        self._thread.start()
+        self._recover()
+
+    def submit(self, segment_path, first=None, last=None, lines=None):
+        self._queue.put((segment_path, first, last, lines))
+
+    def close(self):
+        self._queue.put(self._STOP)
+        self._thread.join()
+
+    def _recover(self):
+        # Сегменты, которые не успели сжать и внести в индекс до остановки процесса
+        indexed = {segment["file"] for segment in load_segment_index(self.log_path)}
+        for path in sorted(glob.glob(glob.escape(self.log_path) + ".*")):
+            if SEGMENT_PATTERN.search(path) and os.path.basename(path) not in indexed:
+                self.submit(path)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                return
+            try:
+                self._archive(*item)
+            except (OSError, DataProcessingError) as e:
+                print(f"{datetime.now().strftime(STAMP_FORMAT)} - ERROR - Не удалось архивировать сегмент лога {item[0]}: {e}",
+                      file=sys.stderr)
+
+    def _archive(self, path, first, last, lines):
+        if first is None or last is None or lines is None:
+            first = last = None
+            lines = 0
+            with open(path, "rb") as f:
+                for line in f:
+                    lines += 1
+                    first = first or line[:19].decode("ascii", "replace")
+                    last = line[:19].decode("ascii", "replace")
+            first, last = first or "", last or ""
+        target = path + COMPRESSIONS[self.compression]
+        if self.compression is not None:
+            tmp = target + ".tmp"
+            with open(path, "rb") as src:
+                if self.compression == "gzip":
+                    with gzip.open(tmp, "wb", compresslevel=6) as dst:
+                        shutil.copyfileobj(src, dst, 1024 * 1024)
+                else:
+                    with open(tmp, "wb") as raw:
+                        _zstd().ZstdCompressor().copy_stream(src, raw)
+            os.replace(tmp, target)
+            size = os.path.getsize(path)
+            os.remove(path)
+        else:
+            size = os.path.getsize(path)
+
+        index = load_segment_index(self.log_path)
+        index.append({"file": os.path.basename(target), "first": first, "last": last,
+                      "lines": lines, "bytes": size})
+        index.sort(key=lambda segment: segment["first"])
+        self._write_index(self._apply_retention(index))
+
+    def _apply_retention(self, index):
+        keep = index
+        if self.max_age_days is not None:
+            cutoff = (datetime.now() - timedelta(days=self.max_age_days)).strftime(STAMP_FORMAT)
+            keep = [segment for segment in keep if segment["last"] >= cutoff]
+        if self.backup_count is not None and len(keep) > self.backup_count:
+            keep = keep[len(keep) - self.backup_count:]
+        directory = os.path.dirname(self.log_path)
+        kept = {segment["file"] for segment in keep}
+        for segment in index:
+            if segment["file"] not in kept:
+                try:
+                    os.remove(os.path.join(directory, segment["file"]))
+                except FileNotFoundError:
+                    pass
+        return keep
+
+    def _write_index(self, index):
+        path = index_path(self.log_path)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, indent=1)
+        os.replace(path + ".tmp", path)
@@ -0,0 +1,81 @@
+import atexit
+import os
+
+from .logger import AsyncLogWriter, LEVELS
+from .metrics import REGISTRY, timed
+
+
+LOG_FILE = "hotel.log"
+LOG_LEVEL = "INFO"
+# Ротация: новый сегмент при 50 МБ или раз в сутки, архивы в gzip, хранятся последние 14
+LOG_MAX_BYTES = 50 * 1024 * 1024
+LOG_ROTATE_INTERVAL = 24 * 3600
+LOG_COMPRESSION = "gzip"
+LOG_BACKUP_COUNT = 14
+LOG_MAX_AGE_DAYS = None
+
+# Фоновый писатель создаётся при первой записи, чтобы импорт пакета не запускал поток
+_log_writer = None
+
+def get_log_writer() -> AsyncLogWriter:
+    global _log_writer
+    if _log_writer is None:
+        _log_writer = AsyncLogWriter(
+            LOG_FILE, level=LOG_LEVEL, max_bytes=LOG_MAX_BYTES, rotate_interval=LOG_ROTATE_INTERVAL,
+            compression=LOG_COMPRESSION, backup_count=LOG_BACKUP_COUNT, max_age_days=LOG_MAX_AGE_DAYS,
+        )
+    return _log_writer
+
+def get_log_file() -> str:
+    return LOG_FILE
+
+def set_log_file(path: str):
+    # Следующие строки пойдут в path; текущий писатель дописывает своё и закрывается
+    global LOG_FILE
+    LOG_FILE = path
+    close_log()
+
+def close_log():
+    global _log_writer
+    if _log_writer is not None:
+        _log_writer.close()
+        _log_writer = None
+
+def _reset_after_fork():
+    # После fork в дочернем процессе нет фонового потока писателя: строки копились бы
+    # в очереди, которую никто не разбирает. Новый писатель создаётся при первой записи
+    global _log_writer
+    if _log_writer is not None:
+        _log_writer.abandon()
+        _log_writer = None
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+# Один обработчик на процесс: закрывает того писателя, который текущий на момент выхода
+atexit.register(close_log)
+
+def set_log_level(level: str):
+    global LOG_LEVEL
+    LOG_LEVEL = level
+    if _log_writer is not None:
+        _log_writer.set_level(level)
+
+_log_lines = {level: REGISTRY.counter("hotel_log_lines_total", "Строки, переданные в log()", level=level)
+              for level in LEVELS}
+
+@timed("hotel_log_seconds", "Время вызова log() (без записи на диск)")
+def _log_measured(level: str, msg: str):
+    if level in _log_lines:
+        _log_lines[level].inc()
+    (_log_writer or get_log_writer()).write(level, msg)
+
+def log(level: str, msg: str):
+    # log() вызывается слишком часто для обёртки-декоратора: при выключенных метриках - одна проверка
+    if REGISTRY.enabled:
+        return _log_measured(level, msg)
+    (_log_writer or get_log_writer()).write(level, msg)
+
+def info(msg: str): log("INFO", msg)
+def warning(msg: str): log("WARNING", msg)
+def error(msg: str): log("ERROR", msg)
@@ -0,0 +1,271 @@
+# Метрики (счётчики, гистограммы времени, cProfile по операциям) в реестре REGISTRY; по умолчанию выключены,
+# включаются REGISTRY.enable() или HOTEL_METRICS=1, выгружаются в формате Prometheus или JSON
+import functools
+import json
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from .errors import DataProcessingError
+
+
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0, math.inf)
+
+
+def _label_text(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+
+class Counter:
+    # Монотонный счётчик; inc() ничего не делает, пока реестр выключен
+    __slots__ = ("registry", "name", "labels", "value", "_lock")
+    kind = "counter"
+
+    def __init__(self, registry, name, labels=()):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        if not self.registry.enabled:
+            return
+        with self._lock:
+            self.value += amount
+
+    def reset(self):
+        with self._lock:
+            self.value = 0
+
+    def samples(self):
+        yield self.name, self.labels, self.value
+
+    def to_dict(self):
+        return {"value": self.value}
+
+
+class Histogram:
+    # Гистограмма с фиксированными границами корзин (в секундах для времени)
+    __slots__ = ("registry", "name", "labels", "buckets", "counts", "sum", "count", "_lock")
+    kind = "histogram"
+
+    def __init__(self, registry, name, labels=(), buckets=DEFAULT_BUCKETS):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+        self.buckets = tuple(buckets) if buckets[-1] == math.inf else (*buckets, math.inf)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        if not self.registry.enabled:
+            return
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[idx] += 1
+            self.sum += value
+            self.count += 1
+
+    @contextmanager
+    def time(self):
+        if not self.registry.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def reset(self):
+        with self._lock:
+            self.counts = [0] * len(self.buckets)
+            self.sum = 0.0
+            self.count = 0
+
+    def quantile(self, q):
+        # Оценка квантиля по корзинам: верхняя граница корзины, в которую он попал
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.buckets[-1]
+
+    def samples(self):
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            le = "+Inf" if bound == math.inf else repr(bound)
+            yield f"{self.name}_bucket", (*self.labels, ("le", le)), cumulative
+        yield f"{self.name}_sum", self.labels, self.sum
+        yield f"{self.name}_count", self.labels, self.count
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": {("+Inf" if b == math.inf else repr(b)): c for b, c in zip(self.buckets, self.counts)},
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+        }
+
+
+class MetricsRegistry:
+    # Реестр метрик процесса; метрика определяется именем и набором меток
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._metrics = {}
+        self._help = {}
+        self._lock = threading.Lock()
+        self._profilers = {}
+        self._profile_every = {}
+        self._profile_calls = {}
+        self._profile_lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def _get(self, cls, name, help, labels, **kwargs):
+        key = (name, tuple(sorted(labels.items())))
+        metric = self._metrics.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(key)
+                if metric is None:
+                    metric = self._metrics[key] = cls(self, name, key[1], **kwargs)
+                    if help:
+                        self._help.setdefault(name, help)
+        if not isinstance(metric, cls):
+            raise DataProcessingError(f"Метрика {name} уже зарегистрирована с другим типом")
+        return metric
+
+    def counter(self, name, help="", **labels) -> Counter:
+        return self._get(Counter, name, help, labels)
+
+    def histogram(self, name, help="", buckets=DEFAULT_BUCKETS, **labels) -> Histogram:
+        return self._get(Histogram, name, help, labels, buckets=buckets)
+
+    def timed(self, name, help="", profile_as=None):
+        # Декоратор: время вызова в гистограмму name; profile_as - имя операции для profile()
+        histogram = self.histogram(name, help)
+        operation = profile_as or name
+
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    if operation in self._profile_every:
+                        return self._call_profiled(operation, fn, args, kwargs)
+                    return fn(*args, **kwargs)
+                finally:
+                    histogram.observe(time.perf_counter() - start)
+            return wrapper
+        return decorate
+
+    def profile(self, operation, every=1):
+        # Профилировать каждый every-й вызов операции (имя гистограммы или profile_as из timed);
+        # действует, только пока реестр включён; cProfile импортируется только здесь - он заметно
+        # замедляет импорт пакета, а профилирование нужно редко
+        import cProfile
+        with self._lock:
+            self._profilers.setdefault(operation, cProfile.Profile())
+            self._profile_every[operation] = max(1, int(every))
+            self._profile_calls.setdefault(operation, 0)
+
+    def stop_profiling(self, operation=None):
+        # Накопленная статистика остаётся доступной; clear_profiles() удаляет её
+        with self._lock:
+            for name in ([operation] if operation else list(self._profile_every)):
+                self._profile_every.pop(name, None)
+                self._profile_calls.pop(name, None)
+
+    def clear_profiles(self):
+        import cProfile
+        with self._lock:
+            for name in list(self._profilers):
+                self._profilers[name] = cProfile.Profile()
+
+    def _call_profiled(self, operation, fn, args, kwargs):
+        calls = self._profile_calls[operation] = self._profile_calls.get(operation, 0) + 1
+        profiler = self._profilers.get(operation)
+        if profiler is None or calls % self._profile_every.get(operation, 1):
+            return fn(*args, **kwargs)
+        # Одновременно профилируется один вызов: вложенные и параллельные идут без профилировщика
+        if not self._profile_lock.acquire(blocking=False):
+            return fn(*args, **kwargs)
+        try:
+            profiler.enable()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                profiler.disable()
+        finally:
+            self._profile_lock.release()
+
+    def profile_stats(self, operation):
+        # pstats.Stats по накопленной статистике или None, если вызовов ещё не было
+        import pstats
+        profiler = self._profilers.get(operation)
+        if profiler is None or not profiler.getstats():
+            return None
+        return pstats.Stats(profiler)
+
+    def dump_profiles(self, directory):
+        # Файлы <операция>.prof для snakeviz / python -m pstats
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for operation, profiler in list(self._profilers.items()):
+            if profiler.getstats():
+                path = os.path.join(directory, f"{operation}.prof")
+                profiler.dump_stats(path)
+                paths.append(path)
+        return paths
+
+    def reset(self):
+        for metric in list(self._metrics.values()):
+            metric.reset()
+
+    def to_prometheus(self) -> str:
+        lines = []
+        typed = set()
+        for (name, _), metric in sorted(self._metrics.items(), key=lambda item: item[0]):
+            if name not in typed:
+                typed.add(name)
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} {metric.kind}")
+            for sample, labels, value in metric.samples():
+                lines.append(f"{sample}{_label_text(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def to_json(self) -> str:
+        result = {}
+        for (name, labels), metric in sorted(self._metrics.items(), key=lambda item: item[0]):
+            entry = {"type": metric.kind, **metric.to_dict()}
+            if labels:
+                entry["labels"] = dict(labels)
+            result.setdefault(name, []).append(entry)
+        return json.dumps(result, ensure_ascii=False)
+
+
+REGISTRY = MetricsRegistry(enabled=os.environ.get("HOTEL_METRICS", "") not in ("", "0"))
+timed = REGISTRY.timed
@@ -0,0 +1,341 @@
+from abc import ABC, abstractmethod
+from array import array
+from datetime import date
+
+from .errors import InvalidGuestDataError, InvalidDateError, DataProcessingError
+from .logsink import info
+
+
+def validate_guest_data(name: str, lastname: str):
+    if not isinstance(name, str) or not name.strip():
+        raise InvalidGuestDataError("Имя не должно быть пустой строкой")
+    if not isinstance(lastname, str) or not lastname.strip():
+        raise InvalidGuestDataError("Фамилия не должна быть пустой строкой")
+    
+    if len(name.strip()) < 2 or len(lastname.strip()) < 2:
+        raise InvalidGuestDataError("Имя и фамилия должны быть от 2 символов")
+
+def normalize_name(text) -> str:
+    # Ключ для сравнения имён: без учёта регистра и лишних пробелов
+    return " ".join(str(text).split()).casefold()
+
+def parse_date(value) -> int:
+    if isinstance(value, int):
+        return value
+    if isinstance(value, date):
+        return value.toordinal()
+    try:
+        return date.fromisoformat(str(value).strip()).toordinal()
+    except ValueError:
+        raise InvalidDateError(f"Неверная дата: {value!r}, ожидается ГГГГ-ММ-ДД")
+
+def parse_stay(check_in, check_out) -> tuple[int, int]:
+    start, end = parse_date(check_in), parse_date(check_out)
+    if end <= start:
+        raise InvalidDateError(f"Дата выезда {check_out} должна быть позже даты заезда {check_in}")
+    return start, end
+class Person(ABC):
+    __slots__ = ("name", "lastName", "age")
+
+    def __init__(self, name, lastName, age=None):
+        self.name = name
+        self.lastName = lastName
+        self.age = age
+
+    @abstractmethod
+    def info(self):
+        pass
+
+    @abstractmethod
+    def get_role(self):
+        pass
+
+    def get_full_name(self): 
+        return f"{self.name} {self.lastName}"
+    
+    def __str__(self):
+        return self.info()
+
+    def __repr__(self):
+        age_str = f", age={self.age}" if self.age is not None else ""
+        return f"{self.__class__.__name__}('{self.name}', '{self.lastName}'{age_str})"
+class Guest(Person):
+    __slots__ = ("reservations",)
+
+    def __init__(self, name, lastName, age=None):
+        self.reservations = []
+        super().__init__(name, lastName, age) 
+        info(f"Создан гость: {self.name} {self.lastName}")
+
+    def add_reservation(self, reservation):
+        self.reservations.append(reservation)
+
+    def info(self):
+        return f"Гость {self.name} {self.lastName}, бронирований: {len(self.reservations)}"
+
+    def get_role(self):
+        return "guest"
+class StoredGuest(Guest):
+    # Гость, прочитанный из базы: создаётся без записи в лог, брони подгружаются
+    # функцией load_reservations(guest, known) при первом обращении к reservations.
+    # Брони, созданные до загрузки, уже записаны в базу: они запоминаются в _pending,
+    # чтобы при загрузке вернуть те же объекты, а не их копии
+    __slots__ = ("_load_reservations", "_pending")
+
+    def __init__(self, name, lastName, age=None, load_reservations=None):
+        Person.__init__(self, name, lastName, age)
+        self._load_reservations = load_reservations
+        self._pending = []
+
+    @property
+    def reservations(self):
+        try:
+            return _GUEST_RESERVATIONS.__get__(self)
+        except AttributeError:
+            loaded = self._load_reservations(self, self._pending) if self._load_reservations else self._pending
+            _GUEST_RESERVATIONS.__set__(self, loaded)
+            self._pending = None
+            return loaded
+
+    @reservations.setter
+    def reservations(self, value):
+        _GUEST_RESERVATIONS.__set__(self, value)
+
+    def add_reservation(self, reservation):
+        try:
+            _GUEST_RESERVATIONS.__get__(self).append(reservation)
+        except AttributeError:
+            self._pending.append(reservation)
+# Слот reservations класса Guest: StoredGuest перекрывает его свойством и хранит список в нём же
+_GUEST_RESERVATIONS = Guest.__dict__["reservations"]
+class Employee(Person):
+    __slots__ = ("position", "_salary")
+
+    def __init__(self, name, lastName, position, _salary=0):
+        super().__init__(name, lastName) 
+        self.position = position
+        self._salary = _salary 
+        info(f"Создан сотрудник: {self.name} {self.lastName} ({self.position})")
+
+    def get_full_name(self):
+        return f"{self.lastName} {self.name} ({self.position})"
+
+    def display_info(self, use_base_first=False):
+        base_name = super().get_full_name() 
+        derived_name = self.get_full_name() 
+        salary_access = self._salary 
+        
+        info(f"Доступ к защищенному атрибуту _salary из Employee: {salary_access}₽")
+
+        if use_base_first:
+            return (f"1. Базовый (Person): {base_name}\n"
+                    f"2. Производный (Employee): {derived_name}")
+        else:
+            return (f"1. Производный (Employee): {derived_name}\n"
+                    f"2. Базовый (Person): {base_name}")
+
+    def info(self):
+        return f"Сотрудник {self.get_full_name()}, ЗП: {self._salary}₽"
+
+    def get_role(self):
+        return self.position
+class Room:
+    __slots__ = ("room_number", "room_type", "price", "is_available")
+    total_rooms = 0
+    ROOM_TYPES = {"Single", "Double", "Suite", "Deluxe"}
+    TAX_RATE = 0.18
+    
+    def __init__(self, room_number, room_type, price):
+        if not Room.is_valid_room_type(room_type):
+            raise ValueError(f"Неизвестный тип номера: {room_type}")
+        self.room_number = int(room_number) 
+        self.room_type = room_type
+        self.price = float(price) 
+        self.is_available = True
+        Room.total_rooms += 1
+
+    def __str__(self):
+        return f"комната {self.room_number} ({self.room_type}), {self.price:.2f}₽, {'доступна' if self.is_available else 'недоступна'}"
+
+    def __repr__(self):
+        return f"Room({self.room_number}, '{self.room_type}', {self.price})"
+        
+    def __eq__(self, other):
+        return isinstance(other, Room) and self.room_number == other.room_number
+        
+    def __lt__(self, other):
+        if not isinstance(other, Room):
+            return NotImplemented
+        return self.price < other.price
+        
+    def __add__(self, other):
+        if isinstance(other, Room):
+            return self.price + other.price
+        if isinstance(other, (int, float)):
+            return self.price + other
+        return NotImplemented
+        
+    def __mul__(self, nights):
+        if isinstance(nights, (int, float)):
+            return self.price * nights
+        return NotImplemented
+        
+    def __contains__(self, room_type):
+        return self.room_type.lower() == str(room_type).lower()
+
+    @staticmethod
+    def is_valid_room_type(room_type):
+        return room_type in Room.ROOM_TYPES
+
+    @staticmethod
+    def calculate_total_price(base_price, nights=1, include_tax=True):
+        total = base_price * nights
+        if include_tax:
+            total *= (1 + Room.TAX_RATE)
+        return round(total, 2)
+
+    @staticmethod
+    def calculate_total_prices(base_prices, check_ins, check_outs, room_types=None,
+                               type_multipliers=None, seasonal=None, include_tax=True):
+        pricing = _pricing_engine()
+        return pricing.price_stays(base_prices, check_ins, check_outs, room_types, type_multipliers,
+                                   seasonal, Room.TAX_RATE if include_tax else 0.0)
+
+    @classmethod
+    def get_room_statistics(cls):
+        return {"total_rooms": cls.total_rooms,
+                "available_types": cls.ROOM_TYPES,
+                "tax_rate": cls.TAX_RATE}
+def _pricing_engine():
+    try:
+        from . import pricing
+    except ImportError:
+        raise DataProcessingError("Для пакетного расчёта цен требуется пакет numpy")
+    return pricing
+
+def _to_ordinal(value) -> int:
+    # 0 означает "дата не указана" ("N/A")
+    if isinstance(value, int):
+        return value
+    if value is None or value == "N/A":
+        return 0
+    return parse_date(value)
+
+def _ordinal_to_str(value: int) -> str:
+    return date.fromordinal(value).isoformat() if value else "N/A"
+class Reservation:
+    __slots__ = ("guest", "room", "check_in", "check_out")
+
+    def __init__(self, guest, room, check_in_date="N/A", check_out_date="N/A"):
+        self.guest = guest
+        self.room = room
+        self.check_in = _to_ordinal(check_in_date)
+        self.check_out = _to_ordinal(check_out_date)
+        guest.add_reservation(self)
+
+    @classmethod
+    def restore(cls, guest, room, check_in: int, check_out: int):
+        # Бронь из хранилища: даты уже порядковые, в guest.reservations не добавляется
+        reservation = cls.__new__(cls)
+        reservation.guest = guest
+        reservation.room = room
+        reservation.check_in = check_in
+        reservation.check_out = check_out
+        return reservation
+
+    @property
+    def dates(self):
+        return (_ordinal_to_str(self.check_in), _ordinal_to_str(self.check_out))
+
+    def __str__(self):
+        dates = self.dates
+        return f"Бронь: {self.guest.name} {self.guest.lastName} / Room {self.room.room_number} / {dates[0]} - {dates[1]}"
+        
+    def __repr__(self):
+        guest_repr = repr(self.guest)
+        room_repr = repr(self.room)
+        dates = self.dates
+        return (f"Reservation_Placeholder({guest_repr}, {room_repr}, "
+                f"'{dates[0]}', '{dates[1]}')")
+class ReservationView:
+    # Лёгкое представление строки ReservationStore с тем же API, что у Reservation
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store, index):
+        self._store = store
+        self._index = index
+
+    @property
+    def guest(self):
+        return self._store.guests[self._store.guest_ids[self._index]]
+
+    @property
+    def room(self):
+        return self._store.rooms[self._store.room_numbers[self._index]]
+
+    @property
+    def check_in(self):
+        return self._store.check_ins[self._index]
+
+    @property
+    def check_out(self):
+        return self._store.check_outs[self._index]
+
+    dates = Reservation.dates
+    __str__ = Reservation.__str__
+    __repr__ = Reservation.__repr__
+class ReservationStore:
+    # Колоночное хранение броней: четыре array('i') вместо объекта на каждую бронь
+    def __init__(self):
+        self.room_numbers = array("i")
+        self.guest_ids = array("i")
+        self.check_ins = array("i")
+        self.check_outs = array("i")
+        self.guests = []
+        self.rooms = {}
+        self._guest_ids = {}
+
+    def _guest_id(self, guest):
+        guest_id = self._guest_ids.get(guest)
+        if guest_id is None:
+            guest_id = self._guest_ids[guest] = len(self.guests)
+            self.guests.append(guest)
+        return guest_id
+
+    def add(self, guest, room, check_in, check_out) -> int:
+        # Последний объект номера: после повторного add_room брони ссылаются на новый
+        self.rooms[room.room_number] = room
+        self.room_numbers.append(room.room_number)
+        self.guest_ids.append(self._guest_id(guest))
+        self.check_ins.append(_to_ordinal(check_in))
+        self.check_outs.append(_to_ordinal(check_out))
+        return len(self.room_numbers) - 1
+
+    def append(self, reservation):
+        return self.add(reservation.guest, reservation.room, reservation.check_in, reservation.check_out)
+
+    def extend(self, reservations):
+        for reservation in reservations:
+            self.append(reservation)
+
+    def __len__(self):
+        return len(self.room_numbers)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Индекс брони вне диапазона")
+        return ReservationView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield ReservationView(self, index)
+
+    def to_numpy(self):
+        try:
+            import numpy as np
+        except ImportError:
+            raise DataProcessingError("Для to_numpy() требуется пакет numpy")
+        return {name: np.frombuffer(getattr(self, name), dtype=np.int32)
+                for name in ("room_numbers", "guest_ids", "check_ins", "check_outs")}
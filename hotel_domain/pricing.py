@@ -0,0 +1,80 @@
+from datetime import date
+
+import numpy as np
+
+
+# date.toordinal() для 1970-01-01: сдвиг между порядковыми номерами дней и datetime64[D]
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+PERIODS = {"day": "D", "month": "M", "year": "Y"}
+
+
+def ordinals_to_datetime64(ordinals):
+    return (np.asarray(ordinals, dtype=np.int64) - _EPOCH_ORDINAL).astype("datetime64[D]")
+
+
+def season_calendar(first_day: int, last_day: int, seasonal=None):
+    # Множитель цены на каждую ночь [first_day, last_day); seasonal - 12 множителей по месяцам или None
+    if seasonal is None:
+        return np.ones(last_day - first_day)
+    months = ordinals_to_datetime64(np.arange(first_day, last_day)).astype("datetime64[M]").astype(np.int64) % 12
+    return np.asarray(seasonal, dtype=np.float64)[months]
+
+
+def _type_factors(room_types, type_multipliers, size):
+    if room_types is None or not type_multipliers:
+        return np.ones(size)
+    room_types = np.asarray(room_types)
+    factors = np.ones(size)
+    for room_type, multiplier in type_multipliers.items():
+        factors[room_types == room_type] = multiplier
+    return factors
+
+
+def price_stays(base_prices, check_ins, check_outs, room_types=None, type_multipliers=None,
+                seasonal=None, tax_rate=0.0, min_nights=1):
+    # Стоимость всех проживаний через префиксные суммы календаря: base * type_factor * (cum[out] - cum[in]) * (1 + tax);
+    # проживания короче min_nights оплачиваются как min_nights ночей
+    base_prices = np.asarray(base_prices, dtype=np.float64)
+    check_ins = np.asarray(check_ins, dtype=np.int64)
+    check_outs = np.maximum(np.asarray(check_outs, dtype=np.int64), check_ins + min_nights)
+    if base_prices.size == 0:
+        return np.zeros(0)
+
+    first_day = int(check_ins.min())
+    calendar = season_calendar(first_day, int(check_outs.max()), seasonal)
+    cumulative = np.concatenate(([0.0], np.cumsum(calendar)))
+    nights_weight = cumulative[check_outs - first_day] - cumulative[check_ins - first_day]
+
+    totals = base_prices * _type_factors(room_types, type_multipliers, base_prices.size) * nights_weight
+    return np.round(totals * (1 + tax_rate), 2)
+
+
+def revenue_by_period(base_prices, check_ins, check_outs, period="day", room_types=None,
+                      type_multipliers=None, seasonal=None, tax_rate=0.0, start=None, end=None):
+    # (начала периодов как datetime64, выручка): каждая ночь относится к периоду, в который приходится
+    if period not in PERIODS:
+        raise ValueError(f"Неизвестный период: {period}, ожидается один из {sorted(PERIODS)}")
+    base_prices = np.asarray(base_prices, dtype=np.float64)
+    check_ins = np.asarray(check_ins, dtype=np.int64)
+    check_outs = np.asarray(check_outs, dtype=np.int64)
+    if start is None:
+        start = int(check_ins.min()) if check_ins.size else 0
+    if end is None:
+        end = int(check_outs.max()) if check_outs.size else start
+    if end <= start:
+        return np.array([], dtype=f"datetime64[{PERIODS[period]}]"), np.zeros(0)
+
+    # Разностный массив: +ставка в день заезда, -ставка в день выезда,
+    # после cumsum получается сумма ставок активных проживаний на каждую ночь
+    rates = base_prices * _type_factors(room_types, type_multipliers, base_prices.size)
+    diff = np.zeros(end - start + 1)
+    np.add.at(diff, np.clip(check_ins, start, end) - start, rates)
+    np.add.at(diff, np.clip(check_outs, start, end) - start, -rates)
+    nightly = np.cumsum(diff[:-1]) * season_calendar(start, end, seasonal) * (1 + tax_rate)
+
+    days = ordinals_to_datetime64(np.arange(start, end))
+    if period == "day":
+        return days, np.round(nightly, 2)
+    buckets = days.astype(f"datetime64[{PERIODS[period]}]")
+    labels, index = np.unique(buckets, return_inverse=True)
+    return labels, np.round(np.bincount(index, weights=nightly, minlength=labels.size), 2)
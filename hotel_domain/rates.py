@@ -0,0 +1,187 @@
+# Тарифные планы и LRU-кэш стоимости проживания с TTL. Ключ - (план, тип номера, цена, заезд, выезд):
+# изменение цены даёт новый ключ, а set_plan/remove_plan удаляют записи только своего плана
+import threading
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from datetime import date
+
+from .errors import DataProcessingError
+from .metrics import REGISTRY, timed
+from .models import Room, parse_stay
+
+
+DEFAULT_PLAN = "standard"
+
+_cache_hits = REGISTRY.counter("hotel_quote_cache_total", "Обращения к кэшу стоимости проживания", result="hit")
+_cache_misses = REGISTRY.counter("hotel_quote_cache_total", result="miss")
+_evicted_lru = REGISTRY.counter("hotel_quote_cache_evictions_total", "Удалённые записи кэша стоимости", reason="lru")
+_evicted_ttl = REGISTRY.counter("hotel_quote_cache_evictions_total", reason="ttl")
+_evicted_plan = REGISTRY.counter("hotel_quote_cache_evictions_total", reason="plan")
+
+
+def _month_start(year, month) -> int:
+    return date(year + (month - 1) // 12, (month - 1) % 12 + 1, 1).toordinal()
+
+
+class RatePlan:
+    # Неизменяемый тарифный план (входит в ключ кэша): множители по типу номера, 12 сезонных по месяцам,
+    # скидки {от скольких ночей: доля}, налог (по умолчанию Room.TAX_RATE); менять - через RateEngine.set_plan
+    __slots__ = ("name", "type_multipliers", "seasonal", "los_discounts", "tax_rate", "min_nights")
+
+    def __init__(self, name=DEFAULT_PLAN, type_multipliers=None, seasonal=None, los_discounts=None,
+                 tax_rate=None, min_nights=1):
+        if seasonal is not None and len(seasonal) != 12:
+            raise DataProcessingError(f"План {name}: нужно 12 сезонных множителей, передано {len(seasonal)}")
+        for room_type in type_multipliers or {}:
+            if not Room.is_valid_room_type(room_type):
+                raise DataProcessingError(f"План {name}: неизвестный тип номера {room_type}")
+        if any(not 0 <= discount < 1 for discount in (los_discounts or {}).values()):
+            raise DataProcessingError(f"План {name}: скидка за длительность должна быть в [0, 1)")
+        if min_nights < 1:
+            raise DataProcessingError(f"План {name}: min_nights должно быть не меньше 1")
+        init = object.__setattr__
+        init(self, "name", name)
+        init(self, "type_multipliers", MappingProxyType({t: float(m) for t, m in (type_multipliers or {}).items()}))
+        init(self, "seasonal", tuple(float(m) for m in seasonal) if seasonal is not None else None)
+        # Скидки от большего порога к меньшему: берётся первая подходящая
+        init(self, "los_discounts", tuple(sorted((int(n), float(d)) for n, d in (los_discounts or {}).items())[::-1]))
+        init(self, "tax_rate", Room.TAX_RATE if tax_rate is None else float(tax_rate))
+        init(self, "min_nights", int(min_nights))
+
+    def __setattr__(self, name, value):
+        raise DataProcessingError(f"План {self.name} неизменяем; замените его через RateEngine.set_plan")
+
+    def __delattr__(self, name):
+        raise DataProcessingError(f"План {self.name} неизменяем; замените его через RateEngine.set_plan")
+
+    def __reduce__(self):
+        # mappingproxy не сериализуется pickle: план передаётся аргументами конструктора
+        return RatePlan, (self.name, dict(self.type_multipliers), self.seasonal, dict(self.los_discounts),
+                          self.tax_rate, self.min_nights)
+
+    def __repr__(self):
+        return f"RatePlan('{self.name}')"
+
+    def night_weight(self, start: int, end: int) -> float:
+        # Сумма сезонных множителей по ночам [start, end): по отрезкам месяцев, а не по ночам
+        if self.seasonal is None:
+            return float(end - start)
+        total = 0.0
+        day = start
+        while day < end:
+            current = date.fromordinal(day)
+            stop = min(end, _month_start(current.year, current.month + 1))
+            total += (stop - day) * self.seasonal[current.month - 1]
+            day = stop
+        return total
+
+    def discount(self, nights: int) -> float:
+        for threshold, discount in self.los_discounts:
+            if nights >= threshold:
+                return discount
+        return 0.0
+
+    def price(self, base_price, room_type, start: int, end: int) -> float:
+        # Стоимость проживания с налогом; короткое проживание оплачивается как min_nights ночей
+        end = max(end, start + self.min_nights)
+        total = (base_price * self.type_multipliers.get(room_type, 1.0) * self.night_weight(start, end)
+                 * (1 - self.discount(end - start)))
+        return round(total * (1 + self.tax_rate), 2)
+
+
+class QuoteCache:
+    # LRU поверх OrderedDict: значение - (стоимость, момент истечения); все операции O(1),
+    # кроме drop_plan, который просматривает ключи (смена плана - редкая операция)
+    def __init__(self, max_entries=100_000, ttl=900.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] is None or entry[1] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    _cache_hits.inc()
+                    return entry[0]
+                del self._entries[key]
+                _evicted_ttl.inc()
+            self.misses += 1
+            _cache_misses.inc()
+            return None
+
+    def put(self, key, value):
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                _evicted_lru.inc()
+
+    def drop_plan(self, plan_name) -> int:
+        with self._lock:
+            stale = [key for key in self._entries if key[0].name == plan_name]
+            for key in stale:
+                del self._entries[key]
+        _evicted_plan.inc(len(stale))
+        return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RateEngine:
+    # Расчёт стоимости проживания по тарифным планам с кэшем результатов
+    def __init__(self, plans=(), max_entries=100_000, ttl=900.0):
+        self.plans = {DEFAULT_PLAN: RatePlan(DEFAULT_PLAN)}
+        self.cache = QuoteCache(max_entries, ttl)
+        for plan in plans:
+            self.set_plan(plan)
+
+    def plan(self, name=DEFAULT_PLAN) -> RatePlan:
+        plan = self.plans.get(name)
+        if plan is None:
+            raise DataProcessingError(f"Тарифный план {name} не найден")
+        return plan
+
+    def set_plan(self, plan: RatePlan):
+        # Добавить или заменить план; кэш остальных планов не затрагивается
+        self.plans[plan.name] = plan
+        self.cache.drop_plan(plan.name)
+
+    def remove_plan(self, name):
+        if name == DEFAULT_PLAN:
+            raise DataProcessingError(f"План {DEFAULT_PLAN} нельзя удалить")
+        self.plans.pop(name, None)
+        self.cache.drop_plan(name)
+
+    @timed("hotel_quote_seconds", "Время RateEngine.quote")
+    def quote(self, room: Room, check_in, check_out, plan=DEFAULT_PLAN) -> float:
+        start, end = parse_stay(check_in, check_out)
+        rate_plan = self.plan(plan)
+        key = (rate_plan, room.room_type, room.price, start, end)
+        total = self.cache.get(key)
+        if total is None:
+            total = rate_plan.price(room.price, room.room_type, start, end)
+            self.cache.put(key, total)
+        return total
+
+    def quotes(self, rooms, check_in, check_out, plan=DEFAULT_PLAN) -> list[tuple[Room, float]]:
+        start, end = parse_stay(check_in, check_out)
+        return [(room, self.quote(room, start, end, plan)) for room in rooms]
+
+    def cache_info(self) -> dict:
+        cache = self.cache
+        return {"hits": cache.hits, "misses": cache.misses, "size": len(cache),
+                "max_entries": cache.max_entries, "ttl": cache.ttl}
@@ -0,0 +1,639 @@
+# Снимок отеля в памяти (hotel.snapshot, колонки array + имена одним блоком, читается через mmap)
+# и журнал операций после него (journal.NNNNNNNN); при запуске - снимок плюс проигрывание журналов
+import gc
+import glob
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import time
+import zlib
+from array import array
+from contextlib import contextmanager
+
+from .errors import DataProcessingError
+from .hotel import Hotel
+from .indexes import RoomTimeline
+from .logsink import info, warning, error
+from .models import Room, Guest, Reservation
+
+
+SNAPSHOT_FILE = "hotel.snapshot"
+JOURNAL_PATTERN = re.compile(r"^journal\.(\d{8})$")
+SNAPSHOT_MAGIC = b"HTLSNAP1"
+JOURNAL_MAGIC = b"HTLJRNL1"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<8sII")
+_SECTION = struct.Struct("<8sQQ")
+_RECORD = struct.Struct("<BII")
+_ROOM = struct.Struct("<idB")
+_GUEST = struct.Struct("<i")
+_RESERVATION = struct.Struct("<iiiiB")
+
+OP_ROOM = 1
+OP_GUEST = 2
+OP_RESERVATION = 3
+OP_ROOM_UPDATE = 4
+
+# Возраст None хранится как минимальное int32
+NO_AGE = -2 ** 31
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def journal_name(seq):
+    return f"journal.{seq:08d}"
+
+
+def _age_in(age):
+    return NO_AGE if age is None else int(age)
+
+
+def _age_out(age):
+    return None if age == NO_AGE else age
+
+
+def _join_names(values, what):
+    # Имена одним блоком через \0: при чтении - один decode и один split
+    blob = "\0".join(values)
+    if blob.count("\0") != max(len(values) - 1, 0):
+        raise DataProcessingError(f"{what} гостя содержит символ \\0 и не может быть сохранено в снимке")
+    return blob.encode("utf-8")
+
+
+def _new_room(room_number, room_type, price, is_available):
+    # Номер без конструктора: тип уже проверен при создании, в лог при загрузке не пишем
+    room = Room.__new__(Room)
+    room.room_number = room_number
+    room.room_type = room_type
+    room.price = price
+    room.is_available = is_available
+    Room.total_rooms += 1
+    return room
+
+
+def _new_guest(name, last_name, age):
+    guest = Guest.__new__(Guest)
+    guest.name = name
+    guest.lastName = last_name
+    guest.age = age
+    guest.reservations = []
+    return guest
+
+
+def _new_reservation(guest, room, check_in, check_out):
+    reservation = Reservation.__new__(Reservation)
+    reservation.guest = guest
+    reservation.room = room
+    reservation.check_in = check_in
+    reservation.check_out = check_out
+    guest.reservations.append(reservation)
+    return reservation
+
+
+@contextmanager
+def _gc_paused():
+    # Сборщик циклов запускается на каждые ~700 новых объектов и на миллионах объектов
+    # удваивает время загрузки; циклов при загрузке не образуется
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class _State:
+    # Копия состояния отеля на момент снимка. Списки копируются срезом, словари dict(),
+    # сами объекты не обходятся: брони и имена гостей не меняются после создания,
+    # а изменяемые поля номеров (цена, доступность) снимаются сразу
+    def __init__(self, hotel):
+        rooms = hotel.occupancy.rooms
+        self.name = hotel.name
+        self.room_numbers = array("i", [room.room_number for room in rooms])
+        self.room_types = [room.room_type for room in rooms]
+        self.prices = array("d", [room.price for room in rooms])
+        self.available = bytes(bool(room.is_available) for room in rooms)
+        self.guest_keys = list(hotel.guests.by_key)
+        self.guests = list(hotel.guests.by_key.values())
+        self.reservations = hotel.reservations[:]
+        self.timelines = {number: (timeline.starts[:], timeline.ends[:])
+                          for number, timeline in hotel.timelines.items()}
+        self.days = dict(hotel.occupancy.days)
+        self.slots = dict(hotel.occupancy.slots)
+        self.journal_seq = 1
+
+    def sections(self):
+        # (имя секции, буфер) в порядке записи
+        type_names = sorted(set(self.room_types))
+        type_ids = {room_type: idx for idx, room_type in enumerate(type_names)}
+
+        guests = self.guests
+        guest_ids = {id(guest): idx for idx, guest in enumerate(guests)}
+        indexed = len(guests)
+        res_guests, res_rooms = array("i"), array("i")
+        check_ins, check_outs = array("i"), array("i")
+        slots = self.slots
+        for reservation in self.reservations:
+            guest = reservation.guest
+            guest_id = guest_ids.get(id(guest))
+            if guest_id is None:
+                # Гость брони, не добавленный в отель через add_guest
+                guest_id = guest_ids[id(guest)] = len(guests)
+                guests.append(guest)
+            slot = slots.get(reservation.room.room_number)
+            if slot is None:
+                raise DataProcessingError(f"Бронь на номер {reservation.room.room_number}, которого нет в отеле")
+            res_guests.append(guest_id)
+            res_rooms.append(slot)
+            check_ins.append(reservation.check_in)
+            check_outs.append(reservation.check_out)
+
+        counts, starts, ends = array("i"), array("i"), array("i")
+        for number in self.room_numbers:
+            timeline_starts, timeline_ends = self.timelines.get(number, ((), ()))
+            counts.append(len(timeline_starts))
+            starts.extend(timeline_starts)
+            ends.extend(timeline_ends)
+
+        days, mask_sizes, masks = array("i"), array("i"), bytearray()
+        for day, mask in self.days.items():
+            data = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+            days.append(day)
+            mask_sizes.append(len(data))
+            masks += data
+
+        meta = {
+            "name": self.name,
+            "journal_seq": self.journal_seq,
+            "created": time.time(),
+            "room_types": type_names,
+            "rooms": len(self.room_numbers),
+            "guests": len(guests),
+            "indexed_guests": indexed,
+            "reservations": len(res_guests),
+        }
+        return [
+            (b"meta", json.dumps(meta, ensure_ascii=False).encode("utf-8")),
+            (b"r_num", self.room_numbers),
+            (b"r_type", bytes(type_ids[room_type] for room_type in self.room_types)),
+            (b"r_price", self.prices),
+            (b"r_avail", self.available),
+            (b"g_name", _join_names([guest.name for guest in guests], "Имя")),
+            (b"g_last", _join_names([guest.lastName for guest in guests], "Фамилия")),
+            (b"g_age", array("i", [_age_in(guest.age) for guest in guests])),
+            # Нормализованные ключи гостей из GuestIndex: при загрузке не пересчитываются
+            (b"k_name", _join_names([key[0] for key in self.guest_keys], "Имя")),
+            (b"k_last", _join_names([key[1] for key in self.guest_keys], "Фамилия")),
+            (b"v_guest", res_guests),
+            (b"v_room", res_rooms),
+            (b"v_in", check_ins),
+            (b"v_out", check_outs),
+            (b"t_count", counts),
+            (b"t_start", starts),
+            (b"t_end", ends),
+            (b"o_day", days),
+            (b"o_size", mask_sizes),
+            (b"o_mask", masks),
+        ]
+
+
+def _little_endian(data):
+    if _LITTLE_ENDIAN or not isinstance(data, array):
+        return data
+    data = array(data.typecode, data)
+    data.byteswap()
+    return data
+
+
+def write_snapshot(state, path):
+    # Запись во временный файл, fsync и атомарная замена: при сбое остаётся прежний снимок
+    sections = [(name, _little_endian(data)) for name, data in state.sections()]
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    table = []
+    for name, data in sections:
+        offset = (offset + 7) & ~7
+        size = memoryview(data).nbytes
+        table.append((name, offset, size))
+        offset += size
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(SNAPSHOT_MAGIC, FORMAT_VERSION, len(sections)))
+        for name, section_offset, size in table:
+            f.write(_SECTION.pack(name, section_offset, size))
+        for (_, data), (_, section_offset, _) in zip(sections, table):
+            f.write(b"\0" * (section_offset - f.tell()))
+            f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    _fsync_directory(os.path.dirname(path))
+
+
+def _fsync_directory(directory):
+    if os.name != "posix":
+        return
+    fd = os.open(directory or ".", os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class SnapshotReader:
+    # Секции снимка как memoryview поверх mmap; действительны, пока читатель открыт
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._views = []
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, count = _HEADER.unpack_from(self._map, 0)
+            if magic != SNAPSHOT_MAGIC:
+                raise DataProcessingError(f"{path} не является снимком отеля")
+            if version != FORMAT_VERSION:
+                raise DataProcessingError(f"Неподдерживаемая версия снимка {version} в {path}")
+            self.sections = {}
+            for idx in range(count):
+                name, offset, size = _SECTION.unpack_from(self._map, _HEADER.size + idx * _SECTION.size)
+                if offset + size > len(self._map):
+                    raise DataProcessingError(f"Снимок {path} обрезан")
+                self.sections[name.rstrip(b"\0").decode("ascii")] = (offset, size)
+            self.meta = json.loads(bytes(self.raw("meta")))
+        except (struct.error, ValueError, OSError) as e:
+            self.close()
+            raise DataProcessingError(f"Не удалось прочитать снимок {path}: {e}")
+        except DataProcessingError:
+            self.close()
+            raise
+
+    def raw(self, name) -> memoryview:
+        if name not in self.sections:
+            raise DataProcessingError(f"В снимке {self.path} нет секции {name}")
+        offset, size = self.sections[name]
+        view = memoryview(self._map)[offset:offset + size]
+        self._views.append(view)
+        return view
+
+    def column(self, name, typecode):
+        # memoryview с форматом typecode поверх mmap; на big-endian - копия array
+        view = self.raw(name)
+        if not _LITTLE_ENDIAN:
+            data = array(typecode, view)
+            data.byteswap()
+            return data
+        view = view.cast(typecode)
+        self._views.append(view)
+        return view
+
+    def names(self, name) -> list[str]:
+        view = self.raw(name)
+        if not view.nbytes:
+            return []
+        return str(view, "utf-8").split("\0")
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_snapshot(path) -> tuple[Hotel, int]:
+    # Отель из снимка и номер журнала, с которого нужно продолжить проигрывание
+    with SnapshotReader(path) as reader, _gc_paused():
+        meta = reader.meta
+        hotel = Hotel(meta["name"])
+
+        type_names = meta["room_types"]
+        rooms = [
+            _new_room(number, type_names[type_id], price, bool(available))
+            for number, type_id, price, available in zip(
+                reader.column("r_num", "i").tolist(), reader.raw("r_type").tolist(),
+                reader.column("r_price", "d").tolist(), reader.raw("r_avail").tolist())
+        ]
+        _restore_rooms(hotel, rooms)
+
+        counts = reader.column("t_count", "i").tolist()
+        starts = reader.column("t_start", "i").tolist()
+        ends = reader.column("t_end", "i").tolist()
+        position = 0
+        for room, count in zip(rooms, counts):
+            timeline = hotel.timelines[room.room_number] = RoomTimeline()
+            timeline.starts = starts[position:position + count]
+            timeline.ends = ends[position:position + count]
+            position += count
+
+        days = hotel.occupancy.days
+        masks = reader.raw("o_mask")
+        position = 0
+        for day, size in zip(reader.column("o_day", "i").tolist(), reader.column("o_size", "i").tolist()):
+            days[day] = int.from_bytes(masks[position:position + size], "little")
+            position += size
+
+        # Циклы гостей и броней развёрнуты вместо вызова _new_guest/_new_reservation:
+        # на миллионах объектов вызов функции заметен
+        guests = []
+        append_guest = guests.append
+        new = object.__new__
+        for name, last_name, age in zip(reader.names("g_name"), reader.names("g_last"),
+                                        reader.column("g_age", "i").tolist()):
+            guest = new(Guest)
+            guest.name = name
+            guest.lastName = last_name
+            guest.age = None if age == NO_AGE else age
+            guest.reservations = []
+            append_guest(guest)
+        # Ключи есть только у гостей индекса - они идут первыми, zip обрезает остальных
+        hotel.guests.add_many(zip(zip(reader.names("k_name"), reader.names("k_last")), guests))
+
+        reservations = hotel.reservations
+        append_reservation = reservations.append
+        for guest_id, slot, check_in, check_out in zip(
+                reader.column("v_guest", "i").tolist(), reader.column("v_room", "i").tolist(),
+                reader.column("v_in", "i").tolist(), reader.column("v_out", "i").tolist()):
+            reservation = new(Reservation)
+            reservation.guest = guest = guests[guest_id]
+            reservation.room = rooms[slot]
+            reservation.check_in = check_in
+            reservation.check_out = check_out
+            guest.reservations.append(reservation)
+            append_reservation(reservation)
+    info(f"Загружен снимок {path}: номеров {len(rooms)}, гостей {len(guests)}, "
+         f"бронирований {len(hotel.reservations)}")
+    return hotel, meta["journal_seq"]
+
+
+def _restore_rooms(hotel, rooms):
+    occupancy = hotel.occupancy
+    type_bits = {}
+    for slot, room in enumerate(rooms):
+        hotel.rooms_by_number[room.room_number] = room
+        hotel.rooms_by_type[room.room_type].append(room)
+        occupancy.slots[room.room_number] = slot
+        type_bits.setdefault(room.room_type, bytearray(b"0" * len(rooms)))[slot] = ord("1")
+    occupancy.rooms = rooms
+    occupancy.all_mask = (1 << len(rooms)) - 1
+    # Маска типа собирается из строки битов за один int(), а не len(rooms) операциями |=
+    for room_type, bits in type_bits.items():
+        occupancy.type_masks[room_type] = int(bits[::-1], 2)
+
+
+class Journal:
+    # Запись: код операции, длина, CRC32, данные; сбрасывается в ОС сразу (sync=True - ещё и fsync).
+    # lock - общая блокировка изменений отеля и переключения журнала
+    def __init__(self, directory, seq, sync=False):
+        self.directory = directory
+        self.sync = sync
+        self.seq = seq
+        self.lock = threading.RLock()
+        self._file = None
+        self._open(seq)
+
+    def _open(self, seq):
+        path = os.path.join(self.directory, journal_name(seq))
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(JOURNAL_MAGIC)
+        self.seq = seq
+
+    def rotate(self) -> int:
+        # Следующие операции идут в новый файл; возвращает его номер
+        self._file.close()
+        self._open(self.seq + 1)
+        self._commit()
+        return self.seq
+
+    def _append(self, op, payload):
+        self._file.write(_RECORD.pack(op, len(payload), zlib.crc32(payload)))
+        self._file.write(payload)
+
+    def _commit(self):
+        self._file.flush()
+        if self.sync:
+            os.fsync(self._file.fileno())
+
+    def _room(self, room):
+        self._append(OP_ROOM, _ROOM.pack(room.room_number, room.price, bool(room.is_available))
+                     + room.room_type.encode("utf-8"))
+
+    def _room_update(self, room):
+        self._append(OP_ROOM_UPDATE, _ROOM.pack(room.room_number, room.price, bool(room.is_available)))
+
+    def _guest(self, guest):
+        self._append(OP_GUEST, _GUEST.pack(_age_in(guest.age)) + _join_names([guest.name, guest.lastName], "Имя"))
+
+    def _reservation(self, reservation, indexed):
+        guest = reservation.guest
+        self._append(OP_RESERVATION, _RESERVATION.pack(
+            reservation.room.room_number, reservation.check_in, reservation.check_out,
+            _age_in(guest.age), indexed,
+        ) + _join_names([guest.name, guest.lastName], "Имя"))
+
+    def rooms(self, rooms):
+        for room in rooms:
+            self._room(room)
+        self._commit()
+
+    def room_updates(self, rooms):
+        for room in rooms:
+            self._room_update(room)
+        self._commit()
+
+    def guests(self, guests):
+        for guest in guests:
+            self._guest(guest)
+        self._commit()
+
+    def reservations(self, reservations, indexed):
+        # indexed[i] - гость брони i есть в отеле (add_guest), а не только в самой брони
+        for reservation, guest_indexed in zip(reservations, indexed):
+            self._reservation(reservation, guest_indexed)
+        self._commit()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def replay_journal(hotel, path, truncate_tail=True) -> int:
+    # Применяет операции файла журнала к отелю; оборванная последняя запись
+    # (сбой во время записи) отбрасывается и отрезается от файла
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:len(JOURNAL_MAGIC)] != JOURNAL_MAGIC:
+        raise DataProcessingError(f"{path} не является журналом отеля")
+    position = len(JOURNAL_MAGIC)
+    applied = 0
+    loose_guests = {}
+    # Новые гости копятся здесь и попадают в GuestIndex одним add_many после проигрывания
+    new_guests = {}
+    while position < len(data):
+        if position + _RECORD.size > len(data):
+            break
+        op, size, crc = _RECORD.unpack_from(data, position)
+        payload = data[position + _RECORD.size:position + _RECORD.size + size]
+        if len(payload) != size or zlib.crc32(payload) != crc:
+            break
+        _apply(hotel, op, payload, loose_guests, new_guests)
+        position += _RECORD.size + size
+        applied += 1
+    hotel.guests.add_many(new_guests.items())
+    if position < len(data):
+        if not truncate_tail:
+            raise DataProcessingError(f"Журнал {path} повреждён на смещении {position}")
+        warning(f"Журнал {path}: отброшена неполная запись на смещении {position}")
+        with open(path, "r+b") as f:
+            f.truncate(position)
+    return applied
+
+
+def _indexed_guest(hotel, new_guests, name, last_name, age):
+    key = hotel.guests.key(name, last_name)
+    guest = hotel.guests.by_key.get(key) or new_guests.get(key)
+    if guest is None:
+        guest = new_guests[key] = _new_guest(name, last_name, _age_out(age))
+    return guest
+
+
+def _apply(hotel, op, payload, loose_guests, new_guests):
+    if op == OP_ROOM:
+        number, price, available = _ROOM.unpack_from(payload)
+        room = _new_room(number, payload[_ROOM.size:].decode("utf-8"), price, bool(available))
+        hotel._register_room(room)
+    elif op == OP_ROOM_UPDATE:
+        number, price, available = _ROOM.unpack_from(payload)
+        room = hotel.rooms_by_number.get(number)
+        if room is None:
+            raise DataProcessingError(f"Журнал ссылается на неизвестный номер {number}")
+        room.price = price
+        room.is_available = bool(available)
+    elif op == OP_GUEST:
+        (age,) = _GUEST.unpack_from(payload)
+        name, last_name = payload[_GUEST.size:].decode("utf-8").split("\0")
+        _indexed_guest(hotel, new_guests, name, last_name, age)
+    elif op == OP_RESERVATION:
+        number, check_in, check_out, age, indexed = _RESERVATION.unpack_from(payload)
+        name, last_name = payload[_RESERVATION.size:].decode("utf-8").split("\0")
+        if indexed:
+            guest = _indexed_guest(hotel, new_guests, name, last_name, age)
+        else:
+            # Гость, не добавленный в отель: один объект на журнал для одинаковых данных
+            guest = loose_guests.get((name, last_name, age))
+            if guest is None:
+                guest = loose_guests[(name, last_name, age)] = _new_guest(name, last_name, _age_out(age))
+        room = hotel.rooms_by_number.get(number)
+        if room is None:
+            raise DataProcessingError(f"Журнал ссылается на неизвестный номер {number}")
+        hotel.reservations.append(_new_reservation(guest, room, check_in, check_out))
+        hotel._timeline(number).add(check_in, check_out)
+        hotel.occupancy.book(number, check_in, check_out)
+    else:
+        raise DataProcessingError(f"Неизвестная операция журнала: {op}")
+
+
+class SnapshotStore:
+    # Каталог со снимком и журналами: open() восстанавливает отель, snapshot() сохраняет (по умолчанию в фоне)
+    def __init__(self, directory, sync=False):
+        self.directory = directory
+        self.sync = sync
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self.journal = None
+        self.error = None
+        self._thread = None
+        os.makedirs(directory, exist_ok=True)
+
+    def journals(self) -> list[tuple[int, str]]:
+        result = []
+        for path in glob.glob(os.path.join(glob.escape(self.directory), "journal.*")):
+            match = JOURNAL_PATTERN.match(os.path.basename(path))
+            if match:
+                result.append((int(match.group(1)), path))
+        return sorted(result)
+
+    def open(self, name="Hotel") -> Hotel:
+        started = time.perf_counter()
+        if os.path.exists(self.snapshot_path):
+            hotel, seq = load_snapshot(self.snapshot_path)
+        else:
+            hotel, seq = Hotel(name), 1
+        journals = self.journals()
+        replayed = 0
+        with _gc_paused():
+            for idx, (journal_seq, path) in enumerate(journals):
+                if journal_seq < seq:
+                    # Журнал уже учтён в снимке, но не был удалён до остановки
+                    os.remove(path)
+                    continue
+                replayed += replay_journal(hotel, path, truncate_tail=idx == len(journals) - 1)
+        last_seq = max([seq] + [journal_seq for journal_seq, _ in journals])
+        self.journal = hotel.journal = Journal(self.directory, last_seq, self.sync)
+        hotel.snapshots = self
+        info(f"Отель {hotel.name} восстановлен за {time.perf_counter() - started:.2f} с, "
+             f"операций из журнала: {replayed}")
+        return hotel
+
+    def snapshot(self, hotel, background=True):
+        # Копия состояния и переключение журнала - в вызывающем потоке, запись - в фоне.
+        # Оба шага выполняются под блокировкой журнала: изменение отеля из другого потока
+        # попадает либо в копию, либо в новый журнал, но не теряется между ними.
+        # Возвращает поток записи (или None при background=False)
+        if hotel.repository is not None:
+            raise DataProcessingError("Снимок поддерживается только для отеля без базы данных")
+        if hotel.journal is not self.journal:
+            raise DataProcessingError("Отель открыт не через это хранилище снимков")
+        self.wait()
+        with self.journal.lock:
+            state = _State(hotel)
+            state.journal_seq = self.journal.rotate()
+        if not background:
+            self._write(state)
+            self.wait()
+            return None
+        self._thread = threading.Thread(target=self._write, args=(state,), name="hotel-snapshot")
+        self._thread.start()
+        return self._thread
+
+    def _write(self, state):
+        started = time.perf_counter()
+        try:
+            write_snapshot(state, self.snapshot_path)
+            for journal_seq, path in self.journals():
+                if journal_seq < state.journal_seq:
+                    os.remove(path)
+        except (OSError, DataProcessingError) as e:
+            self.error = e
+            error(f"Не удалось записать снимок отеля {self.snapshot_path}: {e}")
+            return
+        info(f"Снимок отеля записан за {time.perf_counter() - started:.2f} с: {self.snapshot_path}")
+
+    def wait(self):
+        # Дождаться фоновой записи; ошибка записи поднимается здесь
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.error is not None:
+            e, self.error = self.error, None
+            raise DataProcessingError(f"Снимок отеля не записан: {e}")
+
+    def close(self):
+        try:
+            self.wait()
+        finally:
+            if self.journal is not None:
+                self.journal.close()
@@ -0,0 +1,270 @@
+import sqlite3
+
+from .models import normalize_name
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hotels (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS rooms (
+    hotel_id INTEGER NOT NULL REFERENCES hotels(id),
+    room_number INTEGER NOT NULL,
+    room_type TEXT NOT NULL,
+    price REAL NOT NULL,
+    is_available INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (hotel_id, room_number)
+);
+CREATE TABLE IF NOT EXISTS guests (
+    id INTEGER PRIMARY KEY,
+    hotel_id INTEGER NOT NULL REFERENCES hotels(id),
+    name TEXT NOT NULL,
+    last_name TEXT NOT NULL,
+    age INTEGER,
+    name_key TEXT,
+    last_name_key TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS guests_by_name ON guests (hotel_id, name, last_name);
+CREATE TABLE IF NOT EXISTS reservations (
+    id INTEGER PRIMARY KEY,
+    hotel_id INTEGER NOT NULL REFERENCES hotels(id),
+    room_number INTEGER NOT NULL,
+    guest_id INTEGER NOT NULL REFERENCES guests(id),
+    check_in INTEGER NOT NULL,
+    check_out INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reservations_by_room ON reservations (hotel_id, room_number, check_in);
+CREATE INDEX IF NOT EXISTS reservations_by_dates ON reservations (hotel_id, check_out, check_in);
+CREATE INDEX IF NOT EXISTS reservations_by_guest ON reservations (guest_id);
+CREATE INDEX IF NOT EXISTS reservations_by_check_in ON reservations (hotel_id, check_in);
+"""
+# Нормализованные ключи гостей (normalize_name) и индексы для поиска по префиксу
+# "имя фамилия" и "фамилия имя"; создаются после миграции старых баз
+GUEST_KEY_SCHEMA = """
+CREATE UNIQUE INDEX IF NOT EXISTS guests_by_key ON guests (hotel_id, name_key, last_name_key);
+CREATE INDEX IF NOT EXISTS guests_by_full_name ON guests (hotel_id, name_key || ' ' || last_name_key);
+CREATE INDEX IF NOT EXISTS guests_by_last_name ON guests (hotel_id, last_name_key || ' ' || name_key);
+"""
+# Старые базы: заполнить ключи и слить гостей, различавшихся только регистром или пробелами
+SQL_MIGRATE_GUEST_KEYS = """
+UPDATE guests SET name_key = normalize_name(name), last_name_key = normalize_name(last_name);
+CREATE TEMP TABLE guest_merge (old_id INTEGER PRIMARY KEY, keep_id INTEGER NOT NULL);
+INSERT INTO guest_merge
+SELECT g.id, m.keep_id FROM guests g JOIN (
+    SELECT hotel_id, name_key, last_name_key, MIN(id) AS keep_id FROM guests
+    GROUP BY hotel_id, name_key, last_name_key HAVING COUNT(*) > 1
+) m USING (hotel_id, name_key, last_name_key)
+WHERE g.id <> m.keep_id;
+UPDATE reservations SET guest_id = (SELECT keep_id FROM guest_merge WHERE old_id = reservations.guest_id)
+WHERE guest_id IN (SELECT old_id FROM guest_merge);
+DELETE FROM guests WHERE id IN (SELECT old_id FROM guest_merge);
+DROP TABLE guest_merge;
+"""
+
+# Тексты запросов постоянны, поэтому sqlite3 держит их подготовленными в кэше соединения
+SQL_UPSERT_ROOM = """
+INSERT INTO rooms (hotel_id, room_number, room_type, price, is_available) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (hotel_id, room_number) DO UPDATE SET
+    room_type = excluded.room_type, price = excluded.price, is_available = excluded.is_available
+"""
+SQL_INSERT_GUEST = """
+INSERT OR IGNORE INTO guests (hotel_id, name, last_name, age, name_key, last_name_key) VALUES (?, ?, ?, ?, ?, ?)
+"""
+SQL_INSERT_RESERVATION = """
+INSERT INTO reservations (hotel_id, room_number, guest_id, check_in, check_out)
+VALUES (?, ?, (SELECT id FROM guests WHERE hotel_id = ? AND name_key = ? AND last_name_key = ?), ?, ?)
+"""
+SQL_SELECT_ROOMS = "SELECT room_number, room_type, price, is_available FROM rooms WHERE hotel_id = ?"
+SQL_SELECT_GUEST = "SELECT name, last_name, age FROM guests WHERE hotel_id = ? AND name_key = ? AND last_name_key = ?"
+SQL_SEARCH_GUESTS = """
+SELECT {key} AS search_key, name, last_name, age FROM guests
+WHERE hotel_id = ? AND {key} >= ? AND {key} < ? ORDER BY {key} LIMIT ?
+"""
+SQL_SEARCH_GUESTS_BY_FULL_NAME = SQL_SEARCH_GUESTS.format(key="name_key || ' ' || last_name_key")
+SQL_SEARCH_GUESTS_BY_LAST_NAME = SQL_SEARCH_GUESTS.format(key="last_name_key || ' ' || name_key")
+SQL_SELECT_GUEST_STAYS = """
+SELECT r.room_number, r.check_in, r.check_out FROM reservations r JOIN guests g ON g.id = r.guest_id
+WHERE g.hotel_id = ? AND g.name_key = ? AND g.last_name_key = ? ORDER BY r.id
+"""
+SQL_SELECT_ROOM_STAYS = """
+SELECT check_in, check_out FROM reservations
+WHERE hotel_id = ? AND room_number = ? ORDER BY check_in
+"""
+SQL_ROOM_STAY_OVERLAPS = """
+SELECT 1 FROM reservations
+WHERE hotel_id = ? AND room_number = ? AND check_in < ? AND check_out > ? LIMIT 1
+"""
+SQL_SELECT_STAYS_BETWEEN = """
+SELECT room_number, check_in, check_out FROM reservations
+WHERE hotel_id = ? AND check_out > ? AND check_in < ?
+"""
+SQL_SELECT_RESERVATIONS = """
+SELECT g.name, g.last_name, r.room_number, r.check_in, r.check_out
+FROM reservations r JOIN guests g ON g.id = r.guest_id
+WHERE r.hotel_id = ? ORDER BY r.id
+"""
+SQL_SELECT_STAYS = "SELECT room_number, check_in, check_out FROM reservations WHERE hotel_id = ?"
+# Допустимые поля сортировки в query_reservations (подставляются в ORDER BY)
+RESERVATION_ORDER_COLUMNS = {
+    "id": "r.id",
+    "guest": "g.last_name, g.name, r.id",
+    "room": "r.room_number, r.check_in",
+    "check_in": "r.check_in, r.id",
+    "check_out": "r.check_out, r.id",
+}
+SQL_SELECT_GUESTS = "SELECT name, last_name, age FROM guests WHERE hotel_id = ? ORDER BY id"
+SQL_COUNT_RESERVATIONS = "SELECT COUNT(*) FROM reservations WHERE hotel_id = ?"
+
+
+def _escape_like(text):
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class SQLiteHotelRepository:
+    # Хранилище отеля в SQLite (WAL); даты броней - порядковые номера дней (date.toordinal())
+    def __init__(self, path, hotel_name):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False, cached_statements=64)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+        with self.conn:
+            self.conn.execute("INSERT OR IGNORE INTO hotels (name) VALUES (?)", (hotel_name,))
+        self.hotel_id = self.conn.execute("SELECT id FROM hotels WHERE name = ?", (hotel_name,)).fetchone()[0]
+
+    def _migrate(self):
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(guests)")}
+        if "name_key" not in columns:
+            self.conn.execute("ALTER TABLE guests ADD COLUMN name_key TEXT")
+            self.conn.execute("ALTER TABLE guests ADD COLUMN last_name_key TEXT")
+        if "name_key" not in columns or self.conn.execute(
+                "SELECT 1 FROM guests WHERE name_key IS NULL LIMIT 1").fetchone():
+            self.conn.create_function("normalize_name", 1, normalize_name, deterministic=True)
+            self.conn.executescript("BEGIN;" + SQL_MIGRATE_GUEST_KEYS + "COMMIT;")
+        self.conn.executescript(GUEST_KEY_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def save_rooms(self, rooms):
+        with self.conn:
+            self.conn.executemany(SQL_UPSERT_ROOM, (
+                (self.hotel_id, r.room_number, r.room_type, r.price, int(r.is_available)) for r in rooms
+            ))
+
+    def save_guests(self, guests):
+        # guests: (name, lastName, age)
+        with self.conn:
+            self.conn.executemany(SQL_INSERT_GUEST, (
+                (self.hotel_id, name, last_name, age, normalize_name(name), normalize_name(last_name))
+                for name, last_name, age in guests
+            ))
+
+    def save_bookings(self, guests, stays):
+        # Новые гости и брони пишутся одной транзакцией.
+        # guests: (name, lastName, age); stays: (name, lastName, room_number, check_in, check_out), даты - порядковые номера дней
+        hotel_id = self.hotel_id
+        with self.conn:
+            self.conn.executemany(SQL_INSERT_GUEST, (
+                (hotel_id, name, last_name, age, normalize_name(name), normalize_name(last_name))
+                for name, last_name, age in guests
+            ))
+            self.conn.executemany(SQL_INSERT_RESERVATION, (
+                (hotel_id, room_number, hotel_id, normalize_name(name), normalize_name(last_name), check_in, check_out)
+                for name, last_name, room_number, check_in, check_out in stays
+            ))
+
+    def load_rooms(self):
+        return self.conn.execute(SQL_SELECT_ROOMS, (self.hotel_id,)).fetchall()
+
+    def find_guest(self, name, last_name):
+        key = (self.hotel_id, normalize_name(name), normalize_name(last_name))
+        return self.conn.execute(SQL_SELECT_GUEST, key).fetchone()
+
+    def search_guests(self, prefix, limit=20):
+        # (name, last_name, age) гостей, у которых "имя фамилия" или "фамилия имя" начинается с prefix
+        prefix = normalize_name(prefix)
+        params = (self.hotel_id, prefix, prefix + "\U0010ffff", limit)
+        rows = sorted(self.conn.execute(SQL_SEARCH_GUESTS_BY_FULL_NAME, params).fetchall()
+                      + self.conn.execute(SQL_SEARCH_GUESTS_BY_LAST_NAME, params).fetchall())
+        result, seen = [], set()
+        for _, name, last_name, age in rows:
+            key = (normalize_name(name), normalize_name(last_name))
+            if key not in seen:
+                seen.add(key)
+                result.append((name, last_name, age))
+        return result[:limit]
+
+    def guest_stays(self, name, last_name):
+        # (room_number, check_in, check_out) броней гостя в порядке создания
+        key = (self.hotel_id, normalize_name(name), normalize_name(last_name))
+        return self.conn.execute(SQL_SELECT_GUEST_STAYS, key).fetchall()
+
+    def room_stays(self, room_number):
+        return self.conn.execute(SQL_SELECT_ROOM_STAYS, (self.hotel_id, room_number)).fetchall()
+
+    def room_is_free(self, room_number, start, end) -> bool:
+        # Проверка пересечения с бронями номера в базе, без загрузки всех его броней
+        params = (self.hotel_id, room_number, end, start)
+        return self.conn.execute(SQL_ROOM_STAY_OVERLAPS, params).fetchone() is None
+
+    def stays_between(self, start, end):
+        return self.conn.execute(SQL_SELECT_STAYS_BETWEEN, (self.hotel_id, start, end)).fetchall()
+
+    def iter_reservations(self, batch_size=1000):
+        cursor = self.conn.execute(SQL_SELECT_RESERVATIONS, (self.hotel_id,))
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield from rows
+
+    def iter_guests(self, batch_size=10000):
+        cursor = self.conn.execute(SQL_SELECT_GUESTS, (self.hotel_id,))
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield from rows
+
+    def iter_stays(self, batch_size=10000):
+        cursor = self.conn.execute(SQL_SELECT_STAYS, (self.hotel_id,))
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield from rows
+
+    def query_reservations(self, offset, limit, guest=None, room_number=None, start=None, end=None,
+                           order_by="id", descending=False):
+        # Страница броней: (id, name, last_name, room_number, check_in, check_out)
+        where = ["r.hotel_id = ?"]
+        params = [self.hotel_id]
+        if guest and normalize_name(guest):
+            # Ключи уже в casefold, поэтому регистр (в том числе кириллицы) не важен;
+            # % и _ из запроса ищутся как обычные символы
+            where.append("(g.name_key || ' ' || g.last_name_key) LIKE ? ESCAPE '\\'")
+            params.append(f"%{_escape_like(normalize_name(guest))}%")
+        if room_number is not None:
+            where.append("r.room_number = ?")
+            params.append(room_number)
+        if start is not None:
+            where.append("r.check_out > ?")
+            params.append(start)
+        if end is not None:
+            where.append("r.check_in < ?")
+            params.append(end)
+        direction = " DESC" if descending else ""
+        order = ", ".join(column + direction for column in RESERVATION_ORDER_COLUMNS[order_by].split(", "))
+        sql = (
+            "SELECT r.id, g.name, g.last_name, r.room_number, r.check_in, r.check_out "
+            "FROM reservations r JOIN guests g ON g.id = r.guest_id "
+            f"WHERE {' AND '.join(where)} ORDER BY {order} LIMIT ? OFFSET ?"
+        )
+        return self.conn.execute(sql, (*params, limit, offset)).fetchall()
+
+    def count_reservations(self):
+        return self.conn.execute(SQL_COUNT_RESERVATIONS, (self.hotel_id,)).fetchone()[0]
@@ -0,0 +1,331 @@
+# Потоковый импорт и экспорт в CSV/JSONL пакетами по chunk_size; ошибочные строки учитываются в ImportStats.
+# Память ограничена пакетом только с базой данных: отель без базы сам хранит все объекты
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from itertools import islice
+
+from .errors import BaseHotelError, DataProcessingError
+from .hotel import (
+    Hotel, BOOKING_INVALID_GUEST, BOOKING_INVALID_DATES, BOOKING_UNKNOWN_ROOM,
+    BOOKING_ROOM_NOT_AVAILABLE, BOOKING_BAD_ITEM, BOOKING_NOT_COMMITTED,
+)
+from .logsink import info, warning
+from .models import Room, validate_guest_data
+
+
+FIELDS = {
+    "rooms": ("room_number", "room_type", "price", "is_available"),
+    "guests": ("name", "last_name", "age"),
+    "reservations": ("name", "last_name", "room_number", "check_in", "check_out"),
+}
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+BOOKING_MESSAGES = {
+    BOOKING_INVALID_GUEST: "неверные данные гостя",
+    BOOKING_INVALID_DATES: "неверные даты",
+    BOOKING_UNKNOWN_ROOM: "номер не найден",
+    BOOKING_ROOM_NOT_AVAILABLE: "номер недоступен на эти даты",
+    BOOKING_BAD_ITEM: "неверная строка",
+    BOOKING_NOT_COMMITTED: "пакет отклонён при повторной попытке",
+}
+TRUE_VALUES = {"1", "true", "yes", "да"}
+FALSE_VALUES = {"0", "false", "no", "нет"}
+
+
+class ImportStats:
+    # Счётчики импорта/экспорта: прочитано, принято, отклонено и скорость
+    def __init__(self, progress=None, progress_every=10000, max_errors=100):
+        self.read = 0
+        self.ok = 0
+        self.failed = 0
+        self.errors = []
+        self.progress = progress
+        self.progress_every = progress_every
+        self.max_errors = max_errors
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def row_read(self):
+        self.read += 1
+        if self.progress is not None and self.read % self.progress_every == 0:
+            self.progress(self)
+
+    def fail(self, line, message):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((line, message))
+
+    def finish(self):
+        self.finished = time.perf_counter()
+        return self
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def rate(self) -> float:
+        elapsed = self.elapsed
+        return self.read / elapsed if elapsed > 0 else 0.0
+
+    def __str__(self):
+        return (f"прочитано {self.read}, принято {self.ok}, отклонено {self.failed} "
+                f"за {self.elapsed:.2f} с ({self.rate:,.0f} строк/с)")
+
+
+def detect_format(path, fmt=None) -> str:
+    if fmt is not None:
+        if fmt not in FORMATS.values():
+            raise DataProcessingError(f"Неизвестный формат: {fmt}")
+        return fmt
+    fmt = FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise DataProcessingError(f"Не удалось определить формат файла {path}, укажите csv или jsonl")
+    return fmt
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def read_records(path, fmt=None, stats=None):
+    # (номер строки, словарь полей); битые строки JSONL пропускаются и попадают в stats
+    fmt = detect_format(path, fmt)
+    with open(path, encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            reader = csv.DictReader(f)
+            for record in reader:
+                if stats is not None:
+                    stats.row_read()
+                yield reader.line_num, record
+            return
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            if stats is not None:
+                stats.row_read()
+            try:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError("ожидается JSON-объект")
+            except ValueError as e:
+                if stats is not None:
+                    stats.fail(line_no, f"неверный JSON: {e}")
+                continue
+            yield line_no, record
+
+
+def _optional_int(value):
+    if value is None or value == "":
+        return None
+    return int(value)
+
+
+def _parse_bool(value):
+    if value is None or value == "":
+        return True
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().casefold()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise ValueError(f"ожидается да/нет, получено {value!r}")
+
+
+def valid_rooms(records, hotel, stats):
+    seen = set()
+    for line, record in records:
+        try:
+            room = Room(record.get("room_number"), record.get("room_type"), record.get("price"))
+            room.is_available = _parse_bool(record.get("is_available"))
+        except (TypeError, ValueError) as e:
+            stats.fail(line, str(e))
+            continue
+        if room.room_number in seen or room.room_number in hotel.rooms_by_number:
+            stats.fail(line, f"номер {room.room_number} уже существует")
+            continue
+        seen.add(room.room_number)
+        yield room
+
+
+def valid_guests(records, stats):
+    for line, record in records:
+        name, last_name = record.get("name"), record.get("last_name")
+        try:
+            validate_guest_data(name, last_name)
+            age = _optional_int(record.get("age"))
+        except BaseHotelError as e:
+            stats.fail(line, str(e))
+            continue
+        except (TypeError, ValueError) as e:
+            stats.fail(line, f"неверный возраст: {e}")
+            continue
+        yield name.strip(), last_name.strip(), age
+
+
+def reservation_items(records, stats):
+    # Полная проверка броней выполняется в make_reservations_bulk, здесь только приведение типов
+    for line, record in records:
+        try:
+            room_number = int(record.get("room_number"))
+        except (TypeError, ValueError):
+            stats.fail(line, f"неверный номер комнаты: {record.get('room_number')!r}")
+            continue
+        name, last_name = record.get("name"), record.get("last_name")
+        if isinstance(name, str):
+            name = name.strip()
+        if isinstance(last_name, str):
+            last_name = last_name.strip()
+        yield line, (name, last_name, room_number, record.get("check_in"), record.get("check_out"))
+
+
+def import_rooms(hotel, path, fmt=None, chunk_size=5000, stats=None):
+    stats = stats or ImportStats()
+    for chunk in chunked(valid_rooms(read_records(path, fmt, stats), hotel, stats), chunk_size):
+        hotel.add_rooms_bulk(chunk)
+        stats.ok += len(chunk)
+    return _finish(stats, "номеров", path)
+
+
+def import_guests(hotel, path, fmt=None, chunk_size=5000, stats=None):
+    stats = stats or ImportStats()
+    for chunk in chunked(valid_guests(read_records(path, fmt, stats), stats), chunk_size):
+        stats.ok += hotel.add_guests_bulk(chunk)
+    return _finish(stats, "гостей", path)
+
+
+def import_reservations(hotel, path, fmt=None, chunk_size=5000, stats=None):
+    # Пакетное бронирование атомарно: если в пакете есть ошибки, строки с кодом
+    # BOOKING_NOT_COMMITTED (без своих ошибок) повторяются одним пакетом. С базой данных брони пишутся только в неё
+    # (make_reservations_bulk с keep_objects=False), память не растёт с числом строк.
+    stats = stats or ImportStats()
+    keep_objects = hotel.repository is None
+    for chunk in chunked(reservation_items(read_records(path, fmt, stats), stats), chunk_size):
+        lines = [line for line, _ in chunk]
+        items = [item for _, item in chunk]
+        codes = hotel.make_reservations_bulk(items, keep_objects=keep_objects)
+        if not any(codes):
+            stats.ok += len(items)
+            continue
+        retry = []
+        for line, item, code in zip(lines, items, codes):
+            if code == BOOKING_NOT_COMMITTED:
+                retry.append((line, item))
+            else:
+                stats.fail(line, BOOKING_MESSAGES.get(code, f"код {code}"))
+        if not retry:
+            continue
+        codes = hotel.make_reservations_bulk([item for _, item in retry], keep_objects=keep_objects)
+        if not any(codes):
+            stats.ok += len(retry)
+            continue
+        for (line, _), code in zip(retry, codes):
+            stats.fail(line, BOOKING_MESSAGES.get(code, f"код {code}"))
+    return _finish(stats, "бронирований", path)
+
+
+def _finish(stats, what, path):
+    stats.finish()
+    info(f"Импорт {what} из {path}: {stats}")
+    if stats.failed:
+        warning(f"Импорт {what} из {path}: отклонено строк {stats.failed}, первая ошибка: "
+                f"строка {stats.errors[0][0]}: {stats.errors[0][1]}")
+    return stats
+
+
+def write_records(path, fields, rows, fmt=None, stats=None):
+    # rows - кортежи в порядке fields; файл пишется по мере чтения генератора
+    fmt = detect_format(path, fmt)
+    stats = stats or ImportStats()
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            writer = csv.writer(f)
+            writer.writerow(fields)
+            for row in rows:
+                writer.writerow(row)
+                stats.row_read()
+        else:
+            for row in rows:
+                f.write(json.dumps(dict(zip(fields, row)), ensure_ascii=False))
+                f.write("\n")
+                stats.row_read()
+    stats.ok = stats.read
+    return stats.finish()
+
+
+def _room_rows(hotel):
+    for room in hotel.rooms_by_number.values():
+        yield room.room_number, room.room_type, room.price, int(room.is_available)
+
+
+def _guest_rows(hotel):
+    if hotel.repository is not None:
+        yield from hotel.repository.iter_guests()
+        return
+    for guest in hotel.guests_dict.values():
+        yield guest.name, guest.lastName, guest.age
+
+
+def export_rooms(hotel, path, fmt=None, stats=None):
+    return _exported(write_records(path, FIELDS["rooms"], _room_rows(hotel), fmt, stats), "номеров", path)
+
+
+def export_guests(hotel, path, fmt=None, stats=None):
+    return _exported(write_records(path, FIELDS["guests"], _guest_rows(hotel), fmt, stats), "гостей", path)
+
+
+def export_reservations(hotel, path, fmt=None, stats=None):
+    rows = hotel.iter_reservation_rows()
+    return _exported(write_records(path, FIELDS["reservations"], rows, fmt, stats), "бронирований", path)
+
+
+def _exported(stats, what, path):
+    info(f"Экспорт {what} в {path}: {stats}")
+    return stats
+
+
+IMPORTERS = {"rooms": import_rooms, "guests": import_guests, "reservations": import_reservations}
+EXPORTERS = {"rooms": export_rooms, "guests": export_guests, "reservations": export_reservations}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Импорт и экспорт данных отеля в CSV/JSONL")
+    parser.add_argument("action", choices=("import", "export"))
+    parser.add_argument("kind", choices=tuple(FIELDS))
+    parser.add_argument("path")
+    parser.add_argument("--db", required=True, help="файл SQLite отеля")
+    parser.add_argument("--hotel", default="Grand Hotel")
+    parser.add_argument("--format", choices=("csv", "jsonl"))
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    def progress(stats):
+        print(f"\r{stats}", end="", file=sys.stderr, flush=True)
+
+    hotel = Hotel.open_sqlite(args.db, args.hotel)
+    stats = ImportStats(progress=progress)
+    try:
+        if args.action == "import":
+            IMPORTERS[args.kind](hotel, args.path, args.format, args.chunk_size, stats)
+        else:
+            EXPORTERS[args.kind](hotel, args.path, args.format, stats)
+    except (OSError, BaseHotelError) as e:
+        print(f"\nОшибка: {e}", file=sys.stderr)
+        return 1
+    finally:
+        hotel.repository.close()
+    print(f"\r{stats}", file=sys.stderr)
+    for line, message in stats.errors:
+        print(f"  строка {line}: {message}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,552 @@
+from bisect import bisect_left
+from datetime import datetime, timedelta
+import time
+
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QGridLayout, QHBoxLayout,
+    QLabel, QLineEdit, QComboBox, QPushButton, QMessageBox,
+    QDialog, QTableView, QHeaderView
+)
+from PyQt5.QtCore import (
+    Qt, QObject, QRunnable, QThreadPool, QTimer, pyqtSignal,
+    QAbstractTableModel, QAbstractListModel, QSortFilterProxyModel, QModelIndex
+)
+
+from hotel_domain import (
+    Hotel, Guest, BaseHotelError, InvalidGuestDataError, InvalidDateError,
+    validate_guest_data, parse_stay, info, warning, error, REGISTRY,
+)
+
+
+_refresh_requests = REGISTRY.counter("gui_refresh_rooms_total", "Вызовы HotelApp.refresh_rooms")
+_refresh_seconds = REGISTRY.histogram(
+    "gui_refresh_rooms_seconds", "От запуска обновления списка номеров до показа результата")
+
+
+class WorkerSignals(QObject):
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+class Worker(QRunnable):
+    # Выполняет fn(*args) в пуле потоков, результат возвращается сигналом в поток GUI
+    def __init__(self, fn, *args):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.fn = fn
+        self.args = args
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args)
+        except BaseHotelError as e:
+            self.signals.failed.emit(str(e))
+        except Exception as e:
+            error(f"Ошибка фоновой задачи GUI: {type(e).__name__}: {e}")
+            self.signals.failed.emit(f"Неожиданная ошибка: {e}")
+        else:
+            self.signals.finished.emit(result)
+class AvailableRoomsModel(QAbstractListModel):
+    # Свободные номера, упорядоченные по room_number; изменения применяются
+    # вставкой/удалением строк, без пересборки всего списка
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.numbers = []
+        self.rooms = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.numbers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        room = self.rooms[self.numbers[index.row()]]
+        if role == Qt.DisplayRole:
+            return f"{room.room_number} — {room.room_type} ({room.price}₽)"
+        if role == Qt.UserRole:
+            return room.room_number
+        return None
+
+    def room(self, room_number):
+        return self.rooms.get(room_number)
+
+    def add_room(self, room):
+        if room.room_number in self.rooms:
+            return
+        row = bisect_left(self.numbers, room.room_number)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.numbers.insert(row, room.room_number)
+        self.rooms[room.room_number] = room
+        self.endInsertRows()
+
+    def remove_room(self, room_number):
+        if room_number not in self.rooms:
+            return
+        row = bisect_left(self.numbers, room_number)
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.numbers[row]
+        del self.rooms[room_number]
+        self.endRemoveRows()
+
+    def set_rooms(self, rooms):
+        new_rooms = {r.room_number: r for r in rooms}
+        # Удаляем подряд идущие блоки пропавших номеров, начиная с конца
+        row = len(self.numbers) - 1
+        while row >= 0:
+            if self.numbers[row] in new_rooms:
+                row -= 1
+                continue
+            first = row
+            while first > 0 and self.numbers[first - 1] not in new_rooms:
+                first -= 1
+            self.beginRemoveRows(QModelIndex(), first, row)
+            for number in self.numbers[first:row + 1]:
+                del self.rooms[number]
+            del self.numbers[first:row + 1]
+            self.endRemoveRows()
+            row = first - 1
+
+        # Новые номера вставляются блоками в свои позиции
+        missing = sorted(number for number in new_rooms if number not in self.rooms)
+        k = 0
+        while k < len(missing):
+            row = bisect_left(self.numbers, missing[k])
+            end = k + 1
+            while end < len(missing) and (row == len(self.numbers) or missing[end] < self.numbers[row]):
+                end += 1
+            self.beginInsertRows(QModelIndex(), row, row + end - k - 1)
+            self.numbers[row:row] = missing[k:end]
+            for number in missing[k:end]:
+                self.rooms[number] = new_rooms[number]
+            self.endInsertRows()
+            k = end
+
+        # Цена или тип могли поменяться у оставшихся номеров
+        self.rooms = new_rooms
+        if self.numbers:
+            self.dataChanged.emit(self.index(0), self.index(len(self.numbers) - 1), [Qt.DisplayRole])
+class ReservationTableModel(QAbstractTableModel):
+    # Брони подгружаются страницами по мере прокрутки; сортировка и фильтр выполняются в Hotel
+    HEADERS = ("№", "Гость", "Номер", "Заезд", "Выезд")
+    SORT_FIELDS = ("id", "guest", "room", "check_in", "check_out")
+    PAGE_SIZE = 200
+
+    load_failed = pyqtSignal(str)
+
+    def __init__(self, hotel, submit, parent=None):
+        super().__init__(parent)
+        self.hotel = hotel
+        # Не self.submit: это перекрыло бы виртуальный QAbstractItemModel.submit()
+        self._submit = submit
+        self.rows = []
+        self.filters = (None, None, None, None)
+        self.order = ("id", False)
+        self._exhausted = False
+        self._loading = False
+        self._generation = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        rid, name, last_name, room_number, check_in, check_out = self.rows[index.row()]
+        return (rid, f"{name} {last_name}", room_number, check_in, check_out)[index.column()]
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted and not self._loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        self._loading = True
+        generation = self._generation
+        guest, room_number, start, end = self.filters
+        self._submit(
+            self.hotel.query_reservations, len(self.rows), self.PAGE_SIZE,
+            guest, room_number, start, end, self.order[0], self.order[1],
+            on_done=lambda page: self._append_page(generation, page),
+            on_fail=lambda message: self._on_failed(generation, message),
+        )
+
+    def _append_page(self, generation, page):
+        if generation != self._generation:
+            return
+        self._loading = False
+        if len(page) < self.PAGE_SIZE:
+            self._exhausted = True
+        if page:
+            self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(page) - 1)
+            self.rows.extend(page)
+            self.endInsertRows()
+
+    def _on_failed(self, generation, message):
+        if generation != self._generation:
+            return
+        self._loading = False
+        self._exhausted = True
+        self.load_failed.emit(message)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.order = (self.SORT_FIELDS[column], order == Qt.DescendingOrder)
+        self.reload()
+
+    def set_filters(self, guest=None, room_number=None, start=None, end=None):
+        self.filters = (guest or None, room_number, start or None, end or None)
+        self.reload()
+
+    def reload(self):
+        self._generation += 1
+        self.beginResetModel()
+        self.rows = []
+        self._exhausted = False
+        self._loading = False
+        self.endResetModel()
+        self.fetchMore()
+class ReservationsDialog(QDialog):
+    def __init__(self, hotel, submit, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Существующие бронирования")
+        self.resize(640, 480)
+        self.model = ReservationTableModel(hotel, submit, self)
+
+        layout = QVBoxLayout(self)
+        filter_layout = QHBoxLayout()
+        self.entry_guest = QLineEdit()
+        self.entry_guest.setPlaceholderText("Гость")
+        self.entry_room = QLineEdit()
+        self.entry_room.setPlaceholderText("Номер")
+        self.entry_from = QLineEdit()
+        self.entry_from.setPlaceholderText("С (ГГГГ-ММ-ДД)")
+        self.entry_to = QLineEdit()
+        self.entry_to.setPlaceholderText("По (ГГГГ-ММ-ДД)")
+        self.btn_apply = QPushButton("Применить")
+        for widget in (self.entry_guest, self.entry_room, self.entry_from, self.entry_to, self.btn_apply):
+            filter_layout.addWidget(widget)
+        layout.addLayout(filter_layout)
+
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.horizontalHeader().setSortIndicator(0, Qt.AscendingOrder)
+        self.table.setSortingEnabled(True)
+        layout.addWidget(self.table)
+
+        self.status_label = QLabel("")
+        self.status_label.setObjectName("StatusLabel")
+        layout.addWidget(self.status_label)
+
+        self.btn_apply.clicked.connect(self.apply_filters)
+        for entry in (self.entry_guest, self.entry_room, self.entry_from, self.entry_to):
+            entry.returnPressed.connect(self.apply_filters)
+        self.model.load_failed.connect(self.status_label.setText)
+
+    def apply_filters(self):
+        room_text = self.entry_room.text().strip()
+        if room_text and not room_text.isdigit():
+            self.status_label.setText("Номер комнаты должен быть числом")
+            return
+        self.status_label.setText("")
+        self.model.set_filters(
+            self.entry_guest.text().strip(),
+            int(room_text) if room_text else None,
+            self.entry_from.text().strip(),
+            self.entry_to.text().strip(),
+        )
+class HotelApp(QWidget):
+    REFRESH_DEBOUNCE_MS = 150
+
+    def __init__(self, hotel: Hotel):
+        super().__init__()
+        self.hotel = hotel
+        self.rooms_model = AvailableRoomsModel(self)
+        self.rooms_proxy = QSortFilterProxyModel(self)
+        self.rooms_proxy.setSourceModel(self.rooms_model)
+        self.rooms_proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self._shown_stay = None
+        # Hotel не потокобезопасен, поэтому вся работа с ним идёт в одном фоновом потоке
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self._workers = set()
+        self._refresh_seq = 0
+        self._pending_refresh = None
+        self.reservations_dialog = None
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(self.REFRESH_DEBOUNCE_MS)
+        self._refresh_timer.timeout.connect(self._start_refresh)
+        self.setWindowTitle("Grand Hotel Booking")
+        self.setGeometry(100, 100, 450, 500)
+        
+        self.setup_ui()
+        self.apply_styles()
+        self._start_refresh()
+        
+    def setup_ui(self):
+        main_layout = QVBoxLayout(self)
+        
+        title_label = QLabel("Оформление бронирования")
+        title_label.setObjectName("TitleLabel")
+        main_layout.addWidget(title_label)
+        
+        form_layout = QGridLayout()
+        form_layout.setVerticalSpacing(10)
+        
+        self.entry_name = QLineEdit()
+        self.entry_lastname = QLineEdit()
+        self.entry_in = QLineEdit(datetime.now().strftime("%Y-%m-%d"))
+        self.entry_out = QLineEdit((datetime.now() + timedelta(days=2)).strftime("%Y-%m-%d"))
+        self.entry_room_filter = QLineEdit()
+        self.entry_room_filter.setPlaceholderText("номер или тип")
+        self.combobox_rooms = QComboBox()
+        self.combobox_rooms.setModel(self.rooms_proxy)
+        self.status_label = QLabel("Подготовка...")
+        self.status_label.setObjectName("StatusLabel")
+
+        fields = [
+            ("Имя:", self.entry_name),
+            ("Фамилия:", self.entry_lastname),
+            ("Дата заезда:", self.entry_in),
+            ("Дата выезда:", self.entry_out),
+            ("Поиск номера:", self.entry_room_filter),
+            ("Свободный номер:", self.combobox_rooms),
+        ]
+        
+        for i, (label_text, widget) in enumerate(fields):
+            label = QLabel(label_text)
+            label.setObjectName("FormLabel")
+            form_layout.addWidget(label, i, 0)
+            form_layout.addWidget(widget, i, 1)
+
+        main_layout.addLayout(form_layout)
+        
+        button_layout = QGridLayout()
+        
+        self.btn_refresh = QPushButton("Обновить номера")
+        self.btn_book = QPushButton("Забронировать")
+        self.btn_show_res = QPushButton("Показать брони")
+        
+        button_layout.addWidget(self.btn_refresh, 0, 0)
+        button_layout.addWidget(self.btn_book, 0, 1)
+        button_layout.addWidget(self.btn_show_res, 1, 0)
+        
+        main_layout.addLayout(button_layout)
+        
+        main_layout.addSpacing(15)
+        main_layout.addWidget(self.status_label, alignment=Qt.AlignCenter)
+
+        self.btn_refresh.clicked.connect(self.refresh_rooms)
+        self.btn_book.clicked.connect(self.book_room)
+        self.btn_show_res.clicked.connect(self.show_reservations)
+        self.entry_in.editingFinished.connect(self.refresh_rooms)
+        self.entry_out.editingFinished.connect(self.refresh_rooms)
+        self.entry_room_filter.textChanged.connect(self.rooms_proxy.setFilterFixedString)
+        self.entry_room_filter.textChanged.connect(lambda _: self._update_rooms_status())
+
+
+    def apply_styles(self):
+        self.setStyleSheet("""
+            QWidget {
+                background-color: #222; /* Светлый фон */
+                color: #FFF;
+                font-family: 'Segoe UI', 'Arial', sans-serif;
+                font-size: 10pt;
+            }
+                           
+            fields{
+                color:#FFF;               
+            }
+            
+            #TitleLabel {
+                font-size: 16pt;
+                font-weight: bold;
+                color: #FFF; /* Темно-синий заголовок */
+                padding-bottom: 15px;
+            }
+            
+            #FormLabel {
+                font-weight: 500;
+                color: #FFF;
+            }
+
+            QLineEdit, QComboBox {
+                padding: 8px;
+                border: 1px solid #CCCCCC;
+                border-radius: 5px;
+                background-color: white;
+                selection-background-color: #353535;
+                color: #222;
+                font-weight: bold;
+            }
+
+            QPushButton {
+                background-color: #353535;
+                color: #FFF;
+                border: none;
+                padding: 10px;
+                margin: 5px 0;
+                border-radius: 6px;
+                font-weight: bold;
+            }
+            
+            QPushButton:hover {
+                background-color: #656565;
+            }
+            
+            QPushButton:pressed {
+                background-color: #656565;
+            }
+            
+            #StatusLabel {
+                font-size: 10pt;
+                color: #FFF;
+                font-weight: 500;
+                padding-top: 10px;
+            }
+        """)
+
+
+    def _submit(self, fn, *args, on_done, on_fail=None):
+        worker = Worker(fn, *args)
+        self._workers.add(worker)
+        worker.signals.finished.connect(lambda result: (self._workers.discard(worker), on_done(result)))
+        worker.signals.failed.connect(lambda message: (self._workers.discard(worker), (on_fail or self._show_error)(message)))
+        self.pool.start(worker)
+        return worker
+
+    def _show_error(self, message):
+        QMessageBox.critical(self, "Ошибка", message)
+
+    def refresh_rooms(self):
+        # Частые запросы (правка дат, несколько броней подряд) схлопываются в одно обновление
+        _refresh_requests.inc()
+        self._refresh_timer.start()
+
+    def _start_refresh(self):
+        self._refresh_timer.stop()
+        if self._pending_refresh is not None and self.pool.tryTake(self._pending_refresh):
+            self._workers.discard(self._pending_refresh)
+        self._refresh_seq += 1
+        seq = self._refresh_seq
+        started = time.perf_counter()
+        self.status_label.setText("Обновление списка номеров...")
+        self._pending_refresh = self._submit(
+            self._load_available_rooms, self.entry_in.text().strip(), self.entry_out.text().strip(),
+            on_done=lambda result: self._on_rooms_loaded(seq, result, started),
+            on_fail=lambda message: self._on_rooms_failed(seq, message),
+        )
+
+    def _load_available_rooms(self, check_in, check_out):
+        start, end = parse_stay(check_in, check_out)
+        return start, end, self.hotel.available_rooms(start, end)
+
+    def _on_rooms_loaded(self, seq, result, started=None):
+        if seq != self._refresh_seq:
+            return
+        self._pending_refresh = None
+        start, end, available = result
+        self._shown_stay = (start, end)
+        self.rooms_model.set_rooms(available)
+        if started is not None:
+            _refresh_seconds.observe(time.perf_counter() - started)
+        
+        info("Обновлён список свободных номеров")
+        self._update_rooms_status()
+
+    def _update_rooms_status(self):
+        # Число номеров с учётом фильтра по номеру, как в выпадающем списке
+        self.status_label.setText(f"Доступно номеров: {self.rooms_proxy.rowCount()}")
+
+    def _on_rooms_failed(self, seq, message):
+        if seq != self._refresh_seq:
+            return
+        self._pending_refresh = None
+        self._shown_stay = None
+        self.rooms_model.set_rooms([])
+        self.status_label.setText(message)
+
+    def book_room(self):
+        name = self.entry_name.text().strip()
+        lastname = self.entry_lastname.text().strip()
+        check_in = self.entry_in.text().strip()
+        check_out = self.entry_out.text().strip()
+        room = self.rooms_model.room(self.combobox_rooms.currentData(Qt.UserRole))
+        
+        if not name or not lastname:
+            QMessageBox.warning(self, "Ошибка", "Введите имя и фамилию.")
+            return
+        if room is None:
+            QMessageBox.warning(self, "Ошибка", "Выберите свободный номер.")
+            return
+
+        try:
+            validate_guest_data(name, lastname)
+            parse_stay(check_in, check_out)
+        except InvalidGuestDataError as e:
+            QMessageBox.critical(self, "Ошибка данных", str(e))
+            return
+        except InvalidDateError as e:
+            QMessageBox.critical(self, "Ошибка в датах", str(e))
+            return
+        
+        self.btn_book.setEnabled(False)
+        self.status_label.setText("Оформление бронирования...")
+        self._submit(
+            self._book, name, lastname, room, check_in, check_out,
+            on_done=lambda result: self._on_booked(*result, name, lastname, room, check_in, check_out),
+            on_fail=self._on_book_failed,
+        )
+
+    def _book(self, name, lastname, room, check_in, check_out):
+        # Выполняется в фоновом потоке вместе с расчётом стоимости: Hotel не трогаем из потока GUI
+        guest = self.hotel.find_guest(name, lastname)
+        if guest is None:
+            guest = Guest(name, lastname)
+            self.hotel.add_guest(guest)
+        reservation = self.hotel.make_reservation(guest, room, check_in, check_out)
+        if reservation is None:
+            return None, None
+        nights = max(1, reservation.check_out - reservation.check_in)
+        return reservation, self.hotel.rates.quote(room, reservation.check_in, reservation.check_in + nights)
+
+    def _on_booked(self, reservation, total_with_tax, name, lastname, room, check_in, check_out):
+        self.btn_book.setEnabled(True)
+        if reservation:
+            nights = max(1, reservation.check_out - reservation.check_in)
+            # Номер занят на даты брони: если они пересекаются с показанным периодом, убираем его из списка
+            if self._shown_stay and reservation.check_in < self._shown_stay[1] and self._shown_stay[0] < reservation.check_out:
+                self.rooms_model.remove_room(room.room_number)
+                self._update_rooms_status()
+            QMessageBox.information(
+                self,
+                "Успех бронирования!",
+                f"Номер {room.room_number} успешно забронирован за {name} {lastname}.\n"
+                f"Даты: {check_in} — {check_out}\n"
+                f"Стоимость ({nights} ноч.): {total_with_tax}₽ (с налогом)"
+            )
+        else:
+            warning("Неудачная попытка бронирования (через GUI)")
+            self.refresh_rooms()
+            QMessageBox.warning(self, "Ошибка", f"Номер недоступен на даты {check_in} — {check_out}.")
+
+    def _on_book_failed(self, message):
+        self.btn_book.setEnabled(True)
+        self.refresh_rooms()
+        self._show_error(message)
+
+    def show_reservations(self):
+        info("Пользователь запросил просмотр бронирований через GUI")
+        if self.reservations_dialog is None:
+            self.reservations_dialog = ReservationsDialog(self.hotel, self._submit, self)
+            self.reservations_dialog.setStyleSheet(self.styleSheet())
+        self.reservations_dialog.model.reload()
+        self.reservations_dialog.show()
+        self.reservations_dialog.raise_()
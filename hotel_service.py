@@ -0,0 +1,267 @@
+import argparse
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from hotel_domain import (
+    Hotel, Room, Guest, info, error, REGISTRY, DEFAULT_PLAN,
+    BaseHotelError, InvalidGuestDataError, InvalidDateError, RoomNotAvailableError,
+    validate_guest_data, parse_stay,
+)
+
+
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error"}
+# Тело запроса читается в память целиком, поэтому его размер ограничен
+MAX_BODY_BYTES = 1024 * 1024
+
+
+class UnknownRoomError(BaseHotelError): pass
+
+
+def room_to_json(room):
+    return {"room_number": room.room_number, "room_type": room.room_type, "price": room.price}
+
+
+def guest_to_json(guest):
+    return {"name": guest.name, "last_name": guest.lastName, "age": guest.age,
+            "reservations": len(guest.reservations)}
+
+
+class HotelService:
+    # HTTP-сервис поверх Hotel: Hotel не потокобезопасен, поэтому все обращения к нему идут в одном
+    # фоновом потоке; запросы на один номер сериализуются asyncio.Lock - второй получает 409, а не двойную бронь
+    def __init__(self, hotel: Hotel):
+        self.hotel = hotel
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hotel-service")
+        self.room_locks = {}
+        self.server = None
+
+    async def _call(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    def _room_lock(self, room_number):
+        # Замки создаются только для существующих номеров, поэтому их число ограничено числом номеров
+        if room_number not in self.hotel.rooms_by_number:
+            raise UnknownRoomError(f"Номер {room_number} не найден")
+        lock = self.room_locks.get(room_number)
+        if lock is None:
+            lock = self.room_locks[room_number] = asyncio.Lock()
+        return lock
+
+    async def start(self, host="127.0.0.1", port=8080):
+        self.server = await asyncio.start_server(self._handle_connection, host, port, backlog=1024)
+        info(f"HTTP-сервис бронирования запущен на {host}:{self.port}")
+        return self.server
+
+    @property
+    def port(self):
+        return self.server.sockets[0].getsockname()[1] if self.server else None
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.executor.shutdown(wait=True)
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "Неверная строка запроса"}, close=True)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._respond(writer, 400, {"error": "Неверный заголовок Content-Length"}, close=True)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {"error": f"Тело запроса больше {MAX_BODY_BYTES} байт"}, close=True)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                status, payload = await self.dispatch(method, target, body)
+                close = headers.get("connection", "").lower() == "close" or version == "HTTP/1.0"
+                await self._respond(writer, status, payload, close)
+                if close:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except (asyncio.LimitOverrunError, ValueError):
+            # Строка запроса или заголовка длиннее лимита буфера StreamReader (64 КиБ)
+            try:
+                await self._respond(writer, 400, {"error": "Слишком длинная строка запроса или заголовка"}, close=True)
+            except ConnectionError:
+                pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, status, payload, close=False):
+        # Строка отдаётся как text/plain (формат Prometheus), остальное - как JSON
+        if isinstance(payload, str):
+            data, content_type = payload.encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            data, content_type = json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8"
+        head = [f"HTTP/1.1 {status} {REASONS[status]}",
+                f"Content-Type: {content_type}",
+                f"Content-Length: {len(data)}"]
+        if close:
+            head.append("Connection: close")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + data)
+        await writer.drain()
+
+    async def dispatch(self, method, target, body):
+        url = urlsplit(target)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        routes = {
+            ("GET", "/rooms/available"): self.get_available_rooms,
+            ("GET", "/rooms/quote"): self.get_quotes,
+            ("GET", "/guests"): self.get_guest,
+            ("GET", "/guests/search"): self.search_guests,
+            ("POST", "/guests"): self.post_guest,
+            ("POST", "/reservations"): self.post_reservation,
+            ("GET", "/metrics"): self.get_metrics,
+        }
+        handler = routes.get((method, url.path))
+        if handler is None:
+            known_path = any(path == url.path for _, path in routes)
+            return (405, {"error": "Метод не поддерживается"}) if known_path else (404, {"error": "Не найдено"})
+        try:
+            data = json.loads(body) if body else {}
+            if not isinstance(data, dict):
+                raise ValueError("ожидается JSON-объект")
+        except ValueError as e:
+            return 400, {"error": f"Неверный JSON: {e}"}
+        try:
+            return await handler(query, data)
+        except (InvalidGuestDataError, InvalidDateError) as e:
+            return 400, {"error": str(e)}
+        except UnknownRoomError as e:
+            return 404, {"error": str(e)}
+        except RoomNotAvailableError as e:
+            return 409, {"error": str(e)}
+        except BaseHotelError as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            error(f"Ошибка HTTP-сервиса: {type(e).__name__}: {e}")
+            return 500, {"error": "Внутренняя ошибка сервера"}
+
+    async def get_available_rooms(self, query, data):
+        rooms = await self._call(self.hotel.available_rooms, query.get("check_in"), query.get("check_out"),
+                                 query.get("room_type") or None)
+        return 200, {"rooms": [room_to_json(r) for r in rooms]}
+
+    async def get_quotes(self, query, data):
+        quotes = await self._call(self.hotel.quote_available, query.get("check_in"), query.get("check_out"),
+                                  query.get("room_type") or None, query.get("plan") or DEFAULT_PLAN)
+        return 200, {"rooms": [{**room_to_json(room), "total": total} for room, total in quotes]}
+
+    async def get_metrics(self, query, data):
+        if query.get("format") == "json":
+            return 200, json.loads(REGISTRY.to_json())
+        return 200, REGISTRY.to_prometheus()
+
+    async def get_guest(self, query, data):
+        guest = await self._call(self.hotel.find_guest, query.get("name"), query.get("last_name"))
+        if guest is None:
+            return 404, {"error": "Гость не найден"}
+        return 200, guest_to_json(guest)
+
+    async def search_guests(self, query, data):
+        try:
+            limit = min(int(query.get("limit") or 20), 100)
+        except ValueError:
+            raise BaseHotelError("limit должен быть целым числом")
+        fuzzy = query.get("fuzzy", "").lower() in ("1", "true", "yes")
+        guests = await self._call(self.hotel.search_guests, query.get("q", ""), limit, fuzzy)
+        return 200, {"guests": [guest_to_json(g) for g in guests]}
+
+    async def post_guest(self, query, data):
+        name, last_name = data.get("name"), data.get("last_name")
+        validate_guest_data(name, last_name)
+        guest = await self._call(self._add_guest, name, last_name, data.get("age"))
+        return 201, guest_to_json(guest)
+
+    def _add_guest(self, name, last_name, age):
+        guest = self.hotel.find_guest(name, last_name)
+        if guest is None:
+            guest = self.hotel.add_guest(Guest(name, last_name, age))
+        return guest
+
+    async def post_reservation(self, query, data):
+        name, last_name = data.get("name"), data.get("last_name")
+        validate_guest_data(name, last_name)
+        check_in, check_out = data.get("check_in"), data.get("check_out")
+        parse_stay(check_in, check_out)
+        try:
+            room_number = int(data.get("room_number"))
+        except (TypeError, ValueError):
+            raise BaseHotelError("room_number должен быть целым числом")
+
+        async with self._room_lock(room_number):
+            reservation = await self._call(self._book, name, last_name, room_number, check_in, check_out)
+        return 201, {"guest": guest_to_json(reservation.guest), "room": room_to_json(reservation.room),
+                     "check_in": reservation.dates[0], "check_out": reservation.dates[1]}
+
+    def _book(self, name, last_name, room_number, check_in, check_out):
+        room = self.hotel.rooms_by_number.get(room_number)
+        if room is None:
+            raise UnknownRoomError(f"Номер {room_number} не найден")
+        if not self.hotel.is_room_free(room_number, check_in, check_out):
+            raise RoomNotAvailableError(f"Номер {room_number} недоступен с {check_in} по {check_out}")
+        guest = self._add_guest(name, last_name, None)
+        reservation = self.hotel.make_reservation(guest, room, check_in, check_out)
+        if reservation is None:
+            raise RoomNotAvailableError(f"Не удалось забронировать номер {room_number}")
+        return reservation
+
+
+async def serve(hotel, host, port):
+    service = HotelService(hotel)
+    await service.start(host, port)
+    try:
+        await service.server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP-сервис бронирования отеля")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--hotel", default="Grand Hotel")
+    parser.add_argument("--db", help="файл SQLite; без него отель хранится в памяти")
+    parser.add_argument("--rooms", type=int, default=0, help="создать столько номеров, если в отеле их нет")
+    parser.add_argument("--metrics", action="store_true", help="собирать метрики (GET /metrics)")
+    args = parser.parse_args()
+    if args.metrics:
+        REGISTRY.enable()
+
+    hotel = Hotel.open_sqlite(args.db, args.hotel) if args.db else Hotel(args.hotel)
+    if args.rooms and not hotel.rooms_by_number:
+        room_types = sorted(Room.ROOM_TYPES)
+        for i in range(args.rooms):
+            hotel.add_room(Room(100 + i, room_types[i % len(room_types)], 5000 + 100 * (i % 50)))
+    try:
+        asyncio.run(serve(hotel, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hotel_domain import close_log, set_log_file, set_log_level  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def log_file(tmp_path):
+    # Каждый тест пишет лог в свой временный файл, а не в hotel.log рабочего каталога
+    path = str(tmp_path / "hotel.log")
+    set_log_file(path)
+    set_log_level("INFO")
+    yield path
+    close_log()
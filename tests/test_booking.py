@@ -0,0 +1,85 @@
+import pytest
+
+from hotel_domain import Guest, Hotel, InvalidDateError, ReservationStore, Room
+
+
+@pytest.fixture
+def hotel():
+    hotel = Hotel("Тест")
+    hotel.add_room(Room(101, "Single", 1000))
+    hotel.add_room(Room(102, "Double", 2000))
+    return hotel
+
+
+@pytest.fixture
+def guest(hotel):
+    return hotel.add_guest(Guest("Иван", "Петров", 30))
+
+
+def test_booking_links_guest_and_timeline(hotel, guest):
+    reservation = hotel.make_reservation(guest, hotel.rooms_by_number[101], "2026-05-01", "2026-05-04")
+    assert reservation is not None
+    assert guest.reservations == [reservation]
+    assert reservation.dates == ("2026-05-01", "2026-05-04")
+    assert not hotel.is_room_free(101, "2026-05-03", "2026-05-05")
+
+
+@pytest.mark.parametrize("check_in, check_out, booked", [
+    ("2026-05-02", "2026-05-03", False),        # внутри брони
+    ("2026-04-28", "2026-05-02", False),        # пересекает начало
+    ("2026-05-03", "2026-05-06", False),        # пересекает конец
+    ("2026-04-28", "2026-05-01", True),        # выезд в день заезда
+    ("2026-05-04", "2026-05-06", True),        # заезд в день выезда
+])
+def test_overlapping_stays_are_rejected(hotel, guest, check_in, check_out, booked):
+    room = hotel.rooms_by_number[101]
+    assert hotel.make_reservation(guest, room, "2026-05-01", "2026-05-04") is not None
+    result = hotel.make_reservation(guest, room, check_in, check_out)
+    assert (result is not None) is booked
+
+
+def test_invalid_dates_fail_without_booking(hotel, guest):
+    room = hotel.rooms_by_number[101]
+    assert hotel.make_reservation(guest, room, "2026-05-04", "2026-05-01") is None
+    assert hotel.make_reservation(guest, room, "не дата", "2026-05-01") is None
+    assert hotel.reservations == []
+    with pytest.raises(InvalidDateError):
+        hotel.is_room_free(101, "2026-05-04", "2026-05-04")
+
+
+def test_dates_are_required(hotel, guest):
+    with pytest.raises(TypeError):
+        hotel.make_reservation(guest, hotel.rooms_by_number[101])
+
+
+def test_foreign_and_unavailable_rooms(hotel, guest):
+    assert hotel.make_reservation(guest, Room(101, "Single", 1000), "2026-05-01", "2026-05-02") is None
+    hotel.rooms_by_number[102].is_available = False
+    assert hotel.make_reservation(guest, hotel.rooms_by_number[102], "2026-05-01", "2026-05-02") is None
+    assert hotel.reservations == []
+
+
+def test_available_rooms_respects_bookings(hotel, guest):
+    hotel.make_reservation(guest, hotel.rooms_by_number[101], "2026-05-01", "2026-05-04")
+    free = hotel.available_rooms("2026-05-02", "2026-05-03")
+    assert [room.room_number for room in free] == [102]
+    assert {room.room_number for room in hotel.available_rooms("2026-05-04", "2026-05-05")} == {101, 102}
+    assert [room.room_number for room in hotel.available_rooms("2026-05-01", "2026-05-02", "Double")] == [102]
+
+
+def test_re_added_room_replaces_old_object(hotel, guest):
+    suite = hotel.add_room(Room(101, "Suite", 5000))
+    assert hotel.available_rooms("2026-05-01", "2026-05-02", "Suite") == [suite]
+    assert hotel.available_rooms("2026-05-01", "2026-05-02", "Single") == []
+    assert [r for r in hotel.available_rooms("2026-05-01", "2026-05-02") if r.room_number == 101] == [suite]
+    assert hotel.rooms_by_type["Single"] == [] and hotel.rooms_by_type["Suite"] == [suite]
+    assert hotel.make_reservation(guest, suite, "2026-05-01", "2026-05-02") is not None
+
+
+def test_reservation_store_keeps_latest_room_object():
+    store = ReservationStore()
+    guest = Guest("Иван", "Петров", 30)
+    store.add(guest, Room(1, "Single", 1000), "2026-05-01", "2026-05-02")
+    suite = Room(1, "Suite", 5000)
+    store.add(guest, suite, "2026-06-01", "2026-06-02")
+    assert store[1].room is suite
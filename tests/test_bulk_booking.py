@@ -0,0 +1,51 @@
+from hotel_domain import (
+    BOOKING_BAD_ITEM, BOOKING_INVALID_DATES, BOOKING_INVALID_GUEST, BOOKING_NOT_COMMITTED, BOOKING_OK,
+    BOOKING_ROOM_NOT_AVAILABLE, BOOKING_UNKNOWN_ROOM, Hotel, Room,
+)
+
+
+def make_hotel():
+    hotel = Hotel("Пакет")
+    hotel.add_rooms_bulk([Room(1, "Single", 1000), Room(2, "Double", 2000)])
+    return hotel
+
+
+def test_all_items_booked():
+    hotel = make_hotel()
+    codes = hotel.make_reservations_bulk([
+        ("Иван", "Петров", 1, "2026-06-01", "2026-06-03"),
+        ("Анна", "Смирнова", 1, "2026-06-03", "2026-06-05"),
+        ("Иван", "Петров", 2, "2026-06-01", "2026-06-02"),
+    ])
+    assert list(codes) == [BOOKING_OK] * 3
+    assert len(hotel.reservations) == 3
+    assert len(hotel.find_guest("иван", "петров").reservations) == 2
+    assert hotel.available_rooms("2026-06-01", "2026-06-02") == []
+
+
+def test_any_error_rejects_whole_batch():
+    hotel = make_hotel()
+    codes = hotel.make_reservations_bulk([
+        ("Иван", "Петров", 1, "2026-06-01", "2026-06-03"),
+        ("И", "Петров", 1, "2026-07-01", "2026-07-03"),
+        ("Иван", "Петров", 1, "2026-06-05", "2026-06-04"),
+        ("Иван", "Петров", 99, "2026-06-01", "2026-06-03"),
+        ("Анна", "Смирнова", 1, "2026-06-02", "2026-06-04"),
+        ("строка без полей",),
+    ])
+    assert list(codes) == [BOOKING_NOT_COMMITTED, BOOKING_INVALID_GUEST, BOOKING_INVALID_DATES,
+                           BOOKING_UNKNOWN_ROOM, BOOKING_ROOM_NOT_AVAILABLE, BOOKING_BAD_ITEM]
+    assert hotel.reservations == []
+    assert len(hotel.guests) == 0
+    assert hotel.is_room_free(1, "2026-06-01", "2026-06-03")
+
+
+def test_conflict_with_existing_booking():
+    hotel = make_hotel()
+    hotel.make_reservations_bulk([("Иван", "Петров", 1, "2026-06-01", "2026-06-03")])
+    codes = hotel.make_reservations_bulk([
+        ("Анна", "Смирнова", 2, "2026-06-01", "2026-06-03"),
+        ("Анна", "Смирнова", 1, "2026-06-02", "2026-06-04"),
+    ])
+    assert list(codes) == [BOOKING_NOT_COMMITTED, BOOKING_ROOM_NOT_AVAILABLE]
+    assert len(hotel.reservations) == 1
@@ -0,0 +1,67 @@
+import pytest
+
+from hotel_domain import Guest, GuestIndex, Hotel, TrigramIndex
+
+NAMES = [("Иван", "Петров"), ("Ирина", "Петрова"), ("Пётр", "Иванов"), ("Анна", "Смирнова"),
+         ("Иван", "Сидоров"), ("Мария", "Кузнецова")]
+
+
+def full_names(guests):
+    return [f"{g.name} {g.lastName}" for g in guests]
+
+
+@pytest.fixture
+def index():
+    index = GuestIndex()
+    for name, last_name in NAMES:
+        index.add(Guest(name, last_name))
+    return index
+
+
+def test_prefix_matches_first_or_last_name_case_insensitive(index):
+    assert full_names(index.search("иван")) == ["Иван Петров", "Иван Сидоров", "Пётр Иванов"]
+    assert full_names(index.search("  ПЕТРОВ ")) == ["Иван Петров", "Ирина Петрова"]
+    assert full_names(index.search("петрова ир")) == ["Ирина Петрова"]
+    assert index.search("Зайцев") == []
+
+
+def test_limit_and_duplicates(index):
+    assert len(index.search("и", limit=2)) == 2
+    # Гость, совпавший и по имени, и по фамилии, возвращается один раз
+    index.add(Guest("Иван", "Иванов"))
+    assert full_names(index.search("иван")).count("Иван Иванов") == 1
+    assert index.add(Guest("иван", "ИВАНОВ")).lastName == "Иванов"
+    assert len(index) == len(NAMES) + 1
+
+
+def test_added_guests_are_found_before_and_after_merge(index, monkeypatch):
+    monkeypatch.setattr(GuestIndex, "MERGE_MIN", 3)
+    for i in range(10):
+        index.add(Guest(f"Олег{i}", "Новиков"))
+    assert len(index.search("новиков", limit=100)) == 10
+    index.add_many([(GuestIndex.key("Олег", "Новиков"), Guest("Олег", "Новиков"))])
+    assert full_names(index.search("олег новиков")) == ["Олег Новиков"]
+
+
+def test_trigram_search_tolerates_typos():
+    index = TrigramIndex()
+    for name, last_name in NAMES:
+        index.add(GuestIndex.key(name, last_name))
+    assert index.search("Петрв")[0] == ("иван", "петров")
+    assert index.search("Смирнва") == [("анна", "смирнова")]
+    assert index.search("Кузнецоа Мария")[0] == ("мария", "кузнецова")
+    assert len(index.search("Петров", limit=1)) == 1
+    assert index.search("Ъъъ") == []
+
+
+def test_hotel_fuzzy_index_sees_new_guests():
+    hotel = Hotel("Поиск")
+    for name, last_name in NAMES:
+        hotel.add_guest(Guest(name, last_name))
+    assert full_names(hotel.search_guests("Смирнва", fuzzy=True)) == ["Анна Смирнова"]
+    # Индекс уже построен; новый гость должен попасть в него
+    hotel.add_guest(Guest("Ольга", "Воробьёва"))
+    hotel.add_guests_bulk([("Глеб", "Журавлёв", 40)])
+    assert full_names(hotel.search_guests("Воробьва", fuzzy=True)) == ["Ольга Воробьёва"]
+    assert full_names(hotel.search_guests("Журавлев", fuzzy=True))[0] == "Глеб Журавлёв"
+    assert full_names(hotel.search_guests("ольга")) == ["Ольга Воробьёва"]
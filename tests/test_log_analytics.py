@@ -0,0 +1,73 @@
+import mmap
+
+from hotel_domain import log_analytics
+from hotel_domain.log_analytics import analyze, scan_range, split_on_lines
+
+
+def line(i, level="INFO", msg=None):
+    return f"2026-05-01 10:{i // 60 % 60:02d}:{i % 60:02d} - {level} - {msg or f'событие {i}'}\n"
+
+
+def write(path, lines, mode="w"):
+    with open(path, mode, encoding="utf-8") as f:
+        f.write("".join(lines))
+
+
+def test_incremental_read_uses_checkpoint(tmp_path):
+    path = str(tmp_path / "hotel.log")
+    write(path, [line(i) for i in range(5000)])
+    assert analyze(path, workers=1).lines == 5000
+
+    # Незаконченная строка ждёт следующего запуска
+    write(path, [line(1, "ERROR", "Ошибка данных гостя: пусто"), line(2), "2026-05-01 10:00:03 - IN"], "a")
+    stats = analyze(path, workers=1)
+    assert stats.lines == 5002
+    assert stats.error_kinds == {"Ошибка данных гостя": 1}
+
+    write(path, ["FO - конец строки\n"], "a")
+    stats = analyze(path, workers=1)
+    assert (stats.lines, stats.bad_lines) == (5003, 0)
+    assert stats.levels == {"INFO": 5002, "ERROR": 1}
+    assert analyze(path, workers=1, reset=True).to_dict() == stats.to_dict()
+
+
+def test_parallel_split_matches_serial(tmp_path, monkeypatch):
+    path = str(tmp_path / "hotel.log")
+    write(path, [line(i, "WARNING" if i % 7 == 0 else "INFO", "Результат: Провал" if i % 11 == 0 else None)
+                 for i in range(3000)])
+    serial = analyze(path, checkpoint=None, workers=1)
+
+    monkeypatch.setattr(log_analytics, "PARALLEL_MIN_BYTES", 0)
+    parallel = analyze(path, checkpoint=None, workers=3)
+    assert parallel.to_dict() == serial.to_dict()
+    assert sum(serial.failed_bookings.values()) == len(range(0, 3000, 11))
+
+
+def test_chunks_and_blocks_end_on_line_boundaries(tmp_path, monkeypatch):
+    path = str(tmp_path / "hotel.log")
+    write(path, [line(i, msg="x" * (i % 50)) for i in range(400)])
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        ranges = split_on_lines(mm, 0, size, 5)
+        assert ranges[0][0] == 0 and ranges[-1][1] == size
+        assert all(mm[end - 1:end] == b"\n" for _, end in ranges)
+        assert all(prev[1] == cur[0] for prev, cur in zip(ranges, ranges[1:]))
+
+    monkeypatch.setattr(log_analytics, "BLOCK_SIZE", 97)
+    stats = scan_range(path, 0, size)
+    assert (stats.lines, stats.bad_lines) == (400, 0)
+
+
+def test_truncated_or_replaced_file_is_read_from_start(tmp_path):
+    path = str(tmp_path / "hotel.log")
+    write(path, [line(i) for i in range(100)])
+    assert analyze(path, workers=1).lines == 100
+
+    # Усечён: файл короче сохранённого смещения
+    write(path, [line(i) for i in range(10)])
+    assert analyze(path, workers=1).lines == 10
+
+    # Ротирован: новый файл длиннее, но начинается иначе
+    write(path, [line(i, "ERROR", "Новый сегмент: ошибка") for i in range(200)])
+    stats = analyze(path, workers=1)
+    assert stats.lines == 200 and stats.levels == {"ERROR": 200}
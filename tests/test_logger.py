@@ -0,0 +1,101 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from hotel_domain import close_log, get_log_writer, info, set_log_level, warning
+from hotel_domain.chain import HotelChain, shard_log_file
+
+def read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def test_lines_are_written_on_close(log_file):
+    info("первая строка")
+    info("вторая строка")
+    close_log()
+    lines = read(log_file).splitlines()
+    assert [line.split(" - ", 2)[2] for line in lines] == ["первая строка", "вторая строка"]
+
+
+def test_level_filters_lines(log_file):
+    set_log_level("WARNING")
+    info("не попадёт")
+    warning("попадёт")
+    close_log()
+    text = read(log_file)
+    assert "не попадёт" not in text and "попадёт" in text
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="нужен os.fork")
+def test_child_after_fork_gets_own_writer(log_file):
+    info("до fork")
+    get_log_writer().flush()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            info("из дочернего процесса")
+            close_log()
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+    close_log()
+    text = read(log_file)
+    assert "до fork" in text
+    assert "из дочернего процесса" in text
+
+
+def test_chain_shards_log_to_own_files(log_file):
+    info("родитель до запуска сети")
+    with HotelChain(n_shards=2, log_level="INFO") as chain:
+        chain.add_hotel("Alpha", [(1, "Single", 1000)])
+        chain.add_hotel("Beta", [(2, "Double", 2000)])
+    close_log()
+    shard_text = "".join(read(shard_log_file(log_file, i)) for i in range(2)
+                         if os.path.exists(shard_log_file(log_file, i)))
+    assert "Создан отель: Alpha" in shard_text
+    assert "Создан отель: Beta" in shard_text
+    assert "Создан отель" not in read(log_file)
+
+
+def test_logrotate_is_imported_only_with_rotation(tmp_path):
+    from hotel_domain.logger import AsyncLogWriter
+    code = "import sys, hotel_domain; assert 'hotel_domain.logrotate' not in sys.modules"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    assert subprocess.run([sys.executable, "-c", code], cwd=root).returncode == 0
+
+    path = str(tmp_path / "rotated.log")
+    writer = AsyncLogWriter(path, echo=False, batch_size=1, max_bytes=200)
+    for i in range(20):
+        writer.write("INFO", f"строка {i:02d} " + "x" * 40)
+    writer.close()
+    from hotel_domain.logrotate import iter_log_lines
+    assert sum(1 for _ in iter_log_lines(path)) == 20
+
+
+def test_writers_do_not_accumulate_atexit_hooks(tmp_path):
+    import atexit
+    from hotel_domain import set_log_file
+    before = atexit._ncallbacks()
+    for i in range(5):
+        set_log_file(str(tmp_path / f"hotel{i}.log"))
+        info("строка")
+    close_log()
+    assert atexit._ncallbacks() == before
+
+
+def test_flush_returns_when_writer_thread_died(tmp_path, monkeypatch):
+    from hotel_domain.logger import AsyncLogWriter
+
+    def broken(self, batch):
+        raise RuntimeError("сбой записи")
+
+    monkeypatch.setattr(AsyncLogWriter, "_write_batch", broken)
+    monkeypatch.setattr("threading.excepthook", lambda args: None)
+    writer = AsyncLogWriter(str(tmp_path / "broken.log"), echo=False, batch_size=1)
+    writer.write("INFO", "строка")
+    writer._thread.join(5)
+    assert writer.flush(timeout=5) is False
+    writer.close()
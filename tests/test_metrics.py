@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from hotel_domain import DataProcessingError, MetricsRegistry
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+def test_disabled_registry_records_nothing(registry):
+    counter = registry.counter("ops_total")
+    histogram = registry.histogram("op_seconds")
+    calls = []
+
+    @registry.timed("call_seconds")
+    def call(x):
+        calls.append(x)
+        return x * 2
+
+    counter.inc(5)
+    histogram.observe(0.1)
+    with histogram.time():
+        pass
+    assert call(21) == 42 and calls == [21]
+    assert counter.value == 0
+    assert histogram.count == 0 and registry.histogram("call_seconds").count == 0
+
+
+def test_prometheus_and_json_output(registry):
+    registry.enable()
+    registry.counter("ops_total", "Операции", result="ok").inc(3)
+    registry.counter("ops_total", result="failed").inc()
+    histogram = registry.histogram("op_seconds", "Время операции", buckets=(0.01, 0.1))
+    for value in (0.005, 0.05, 0.5):
+        histogram.observe(value)
+
+    assert registry.to_prometheus().splitlines() == [
+        "# HELP op_seconds Время операции",
+        "# TYPE op_seconds histogram",
+        'op_seconds_bucket{le="0.01"} 1',
+        'op_seconds_bucket{le="0.1"} 2',
+        'op_seconds_bucket{le="+Inf"} 3',
+        "op_seconds_sum 0.555",
+        "op_seconds_count 3",
+        "# HELP ops_total Операции",
+        "# TYPE ops_total counter",
+        'ops_total{result="failed"} 1',
+        'ops_total{result="ok"} 3',
+    ]
+    data = json.loads(registry.to_json())
+    assert data["ops_total"] == [{"type": "counter", "value": 1, "labels": {"result": "failed"}},
+                                 {"type": "counter", "value": 3, "labels": {"result": "ok"}}]
+    assert data["op_seconds"][0]["buckets"] == {"0.01": 1, "0.1": 1, "+Inf": 1}
+    assert (data["op_seconds"][0]["p50"], data["op_seconds"][0]["p99"]) == (0.1, float("inf"))
+
+    registry.reset()
+    assert registry.counter("ops_total", result="ok").value == 0 and histogram.count == 0
+
+
+def test_metric_type_conflict(registry):
+    registry.counter("clash")
+    with pytest.raises(DataProcessingError):
+        registry.histogram("clash")
+
+
+def test_timed_wrapper_profiles_every_nth_call(registry, tmp_path):
+    registry.enable()
+
+    @registry.timed("work_seconds", profile_as="work")
+    def work(n):
+        return sum(range(n))
+
+    registry.profile("work", every=2)
+    for _ in range(4):
+        assert work(1000) == 499500
+    assert registry.histogram("work_seconds").count == 4
+    stats = registry.profile_stats("work")
+    assert stats is not None and stats.total_calls > 0
+    # Профилируется каждый второй вызов: сама функция видна в статистике дважды
+    assert sum(calls for (_, _, name), (calls, *_) in stats.stats.items() if name == "work") == 2
+    assert [path.rsplit("/", 1)[-1] for path in registry.dump_profiles(str(tmp_path))] == ["work.prof"]
+
+    registry.stop_profiling("work")
+    work(10)
+    registry.clear_profiles()
+    assert registry.profile_stats("work") is None
+    assert registry.profile_stats("unknown") is None
@@ -0,0 +1,71 @@
+from datetime import date, timedelta
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from hotel_domain import Room, parse_date  # noqa: E402
+from hotel_domain.pricing import price_stays, revenue_by_period  # noqa: E402
+
+SEASONAL = [0.8, 0.8, 0.9, 1.0, 1.1, 1.4, 1.6, 1.6, 1.2, 1.0, 0.9, 1.3]
+MULTIPLIERS = {"Suite": 1.5, "Deluxe": 2.0}
+STAYS = [
+    (1000, "Single", "2026-01-30", "2026-02-02"),
+    (2500, "Suite", "2026-05-28", "2026-06-04"),
+    (4000, "Deluxe", "2026-12-30", "2027-01-03"),
+    (1800, "Double", "2026-07-10", "2026-07-11"),
+]
+
+
+def reference_total(base, room_type, check_in, check_out, seasonal, include_tax):
+    # Поночный расчёт через Room.calculate_total_price: сумма сезонных множителей как число ночей
+    day, end = date.fromisoformat(check_in), date.fromisoformat(check_out)
+    weight = 0.0
+    while day < end:
+        weight += seasonal[day.month - 1] if seasonal else 1.0
+        day += timedelta(days=1)
+    return Room.calculate_total_price(base * MULTIPLIERS.get(room_type, 1.0), weight, include_tax)
+
+
+@pytest.mark.parametrize("seasonal", [None, SEASONAL])
+@pytest.mark.parametrize("include_tax", [True, False])
+def test_vectorised_totals_match_scalar_pricing(seasonal, include_tax):
+    totals = Room.calculate_total_prices(
+        [base for base, *_ in STAYS],
+        [parse_date(check_in) for _, _, check_in, _ in STAYS],
+        [parse_date(check_out) for *_, check_out in STAYS],
+        [room_type for _, room_type, *_ in STAYS], MULTIPLIERS, seasonal, include_tax,
+    )
+    expected = [reference_total(*stay, seasonal, include_tax) for stay in STAYS]
+    assert totals.tolist() == pytest.approx(expected, abs=0.011)
+
+
+def test_short_stay_is_billed_as_min_nights():
+    day = parse_date("2026-03-01")
+    assert price_stays([100], [day], [day + 1], min_nights=3).tolist() == [300.0]
+
+
+def test_revenue_split_across_month_and_year_boundaries():
+    ins = [parse_date("2026-01-30"), parse_date("2026-12-31")]
+    outs = [parse_date("2026-02-02"), parse_date("2027-01-02")]
+    labels, revenue = revenue_by_period([100, 10], ins, outs, "month")
+    assert [str(label) for label in labels] == [
+        "2026-01", "2026-02", "2026-03", "2026-04", "2026-05", "2026-06",
+        "2026-07", "2026-08", "2026-09", "2026-10", "2026-11", "2026-12", "2027-01",
+    ]
+    assert revenue.tolist() == [200.0, 100.0] + [0.0] * 9 + [10.0, 10.0]
+
+    labels, revenue = revenue_by_period([100, 10], ins, outs, "year", tax_rate=0.5)
+    assert [str(label) for label in labels] == ["2026", "2027"]
+    assert revenue.tolist() == [465.0, 15.0]
+
+
+def test_revenue_window_clips_stays():
+    ins, outs = [parse_date("2026-01-30")], [parse_date("2026-02-02")]
+    days, revenue = revenue_by_period([100], ins, outs, "day",
+                                      start=parse_date("2026-01-31"), end=parse_date("2026-02-05"))
+    assert [str(day) for day in days] == ["2026-01-31", "2026-02-01", "2026-02-02", "2026-02-03", "2026-02-04"]
+    assert revenue.tolist() == [100.0, 100.0, 0.0, 0.0, 0.0]
+    # Сезонный множитель берётся по месяцу каждой ночи
+    _, revenue = revenue_by_period([100], ins, outs, "month", seasonal=SEASONAL)
+    assert revenue.tolist() == [160.0, 80.0]
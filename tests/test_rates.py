@@ -0,0 +1,59 @@
+import pickle
+
+import pytest
+
+from hotel_domain import DataProcessingError, RateEngine, RatePlan, Room, parse_stay
+
+SEASONAL = [0.8, 0.8, 0.9, 1.0, 1.1, 1.4, 1.6, 1.6, 1.2, 1.0, 0.9, 1.3]
+
+
+@pytest.fixture
+def engine():
+    return RateEngine([RatePlan("season", {"Suite": 1.5}, SEASONAL, {7: 0.1})], ttl=None)
+
+
+def test_repeated_quote_hits_cache(engine):
+    room = Room(1, "Suite", 1000)
+    first = engine.quote(room, "2026-06-01", "2026-06-03", "season")
+    assert engine.quote(room, "2026-06-01", "2026-06-03", "season") == first
+    assert engine.cache_info()["hits"] == 1 and engine.cache_info()["misses"] == 1
+    # Номер того же типа и цены делит запись кэша
+    engine.quote(Room(2, "Suite", 1000), "2026-06-01", "2026-06-03", "season")
+    assert engine.cache_info()["hits"] == 2
+
+
+def test_price_change_is_a_new_key(engine):
+    room = Room(1, "Suite", 1000)
+    before = engine.quote(room, "2026-06-01", "2026-06-03", "season")
+    room.price = 2000
+    after = engine.quote(room, "2026-06-01", "2026-06-03", "season")
+    assert after == pytest.approx(before * 2)
+    assert engine.cache_info()["misses"] == 2
+
+
+def test_set_plan_drops_only_that_plans_entries(engine):
+    room = Room(1, "Suite", 1000)
+    engine.quote(room, "2026-06-01", "2026-06-03", "season")
+    standard = engine.quote(room, "2026-06-01", "2026-06-03")
+    engine.set_plan(RatePlan("season", {"Suite": 2.0}, SEASONAL))
+    assert len(engine.cache) == 1
+    assert engine.quote(room, "2026-06-01", "2026-06-03") == standard
+    start, end = parse_stay("2026-06-01", "2026-06-03")
+    assert engine.quote(room, start, end, "season") == engine.plan("season").price(1000, "Suite", start, end)
+
+
+def test_plan_cannot_be_mutated(engine):
+    plan = engine.plan("season")
+    with pytest.raises(DataProcessingError):
+        plan.tax_rate = 0
+    with pytest.raises(TypeError):
+        plan.type_multipliers["Suite"] = 3.0
+    with pytest.raises(DataProcessingError):
+        del plan.seasonal
+    assert plan.type_multipliers["Suite"] == 1.5
+
+
+def test_plan_survives_pickle(engine):
+    plan = pickle.loads(pickle.dumps(engine.plan("season")))
+    start, end = parse_stay("2026-06-01", "2026-06-10")
+    assert plan.price(1000, "Suite", start, end) == engine.plan("season").price(1000, "Suite", start, end)
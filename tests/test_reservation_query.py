@@ -0,0 +1,47 @@
+import pytest
+
+from hotel_domain import Hotel, Room
+
+GUESTS = [("Иван", "Петров"), ("иван", "Сидоров"), ("Anna", "Smith_Jones"), ("Анна", "100%Смирнова")]
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def hotel(request, tmp_path):
+    if request.param == "memory":
+        hotel = Hotel("Запросы")
+    else:
+        hotel = Hotel.open_sqlite(str(tmp_path / "hotel.db"), "Запросы")
+    hotel.add_room(Room(1, "Single", 1000))
+    hotel.make_reservations_bulk([
+        (name, last_name, 1, f"2026-05-{2 * i + 1:02d}", f"2026-05-{2 * i + 2:02d}")
+        for i, (name, last_name) in enumerate(GUESTS)
+    ])
+    yield hotel
+    if hotel.repository is not None:
+        hotel.repository.close()
+
+
+def last_names(hotel, text):
+    return [row[2] for row in hotel.query_reservations(guest=text)]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("ИВАН", ["Петров", "Сидоров"]),
+    ("иван  петров", ["Петров"]),
+    ("ANNA", ["Smith_Jones"]),
+    ("_", ["Smith_Jones"]),
+    ("h_j", ["Smith_Jones"]),
+    ("%", ["100%Смирнова"]),
+    ("0%с", ["100%Смирнова"]),
+    ("h%j", []),
+    ("\\", []),
+    ("   ", ["Петров", "Сидоров", "Smith_Jones", "100%Смирнова"]),
+])
+def test_guest_filter_is_literal_and_case_insensitive(hotel, text, expected):
+    assert last_names(hotel, text) == expected
+
+
+def test_paging_and_sorting(hotel):
+    rows = hotel.query_reservations(offset=1, limit=2, order_by="check_in", descending=True)
+    assert [row[4] for row in rows] == ["2026-05-05", "2026-05-03"]
+    assert [row[4] for row in hotel.query_reservations(start="2026-05-04", end="2026-05-06")] == ["2026-05-05"]
@@ -0,0 +1,64 @@
+import pytest
+
+from hotel_domain import EmptyRoomListError, Room, RoomManager
+
+
+def numbers(rooms):
+    return [room.room_number for room in rooms]
+
+
+@pytest.fixture
+def manager():
+    manager = RoomManager()
+    types = ["Single", "Double", "Suite"]
+    # Этаж f, место i: номер f*10+i, цена растёт с номером, тип по кругу
+    manager.set_rooms_2d([[Room(f * 10 + i, types[i % 3], 1000 + (f * 10 + i) * 100) for i in range(4)]
+                          for f in range(1, 4)])
+    return manager
+
+
+def test_max_top_k_and_range(manager):
+    assert manager.find_room_with_max_price().room_number == 33
+    assert numbers(manager.top_k(3)) == [33, 32, 31]
+    assert numbers(manager.cheapest_k(2)) == [10, 11]
+    assert numbers(manager.rooms_in_price_range(3000, 3200)) == [20, 21, 22]
+    assert numbers(manager.top_k(2, room_type="Single")) == [33, 30]
+    assert numbers(manager.top_k(2, floor=0)) == [13, 12]
+
+
+def test_queries_follow_update_price(manager):
+    room = next(r for r in manager.rooms_2d[0] if r.room_number == 10)
+    # Индекс "этаж + тип" строится до изменения цены и должен обновиться вместе с остальными
+    assert numbers(manager.top_k(2, room_type="Single", floor=0)) == [13, 10]
+    manager.update_price(room, 9000)
+
+    assert room.price == 9000
+    assert manager.find_room_with_max_price() is room
+    assert numbers(manager.top_k(2)) == [10, 33]
+    assert numbers(manager.cheapest_k(2)) == [11, 12]
+    assert numbers(manager.rooms_in_price_range(8000, 10000)) == [10]
+    assert manager.rooms_in_price_range(1000, 1050) == []
+    assert numbers(manager.top_k(1, floor=0)) == [10]
+    assert numbers(manager.top_k(3, room_type="Single")) == [10, 33, 30]
+    assert numbers(manager.top_k(2, room_type="Single", floor=0)) == [10, 13]
+    assert manager.max_price_room(room_type="Single", floor=0) is room
+    assert manager.min_price_room(room_type="Single", floor=0).room_number == 13
+
+
+def test_unavailable_rooms_are_skipped_by_default(manager):
+    top = manager.top_k(1)[0]
+    top.is_available = False
+    assert numbers(manager.top_k(1)) == [32]
+    assert numbers(manager.top_k(1, available_only=False)) == [33]
+
+
+def test_new_layout_drops_cached_indexes(manager):
+    assert numbers(manager.top_k(5, room_type="Double", floor=1)) == [21]
+    manager.set_rooms_2d([[Room(50, "Double", 500), Room(51, "Double", 700)]])
+    assert numbers(manager.top_k(5, room_type="Double", floor=0)) == [51, 50]
+    assert numbers(manager.top_k(5)) == [51, 50]
+
+
+def test_empty_layout_raises():
+    with pytest.raises(EmptyRoomListError):
+        RoomManager().find_room_with_max_price()
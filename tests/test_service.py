@@ -0,0 +1,71 @@
+import asyncio
+import json
+
+import pytest
+
+from hotel_domain import Hotel, Room
+from hotel_service import HotelService
+
+
+@pytest.fixture
+def service():
+    hotel = Hotel("Сервис")
+    hotel.add_room(Room(1, "Single", 1000))
+    return HotelService(hotel)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def raw_request(service, data):
+    await service.start(port=0)
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", service.port)
+        writer.write(data)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        return response.decode("utf-8")
+    finally:
+        await service.close()
+
+
+@pytest.mark.parametrize("length", ["abc", "-5"])
+def test_bad_content_length_gets_400(service, length):
+    response = run(raw_request(service, f"POST /guests HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode()))
+    assert response.startswith("HTTP/1.1 400")
+    assert "Content-Length" in response.split("\r\n\r\n", 1)[1]
+
+
+def test_reservation_conflict_and_unknown_room(service):
+    body = {"name": "Иван", "last_name": "Петров", "room_number": 1,
+            "check_in": "2026-05-01", "check_out": "2026-05-03"}
+
+    async def scenario():
+        first = await service.dispatch("POST", "/reservations", json.dumps(body))
+        second = await service.dispatch("POST", "/reservations", json.dumps(body))
+        unknown = await service.dispatch("POST", "/reservations", json.dumps({**body, "room_number": 999}))
+        service.executor.shutdown(wait=True)
+        return first, second, unknown
+
+    first, second, unknown = run(scenario())
+    assert first[0] == 201 and first[1]["room"]["room_number"] == 1
+    assert second[0] == 409
+    assert unknown[0] == 404
+    # Запросы к несуществующим номерам не оставляют замков
+    assert set(service.room_locks) == {1}
+
+
+def test_oversized_body_gets_413(service):
+    response = run(raw_request(service, f"POST /guests HTTP/1.1\r\nContent-Length: {10 ** 9}\r\n\r\n".encode()))
+    assert response.startswith("HTTP/1.1 413 Payload Too Large")
+
+
+@pytest.mark.parametrize("request_head", [
+    "GET /" + "a" * 70_000 + " HTTP/1.1\r\n\r\n",
+    "GET /metrics HTTP/1.1\r\nX-Long: " + "b" * 70_000 + "\r\n\r\n",
+])
+def test_overlong_line_gets_400(service, request_head):
+    response = run(raw_request(service, request_head.encode()))
+    assert response.startswith("HTTP/1.1 400")
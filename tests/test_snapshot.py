@@ -0,0 +1,131 @@
+import os
+import threading
+
+import pytest
+
+from hotel_domain import BaseHotelError, DataProcessingError, Guest, Hotel, Room, parse_stay, snapshot
+
+
+def fill(hotel):
+    hotel.add_rooms_bulk([Room(1, "Single", 1000), Room(2, "Suite", 3000)])
+    guest = hotel.add_guest(Guest("Иван", "Петров", 30))
+    hotel.make_reservation(guest, hotel.rooms_by_number[1], "2026-05-01", "2026-05-03")
+    return guest
+
+
+def stays(hotel):
+    return sorted((r.guest.name, r.room.room_number, r.check_in, r.check_out) for r in hotel.reservations)
+
+
+def reopen(directory):
+    hotel = Hotel.open_snapshot(directory, "Снимок")
+    hotel.snapshots.close()
+    return hotel
+
+
+def test_snapshot_and_journal_round_trip(tmp_path):
+    hotel = Hotel.open_snapshot(tmp_path, "Снимок")
+    guest = fill(hotel)
+    hotel.save_snapshot(background=False)
+    # После снимка - только в журнале
+    hotel.make_reservation(guest, hotel.rooms_by_number[2], "2026-06-01", "2026-06-05")
+    hotel.add_guest(Guest("Анна", "Смирнова"))
+    expected = stays(hotel)
+    hotel.snapshots.close()
+
+    restored = reopen(tmp_path)
+    assert stays(restored) == expected
+    assert restored.find_guest("анна", "СМИРНОВА") is not None
+    assert not restored.is_room_free(2, "2026-06-02", "2026-06-03")
+    assert restored.is_room_free(2, "2026-06-05", "2026-06-06")
+
+
+def test_journal_only_replay_and_old_journals_removed(tmp_path):
+    hotel = Hotel.open_snapshot(tmp_path, "Снимок")
+    fill(hotel)
+    hotel.snapshots.close()
+    assert stays(reopen(tmp_path)) == stays(hotel)
+
+    hotel = Hotel.open_snapshot(tmp_path, "Снимок")
+    hotel.save_snapshot(background=False)
+    seqs = [seq for seq, _ in hotel.snapshots.journals()]
+    hotel.snapshots.close()
+    assert seqs == [hotel.journal.seq]
+
+
+def test_torn_journal_tail_is_dropped(tmp_path):
+    hotel = Hotel.open_snapshot(tmp_path, "Снимок")
+    guest = fill(hotel)
+    hotel.make_reservation(guest, hotel.rooms_by_number[2], "2026-06-01", "2026-06-05")
+    hotel.snapshots.close()
+    (_, path), = hotel.snapshots.journals()
+    size = os.path.getsize(path)
+    with open(path, "r+b") as f:
+        f.truncate(size - 3)
+
+    restored = reopen(tmp_path)
+    assert stays(restored) == [("Иван", 1, *parse_stay("2026-05-01", "2026-05-03"))]
+    assert os.path.getsize(path) < size - 3
+
+
+def test_corrupt_journal_in_the_middle_raises(tmp_path):
+    hotel = Hotel.open_snapshot(tmp_path, "Снимок")
+    fill(hotel)
+    hotel.snapshots.close()
+    (_, path), = hotel.snapshots.journals()
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 1)
+    # Повреждённый журнал, за которым есть ещё один, не отрезается молча
+    with open(os.path.join(tmp_path, snapshot.journal_name(99)), "wb") as f:
+        f.write(snapshot.JOURNAL_MAGIC)
+    with pytest.raises(DataProcessingError):
+        Hotel.open_snapshot(tmp_path, "Снимок")
+
+
+def test_mutation_during_snapshot_copy_is_not_lost(tmp_path, monkeypatch):
+    hotel = Hotel.open_snapshot(tmp_path, "Снимок")
+    guest = fill(hotel)
+    copy_state = snapshot._State
+
+    def copy_with_concurrent_booking(current):
+        state = copy_state(current)
+        # Бронь из другого потока между копией и переключением журнала
+        writer = threading.Thread(target=hotel.make_reservation,
+                                  args=(guest, hotel.rooms_by_number[2], "2026-07-01", "2026-07-02"))
+        writer.start()
+        writer.join(0.2)
+        copy_with_concurrent_booking.writer = writer
+        return state
+
+    monkeypatch.setattr(snapshot, "_State", copy_with_concurrent_booking)
+    hotel.save_snapshot(background=False)
+    copy_with_concurrent_booking.writer.join()
+    expected = stays(hotel)
+    hotel.snapshots.close()
+
+    assert len(expected) == 2
+    assert stays(reopen(tmp_path)) == expected
+
+
+def test_room_price_and_availability_survive_restart(tmp_path):
+    hotel = Hotel.open_snapshot(tmp_path, "Снимок")
+    fill(hotel)
+    hotel.update_room(hotel.rooms_by_number[1], price=5000)
+    hotel.save_snapshot(background=False)
+    # После снимка - только в журнале
+    hotel.update_room(hotel.rooms_by_number[2], is_available=False)
+    hotel.update_room(hotel.rooms_by_number[1], price=5500)
+    hotel.snapshots.close()
+
+    restored = reopen(tmp_path)
+    rooms = restored.rooms_by_number
+    assert (rooms[1].price, rooms[1].is_available) == (5500.0, True)
+    assert (rooms[2].price, rooms[2].is_available) == (3000.0, False)
+    assert [room.room_number for room in restored.available_rooms("2027-01-01", "2027-01-02")] == [1]
+
+
+def test_update_room_rejects_foreign_room(tmp_path):
+    hotel = Hotel.open_snapshot(tmp_path, "Снимок")
+    with pytest.raises(BaseHotelError):
+        hotel.update_room(Room(7, "Single", 100), price=1)
+    hotel.snapshots.close()
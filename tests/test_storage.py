@@ -0,0 +1,93 @@
+import sqlite3
+
+from hotel_domain import Guest, Hotel, Room, close_log
+from hotel_domain.storage import SQLiteHotelRepository
+
+def open_hotel(path):
+    return Hotel.open_sqlite(str(path), "База")
+
+
+def test_reopen_round_trip(tmp_path):
+    db = tmp_path / "hotel.db"
+    hotel = open_hotel(db)
+    suite = Room(2, "Suite", 5000)
+    suite.is_available = False
+    hotel.add_rooms_bulk([Room(1, "Single", 1000), suite])
+    guest = hotel.add_guest(Guest("Иван", "Петров", 30))
+    hotel.make_reservation(guest, hotel.rooms_by_number[1], "2026-05-01", "2026-05-04")
+    hotel.make_reservations_bulk([("Анна", "Смирнова", 1, "2026-05-10", "2026-05-12")])
+    hotel.repository.close()
+
+    reopened = open_hotel(db)
+    rooms = reopened.rooms_by_number
+    assert {(r.room_number, r.room_type, r.price, r.is_available) for r in rooms.values()} == {
+        (1, "Single", 1000.0, True), (2, "Suite", 5000.0, False)}
+    assert reopened.reservation_count() == 2
+    assert not reopened.is_room_free(1, "2026-05-03", "2026-05-05")
+    assert [r.room_number for r in reopened.available_rooms("2026-05-10", "2026-05-11")] == []
+
+    guest = reopened.find_guest("  иван ", "ПЕТРОВ")
+    assert (guest.name, guest.lastName, guest.age) == ("Иван", "Петров", 30)
+    assert [r.dates for r in guest.reservations] == [("2026-05-01", "2026-05-04")]
+    assert guest.reservations[0].room is rooms[1]
+    reopened.repository.close()
+
+
+def test_loaded_guest_keeps_new_reservations_without_duplicates(tmp_path, log_file):
+    db = tmp_path / "hotel.db"
+    hotel = open_hotel(db)
+    hotel.add_room(Room(1, "Single", 1000))
+    hotel.add_guest(Guest("Иван", "Петров"))
+    hotel.repository.close()
+
+    reopened = open_hotel(db)
+    guest = reopened.find_guest("Иван", "Петров")
+    first = reopened.make_reservation(guest, reopened.rooms_by_number[1], "2026-05-01", "2026-05-02")
+    assert guest.reservations == [first]
+    second = reopened.make_reservation(guest, reopened.rooms_by_number[1], "2026-05-03", "2026-05-04")
+    assert guest.reservations == [first, second]
+    assert [g.name for g in reopened.search_guests("пет")] == ["Иван"]
+    reopened.repository.close()
+    close_log()
+    with open(log_file, encoding="utf-8") as f:
+        text = f.read()
+    # Гость из базы создаётся без строки "Создан гость"; в лог попадает только исходное создание
+    assert text.count("Создан гость: Иван Петров") == 1
+
+
+def test_guest_key_migration_merges_duplicates(tmp_path):
+    db = tmp_path / "old.db"
+    conn = sqlite3.connect(db)
+    conn.executescript("""
+        CREATE TABLE hotels (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+        CREATE TABLE rooms (hotel_id INTEGER NOT NULL, room_number INTEGER NOT NULL, room_type TEXT NOT NULL,
+                            price REAL NOT NULL, is_available INTEGER NOT NULL DEFAULT 1,
+                            PRIMARY KEY (hotel_id, room_number));
+        CREATE TABLE guests (id INTEGER PRIMARY KEY, hotel_id INTEGER NOT NULL, name TEXT NOT NULL,
+                             last_name TEXT NOT NULL, age INTEGER);
+        CREATE UNIQUE INDEX guests_by_name ON guests (hotel_id, name, last_name);
+        CREATE TABLE reservations (id INTEGER PRIMARY KEY, hotel_id INTEGER NOT NULL, room_number INTEGER NOT NULL,
+                                   guest_id INTEGER NOT NULL, check_in INTEGER NOT NULL, check_out INTEGER NOT NULL);
+        INSERT INTO hotels VALUES (1, 'База');
+        INSERT INTO rooms VALUES (1, 1, 'Single', 1000, 1);
+        INSERT INTO guests VALUES (1, 1, 'Иван', 'Петров', 30), (2, 1, 'ИВАН', ' петров ', NULL),
+                                  (3, 1, 'Анна', 'Смирнова', NULL);
+        INSERT INTO reservations VALUES (1, 1, 1, 1, 740000, 740002), (2, 1, 1, 2, 740005, 740006),
+                                        (3, 1, 1, 3, 740010, 740011);
+    """)
+    conn.commit()
+    conn.close()
+
+    repository = SQLiteHotelRepository(str(db), "База")
+    guests = repository.conn.execute(
+        "SELECT id, name_key, last_name_key FROM guests ORDER BY id").fetchall()
+    assert guests == [(1, "иван", "петров"), (3, "анна", "смирнова")]
+    assert repository.conn.execute(
+        "SELECT guest_id FROM reservations ORDER BY id").fetchall() == [(1,), (1,), (3,)]
+    assert repository.guest_stays("иван", "петров") == [(1, 740000, 740002), (1, 740005, 740006)]
+    repository.close()
+
+    # Повторное открытие не запускает миграцию заново и не теряет данных
+    hotel = open_hotel(db)
+    assert len(hotel.find_guest("Иван", "Петров").reservations) == 2
+    hotel.repository.close()
@@ -0,0 +1,58 @@
+from hotel_domain import Hotel, Room
+from hotel_domain.streams import import_reservations
+
+HEADER = "name,last_name,room_number,check_in,check_out\n"
+
+
+def open_hotel(path):
+    hotel = Hotel.open_sqlite(str(path), "Импорт")
+    if not hotel.rooms_by_number:
+        hotel.add_rooms_bulk([Room(1, "Single", 1000), Room(2, "Double", 2000)])
+    return hotel
+
+
+def write_csv(path, rows):
+    path.write_text(HEADER + "".join(f"{row}\n" for row in rows), encoding="utf-8")
+    return path
+
+
+def test_import_with_database_keeps_no_per_row_state(tmp_path):
+    hotel = open_hotel(tmp_path / "hotel.db")
+    rows = [f"Гость{i},Импортов,{1 + i % 2},2026-01-{1 + i // 2:02d},2026-01-{2 + i // 2:02d}" for i in range(40)]
+    stats = import_reservations(hotel, write_csv(tmp_path / "r.csv", rows), chunk_size=7)
+
+    assert (stats.ok, stats.failed) == (40, 0)
+    assert hotel.reservations == [] and hotel.timelines == {} and hotel.occupancy.days == {}
+    assert not hotel.is_room_free(1, "2026-01-03", "2026-01-04")
+    assert hotel.available_rooms("2026-01-10", "2026-01-11") == []
+    assert len(hotel.available_rooms("2026-02-01", "2026-02-02")) == 2
+
+
+def test_import_rejects_conflicts_with_stored_and_same_file_rows(tmp_path):
+    hotel = open_hotel(tmp_path / "hotel.db")
+    write_csv(tmp_path / "first.csv", ["Анна,Смирнова,1,2026-03-01,2026-03-05"])
+    import_reservations(hotel, tmp_path / "first.csv")
+    hotel.repository.close()
+
+    hotel = open_hotel(tmp_path / "hotel.db")
+    stats = import_reservations(hotel, write_csv(tmp_path / "second.csv", [
+        "Иван,Петров,1,2026-03-04,2026-03-06",
+        "Иван,Петров,2,2026-03-04,2026-03-06",
+        "Олег,Сидоров,2,2026-03-05,2026-03-07",
+        "Олег,Сидоров,1,2026-03-05,2026-03-07",
+    ]))
+
+    assert stats.ok == 2
+    assert [line for line, _ in stats.errors] == [2, 4]
+    assert hotel.timelines == {}
+
+
+def test_import_invalidates_loaded_timeline_and_days(tmp_path):
+    hotel = open_hotel(tmp_path / "hotel.db")
+    assert hotel.is_room_free(1, "2026-04-01", "2026-04-03")
+    assert len(hotel.available_rooms("2026-04-01", "2026-04-03")) == 2
+
+    import_reservations(hotel, write_csv(tmp_path / "r.csv", ["Анна,Смирнова,1,2026-04-02,2026-04-04"]))
+
+    assert not hotel.is_room_free(1, "2026-04-01", "2026-04-03")
+    assert [room.room_number for room in hotel.available_rooms("2026-04-01", "2026-04-03")] == [2]